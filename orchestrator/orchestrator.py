@@ -43,6 +43,13 @@ logging.getLogger('boto3').setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
 
+# Content-Type of each transcript artifact the worker uploads next to the .txt
+ARTIFACT_CONTENT_TYPES = {
+    'json': 'application/json',
+    'srt': 'application/x-subrip',
+    'vtt': 'text/vtt',
+}
+
 # AWS Clients
 sqs = boto3.client('sqs', region_name=CONFIG.REGION_NAME)
 s3 = boto3.client('s3', region_name=CONFIG.REGION_NAME)
@@ -201,6 +208,12 @@ def init_db():
                 retry_at TIMESTAMP
             );
         """)
+        # Per-stage timing breakdown reported by the worker with the final status update
+        cursor.execute("ALTER TABLE tasks ADD COLUMN IF NOT EXISTS timings JSONB;")
+        # Decoding tier, beam size, temperature and model the worker chose for the task
+        cursor.execute("ALTER TABLE tasks ADD COLUMN IF NOT EXISTS decoding JSONB;")
+        # Segments completed by a drained worker, so the next lease resumes after them
+        cursor.execute("ALTER TABLE tasks ADD COLUMN IF NOT EXISTS checkpoint JSONB;")
         conn.commit()
     conn.close()
 
@@ -478,7 +491,9 @@ def get_task():
     try:
         with conn.cursor() as cursor:
             cursor.execute("""
-                SELECT task_id, object_key 
+                SELECT task_id, object_key,
+                       EXTRACT(EPOCH FROM (NOW() - created_at)),
+                       checkpoint
                 FROM tasks 
                 WHERE status = 'Queued'
                 LIMIT 1
@@ -489,7 +504,11 @@ def get_task():
             if not task:
                 return jsonify({'message': 'No tasks available'}), 204
 
-            task_id, encoded_key = task
+            task_id, encoded_key, task_age, checkpoint = task
+
+            # Backlog and task age let workers trade decoding quality for latency
+            cursor.execute("SELECT COUNT(*) FROM tasks WHERE status = 'Queued'")
+            queue_depth = cursor.fetchone()[0]
             
             decoded_key = PathHandler.decode_for_use(encoded_key)
             logger.info(f"Task {task_id} - Encoded key: {encoded_key}")
@@ -516,6 +535,21 @@ def get_task():
                     ExpiresIn=3600
                 )
 
+                # Structured artifacts (segments/word timestamps, subtitles), stored gzip-encoded
+                artifact_urls = {
+                    fmt: s3.generate_presigned_url(
+                        'put_object',
+                        Params={
+                            'Bucket': CONFIG.OUTPUT_BUCKET,
+                            'Key': f"transcriptions/{decoded_key}.{fmt}.gz",
+                            'ContentType': content_type,
+                            'ContentEncoding': 'gzip'
+                        },
+                        ExpiresIn=3600
+                    )
+                    for fmt, content_type in ARTIFACT_CONTENT_TYPES.items()
+                }
+
                 cursor.execute("""
                     UPDATE tasks 
                     SET status = 'In-Progress',
@@ -524,12 +558,18 @@ def get_task():
                 """, (task_id,))
                 conn.commit()
 
-                return jsonify({
+                response = {
                     'task_id': str(task_id),
                     'object_key': encoded_key,
                     'presigned_get_url': get_url,
-                    'presigned_put_url': put_url
-                }), 200
+                    'presigned_put_url': put_url,
+                    'presigned_artifact_urls': artifact_urls,
+                    'queue_depth': queue_depth,
+                    'task_age_seconds': float(task_age or 0)
+                }
+                if checkpoint:
+                    response['checkpoint'] = checkpoint
+                return jsonify(response), 200
 
             except ClientError as e:
                 logger.error(f"Error generating pre-signed URLs: {e}")
@@ -559,6 +599,9 @@ def update_task_status():
         task_id = data.get('task_id')
         status = data.get('status')
         failure_reason = data.get('failure_reason')
+        timings = data.get('timings')
+        decoding = data.get('decoding')
+        checkpoint = data.get('checkpoint')
         
         if not task_id or not status:
             return jsonify({'error': 'Missing required fields'}), 400
@@ -578,6 +621,22 @@ def update_task_status():
                         SET status = %s, updated_at = NOW() 
                         WHERE task_id = %s
                     """, (status, task_id))
+                if timings:
+                    cursor.execute("""
+                        UPDATE tasks SET timings = %s WHERE task_id = %s
+                    """, (json.dumps(timings), task_id))
+                if decoding:
+                    cursor.execute("""
+                        UPDATE tasks SET decoding = %s WHERE task_id = %s
+                    """, (json.dumps(decoding), task_id))
+                if status == 'Queued':
+                    # Released by a draining worker; keep any earlier checkpoint unless a newer one came
+                    cursor.execute("""
+                        UPDATE tasks SET worker_id = NULL, checkpoint = COALESCE(%s, checkpoint)
+                        WHERE task_id = %s
+                    """, (json.dumps(checkpoint) if checkpoint else None, task_id))
+                elif status == 'Completed':
+                    cursor.execute("UPDATE tasks SET checkpoint = NULL WHERE task_id = %s", (task_id,))
                 conn.commit()
             return jsonify({'message': 'Status updated successfully'}), 200
         finally:
@@ -587,6 +646,38 @@ def update_task_status():
         logging.error(f"Error updating task status: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/task-timings', methods=['GET'])
+@authenticate
+def task_timings():
+    """p50/p90/p99 seconds per worker stage over recently completed tasks."""
+    hours = request.args.get('hours', default=24, type=int)
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT span.key,
+                       COUNT(*),
+                       percentile_cont(0.5) WITHIN GROUP (ORDER BY (span.value->>'seconds')::float),
+                       percentile_cont(0.9) WITHIN GROUP (ORDER BY (span.value->>'seconds')::float),
+                       percentile_cont(0.99) WITHIN GROUP (ORDER BY (span.value->>'seconds')::float)
+                FROM tasks, jsonb_each(tasks.timings->'spans') AS span
+                WHERE status = 'Completed'
+                  AND timings IS NOT NULL
+                  AND updated_at >= NOW() - make_interval(hours => %s)
+                GROUP BY span.key
+                ORDER BY span.key
+            """, (hours,))
+            stages = {
+                name: {'tasks': count, 'p50': p50, 'p90': p90, 'p99': p99}
+                for name, count, p50, p90, p99 in cursor.fetchall()
+            }
+        return jsonify({'hours': hours, 'stages': stages}), 200
+    except Exception as e:
+        logger.error(f"Error in task-timings: {e}")
+        return jsonify({'error': str(e)}), 500
+    finally:
+        conn.close()
+
 def normalize_s3_key(key: str) -> str:
     """Normalize an S3 key to match what's actually in the bucket."""
     try:
@@ -0,0 +1,69 @@
+import asyncio
+import os
+import time
+
+
+class PcmArchive:
+    """Appends a session's spilled PCM to a file off the event loop.
+
+    Audio is written to ``<directory>/<name>-<timestamp>.s16le`` (16 kHz mono
+    s16le) by a background task using worker threads, so a slow disk never
+    stalls ingest. If `s3_bucket` is set, the file is uploaded to
+    ``s3://<bucket>/<prefix><file name>`` when the archive is closed and
+    then removed locally.
+    """
+
+    # Archives closing in the background, so shutdown can wait for them
+    closing = set()
+
+    def __init__(self, directory, name, s3_bucket=None, s3_prefix="streaming/"):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{name}-{int(time.time())}.s16le")
+        self.s3_bucket = s3_bucket
+        self.s3_prefix = s3_prefix
+        self.bytes_written = 0
+        self.pending = asyncio.Queue()
+        self.task = asyncio.create_task(self._run())
+
+    def spill(self, data):
+        self.pending.put_nowait(data)
+
+    async def _run(self):
+        while True:
+            data = await self.pending.get()
+            if data is None:
+                break
+            await asyncio.to_thread(self._append, data)
+            self.bytes_written += len(data)
+
+    def _append(self, data):
+        with open(self.path, "ab") as f:
+            f.write(data)
+
+    async def close(self):
+        """Finish pending writes, then upload to S3 if configured."""
+        self.pending.put_nowait(None)
+        await self.task
+        if self.s3_bucket and os.path.exists(self.path):
+            try:
+                await asyncio.to_thread(self._upload)
+            except Exception as e:
+                print(f"Archive upload of {self.path} failed: {e}")
+
+    def close_soon(self):
+        """`close` in the background (for synchronous callers such as eviction)."""
+        task = asyncio.create_task(self.close())
+        PcmArchive.closing.add(task)
+        task.add_done_callback(PcmArchive.closing.discard)
+
+    @classmethod
+    async def wait_closed(cls):
+        await asyncio.gather(*cls.closing, return_exceptions=True)
+
+    def _upload(self):
+        import boto3
+
+        key = self.s3_prefix + os.path.basename(self.path)
+        boto3.client("s3").upload_file(self.path, self.s3_bucket, key)
+        os.remove(self.path)
+        print(f"Archived {self.path} to s3://{self.s3_bucket}/{key}")
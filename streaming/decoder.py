@@ -0,0 +1,104 @@
+import asyncio
+
+from pcm import SAMPLE_RATE
+
+READ_SIZE = 16384
+
+
+class StreamingDecoder:
+    """Long-lived ffmpeg process decoding one session's container stream.
+
+    MediaRecorder's WebM/Opus fragments only decode as a continuous stream,
+    so every chunk is written to the same ffmpeg stdin as it arrives and the
+    16 kHz mono s16le PCM ffmpeg produces is handed to `on_pcm(bytes)`
+    (always a whole number of samples). Each byte of audio is decoded once.
+
+    If ffmpeg exits before `close` (e.g. on input it cannot decode),
+    `on_exit(decoder)` is called once with `error` describing why, and `feed`
+    raises RuntimeError from then on. A new process cannot pick up a WebM
+    stream mid-way, so the stream has to be restarted.
+    """
+
+    def __init__(self, on_pcm, on_exit=None):
+        self.on_pcm = on_pcm
+        self.on_exit = on_exit
+        self.closed = False
+        self.proc = None
+        self.error = ""
+        self._tasks = []
+        self._started = asyncio.Event()
+
+    async def start(self):
+        try:
+            self.proc = await asyncio.create_subprocess_exec(
+                "ffmpeg", "-nostdin", "-loglevel", "error",
+                "-fflags", "+nobuffer", "-i", "pipe:0",
+                "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE),
+                "-flush_packets", "1", "pipe:1",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            self.error = f"Could not start ffmpeg: {e}"
+            raise RuntimeError(self.error) from e
+        finally:
+            self._started.set()
+        readers = [
+            asyncio.create_task(self._read_pcm()),
+            asyncio.create_task(self._read_errors()),
+        ]
+        self._tasks = readers + [asyncio.create_task(self._watch(readers))]
+
+    @property
+    def running(self):
+        return self.proc is not None and self.proc.returncode is None
+
+    async def feed(self, data):
+        # Another chunk may arrive while the process is still being spawned
+        await self._started.wait()
+        if not self.running:
+            raise RuntimeError(f"Decoder is not running: {self.error or 'exited'}")
+        try:
+            self.proc.stdin.write(data)
+            await self.proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise RuntimeError(f"Decoder exited: {self.error or e}") from e
+
+    async def _read_pcm(self):
+        leftover = b""
+        while True:
+            data = await self.proc.stdout.read(READ_SIZE)
+            if not data:
+                break
+            data = leftover + data
+            usable = len(data) - len(data) % 2
+            leftover = data[usable:]
+            if usable:
+                self.on_pcm(data[:usable])
+
+    async def _read_errors(self):
+        # Keep ffmpeg's stderr drained (a full pipe would stall it); remember the tail for reporting
+        while True:
+            line = await self.proc.stderr.readline()
+            if not line:
+                break
+            self.error = line.decode(errors="replace").strip()[:200]
+
+    async def _watch(self, readers):
+        # Both pipes are drained first, so `error` holds ffmpeg's last message
+        await asyncio.gather(*readers)
+        returncode = await self.proc.wait()
+        if not self.closed:
+            self.error = f"ffmpeg exited with code {returncode}" + (f": {self.error}" if self.error else "")
+            print(f"Decoder failed: {self.error}")
+            if self.on_exit is not None:
+                self.on_exit(self)
+
+    def close(self):
+        """Stop ffmpeg without waiting for pending output (used on clear and eviction)."""
+        self.closed = True
+        for task in self._tasks:
+            task.cancel()
+        if self.running:
+            self.proc.kill()
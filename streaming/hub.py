@@ -0,0 +1,63 @@
+import asyncio
+from collections import deque
+
+# Events a subscriber may fall behind by before its backlog is coalesced
+SUBSCRIBER_QUEUE_SIZE = 32
+
+
+class Subscriber:
+    """One SSE connection's pending events."""
+
+    def __init__(self, maxsize=SUBSCRIBER_QUEUE_SIZE):
+        self.maxsize = maxsize
+        self.events = deque()
+        self.ready = asyncio.Event()
+        self.coalesced = 0
+
+    def offer(self, event, snapshot):
+        if len(self.events) >= self.maxsize:
+            # Too slow to keep up: replace the backlog with one snapshot of the current state
+            self.events.clear()
+            self.events.append(snapshot())
+            self.coalesced += 1
+        else:
+            self.events.append(event)
+        self.ready.set()
+
+    async def get(self):
+        while not self.events:
+            self.ready.clear()
+            await self.ready.wait()
+        return self.events.popleft()
+
+
+class Hub:
+    """In-memory pub/sub for one session's transcript events.
+
+    The session's single transcription task publishes; every open stream
+    subscribes. Publishing never blocks: a subscriber whose queue is full
+    has its backlog coalesced into a snapshot from `snapshot()`, which must
+    already reflect the event being published. New subscribers start with
+    a snapshot, so late joiners see the transcript so far.
+    """
+
+    def __init__(self, snapshot, queue_size=SUBSCRIBER_QUEUE_SIZE):
+        self.snapshot = snapshot
+        self.queue_size = queue_size
+        self.subscribers = set()
+
+    def subscribe(self):
+        subscriber = Subscriber(self.queue_size)
+        subscriber.offer(self.snapshot(), self.snapshot)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+
+    def publish(self, event):
+        for subscriber in self.subscribers:
+            subscriber.offer(event, self.snapshot)
+
+    def __len__(self):
+        return len(self.subscribers)
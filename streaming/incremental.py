@@ -0,0 +1,90 @@
+from pcm import SAMPLE_RATE, wav_bytes
+from stabilizer import LocalAgreement
+from windows import WordDeduplicator
+
+
+class IncrementalTranscriber:
+    """Streaming transcription that only re-decodes the uncommitted tail.
+
+    Each `step` sends the audio from `window_start` to the end of the stream
+    to `transcribe` and gets back timestamped words. A LocalAgreement-n
+    stabilizer commits the words the last `agreement` hypotheses agree on;
+    the window then moves up to the first uncommitted word, keeping
+    `overlap_seconds` of committed audio as acoustic context. The tail of
+    the committed text is passed as the prompt, so the model continues the
+    sentence rather than starting afresh.
+
+    Per-step cost is bounded by the uncommitted audio plus the overlap and
+    never exceeds `max_window_seconds`, however long the session runs. If
+    hypotheses keep disagreeing until audio would fall out of the window,
+    the latest hypothesis for that audio is committed as-is.
+
+    `transcribe(wav, prompt)` is an async callable returning a list of
+    ``{"start", "end", "word"}`` dicts with times relative to the window.
+    """
+
+    def __init__(self, transcribe, agreement=2, max_window_seconds=30.0, overlap_seconds=1.0,
+                 holdback_seconds=2.0, prompt_chars=200):
+        self.transcribe = transcribe
+        self.stabilizer = LocalAgreement(agreement)
+        self.dedup = WordDeduplicator()
+        self.max_window = int(max_window_seconds * SAMPLE_RATE)
+        self.overlap = int(overlap_seconds * SAMPLE_RATE)
+        # Without any words pending, trailing audio this long is kept in case a word is starting
+        self.holdback = holdback_seconds
+        self.prompt_chars = prompt_chars
+
+        self.committed = []   # (start, end, word) in seconds since the start of the stream
+        self.text = ""
+        self.partial = []
+        self.window_start = 0  # absolute sample index of the next window
+
+    @property
+    def partial_text(self):
+        return "".join(word for _, _, word in self.partial).strip()
+
+    def _commit(self, words):
+        self.dedup.mark(words)
+        self.committed.extend(words)
+        self.text = (self.text + "".join(word for _, _, word in words)).strip()
+
+    async def step(self, audio, offset=0):
+        """Transcribe the uncommitted tail of `audio` (whose first sample is absolute index `offset`).
+
+        Returns the newly committed words. `window_start` afterwards is the
+        earliest sample the next step needs; anything before it may be dropped.
+        """
+        end = offset + len(audio)
+        newly_committed = []
+
+        cap_start = max(offset, end - self.max_window)
+        if cap_start > self.window_start:
+            # Audio is about to leave the window unagreed; keep the best guess we have for it
+            cutoff = cap_start / SAMPLE_RATE
+            forced = [word for word in self.partial if word[1] <= cutoff]
+            self._commit(forced)
+            newly_committed.extend(forced)
+            self.stabilizer.reset()
+            self.window_start = cap_start
+        if end <= self.window_start:
+            return newly_committed
+
+        window_offset = self.window_start / SAMPLE_RATE
+        window = audio[self.window_start - offset:]
+        words = await self.transcribe(wav_bytes(window), self.text[-self.prompt_chars:])
+
+        # The overlap re-hears committed audio; drop what was already committed
+        hypothesis = self.dedup.filter(
+            [(w["start"] + window_offset, w["end"] + window_offset, w["word"]) for w in words]
+        )
+
+        agreed, self.partial = self.stabilizer.update(hypothesis)
+        self._commit(agreed)
+        newly_committed.extend(agreed)
+
+        # Resume just before the first uncommitted word, or trim silence down to the holdback
+        resume = end / SAMPLE_RATE - self.holdback
+        if self.partial:
+            resume = min(resume, self.partial[0][0])
+        self.window_start = max(self.window_start, int(resume * SAMPLE_RATE) - self.overlap)
+        return newly_committed
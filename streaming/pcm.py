@@ -0,0 +1,37 @@
+import asyncio
+import wave
+from io import BytesIO
+
+import numpy as np
+
+# Whisper's native input format
+SAMPLE_RATE = 16000
+
+
+async def decode_pcm(data):
+    """Decode browser container bytes (WebM/Opus, Ogg, ...) to 16 kHz mono int16 samples with ffmpeg."""
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    out, err = await proc.communicate(bytes(data))
+    # A recording in progress ends mid-cluster, so ffmpeg may exit non-zero
+    # after decoding everything before it; only fail if nothing came out
+    if not out and proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {err.decode(errors='replace').strip()[:200]}")
+    return np.frombuffer(out[:len(out) - len(out) % 2], dtype=np.int16)
+
+
+def wav_bytes(samples):
+    """Wrap int16 samples in a WAV header for the inference server."""
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(np.ascontiguousarray(samples, dtype=np.int16).tobytes())
+    return buffer.getvalue()
@@ -0,0 +1,137 @@
+# Replay harness for the streaming engine. Feeds a recording through
+# IncrementalTranscriber one tick at a time (as fast as the server answers,
+# not in real time) and reports word churn and commit latency.
+#
+#   python replay.py recording.webm --url http://localhost:8000 --record hyps.jsonl
+#   python replay.py --hypotheses hyps.jsonl --agreement 3
+#
+# --record saves the words the server returned on each tick; --hypotheses
+# replays such a file offline, so stabilizer settings can be compared on
+# identical model output without an inference server.
+#
+# Churn counts partial words that were later changed or withdrawn. Commit
+# latency is the audio time between a word ending and it being committed.
+
+import argparse
+import asyncio
+import json
+import statistics
+import wave
+from io import BytesIO
+
+import numpy as np
+
+from incremental import IncrementalTranscriber
+from pcm import SAMPLE_RATE, decode_pcm
+from stabilizer import normalize
+from whisper_api import WhisperClient
+
+
+async def replay(engine, ticks):
+    """Run `engine` over (end_seconds, audio) ticks and collect churn and latency figures."""
+    latencies = []
+    churned = 0
+    previous_tail = []
+    for end, audio in ticks:
+        new_words = await engine.step(audio)
+        latencies.extend(end - word_end for _, word_end, _ in new_words)
+
+        # Only the previous partial can have changed; committed words are final
+        tail = [normalize(word) for _, _, word in new_words + engine.partial]
+        churned += sum(1 for i, key in enumerate(previous_tail) if i >= len(tail) or tail[i] != key)
+        previous_tail = [normalize(word) for _, _, word in engine.partial]
+
+    return {
+        "ticks": len(ticks),
+        "committed_words": len(engine.committed),
+        "pending_words": len(engine.partial),
+        "churned_words": churned,
+        "churn_ratio": round(churned / max(1, len(engine.committed)), 3),
+        "commit_latency_mean": round(statistics.fmean(latencies), 3) if latencies else None,
+        "commit_latency_p50": round(percentile(latencies, 50), 3) if latencies else None,
+        "commit_latency_p90": round(percentile(latencies, 90), 3) if latencies else None,
+        "commit_latency_max": round(max(latencies), 3) if latencies else None,
+    }
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def recording_transcriber(transcribe, engine_ref, log):
+    """Wrap `transcribe` to log each request's words in absolute time."""
+    async def wrapped(wav, prompt):
+        words = await transcribe(wav, prompt)
+        offset = engine_ref[0].window_start / SAMPLE_RATE
+        with wave.open(BytesIO(wav)) as window:
+            end = offset + window.getnframes() / SAMPLE_RATE
+        log.append({
+            "end": round(end, 3),
+            "words": [[w["start"] + offset, w["end"] + offset, w["word"]] for w in words]
+        })
+        return words
+    return wrapped
+
+
+def recorded_transcriber(hypotheses, engine_ref):
+    """Answer each tick from a recorded hypothesis, clipped to the engine's current window."""
+    remaining = iter(hypotheses)
+
+    async def transcribe(wav, prompt):
+        offset = engine_ref[0].window_start / SAMPLE_RATE
+        return [{"start": start - offset, "end": end - offset, "word": word}
+                for start, end, word in next(remaining) if start >= offset - 0.05]
+    return transcribe
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Replay audio through the streaming engine")
+    parser.add_argument("audio", nargs="?", help="Recording to replay (any format ffmpeg reads)")
+    parser.add_argument("--url", default="http://localhost:8000", help="faster-whisper server")
+    parser.add_argument("--hypotheses", help="Replay recorded hypotheses (JSONL) instead of audio")
+    parser.add_argument("--record", help="Write each tick's hypothesis to this JSONL file")
+    parser.add_argument("--tick", type=float, default=1.0, help="Seconds of audio per tick")
+    parser.add_argument("--agreement", type=int, default=2, help="LocalAgreement n")
+    args = parser.parse_args()
+
+    engine_ref = [None]
+    log = []
+    client = None
+    if args.hypotheses:
+        with open(args.hypotheses) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        transcribe = recorded_transcriber([r["words"] for r in records], engine_ref)
+        ends = [r["end"] for r in records]
+        samples = np.zeros(int(ends[-1] * SAMPLE_RATE) + 1, dtype=np.int16) if ends else np.zeros(0, np.int16)
+    elif args.audio:
+        with open(args.audio, "rb") as f:
+            samples = await decode_pcm(f.read())
+        client = WhisperClient(args.url)
+        transcribe = client.transcribe_words
+        if args.record:
+            transcribe = recording_transcriber(transcribe, engine_ref, log)
+        duration = len(samples) / SAMPLE_RATE
+        ends = [min(duration, args.tick * i) for i in range(1, int(np.ceil(duration / args.tick)) + 1)]
+    else:
+        parser.error("give an audio file or --hypotheses")
+
+    engine = engine_ref[0] = IncrementalTranscriber(transcribe, agreement=args.agreement)
+    ticks = [(end, samples[:int(end * SAMPLE_RATE)]) for end in ends]
+    try:
+        results = await replay(engine, ticks)
+    finally:
+        if client is not None:
+            await client.aclose()
+
+    if args.record and log:
+        with open(args.record, "w") as f:
+            for record in log:
+                f.write(json.dumps(record) + "\n")
+
+    print(engine.text + (" " + engine.partial_text if engine.partial else ""))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+import numpy as np
+
+from pcm import SAMPLE_RATE
+
+
+class PcmRingBuffer:
+    """Fixed-capacity int16 sample buffer addressed by absolute sample index.
+
+    Storage is preallocated once. Every sample is written twice, at `i` and
+    `i + capacity`, so any range of up to `capacity` samples is one
+    contiguous slice and `view` never copies. A view stays valid until
+    another `capacity` samples have been written.
+
+    Only audio not yet released plus `history_seconds` before the release
+    point is kept. Audio leaving the buffer (released, or overwritten because
+    the reader fell a whole capacity behind) is passed to `spill(bytes)` in
+    order, if given, e.g. for archival.
+    """
+
+    def __init__(self, capacity_seconds, history_seconds=0.0, spill=None):
+        self.capacity = int(capacity_seconds * SAMPLE_RATE)
+        self.history = int(history_seconds * SAMPLE_RATE)
+        self.data = np.zeros(2 * self.capacity, dtype=np.int16)
+        self.spill = spill
+        self.start = 0     # absolute index of the oldest retained sample
+        self.end = 0       # absolute index one past the newest sample
+        self.released = 0
+        self.overflowed = 0
+
+    @staticmethod
+    def nbytes_for(capacity_seconds):
+        """Memory a buffer of `capacity_seconds` allocates."""
+        return 2 * int(capacity_seconds * SAMPLE_RATE) * np.dtype(np.int16).itemsize
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def __len__(self):
+        return self.end - self.start
+
+    def write(self, data):
+        samples = np.frombuffer(data, dtype=np.int16) if not isinstance(data, np.ndarray) else data
+        if len(samples) > self.capacity:
+            skipped = len(samples) - self.capacity
+            self._drop(self.end)
+            if self.spill is not None:
+                self.spill(samples[:skipped].tobytes())
+            self.overflowed += skipped
+            self.start = self.end = self.end + skipped
+            samples = samples[skipped:]
+
+        overflow = self.end + len(samples) - self.start - self.capacity
+        if overflow > 0:
+            self.overflowed += overflow
+            self._drop(self.start + overflow)
+
+        pos = self.end % self.capacity
+        first = min(len(samples), self.capacity - pos)
+        rest = len(samples) - first
+        self.data[pos:pos + first] = samples[:first]
+        self.data[pos + self.capacity:pos + self.capacity + first] = samples[:first]
+        if rest:
+            self.data[:rest] = samples[first:]
+            self.data[self.capacity:self.capacity + rest] = samples[first:]
+        self.end += len(samples)
+
+    def view(self, start=None, stop=None):
+        """Samples [start, stop) (clamped to what is retained) without copying."""
+        start = self.start if start is None else max(start, self.start)
+        stop = self.end if stop is None else min(stop, self.end)
+        if stop <= start:
+            return self.data[:0]
+        i = start % self.capacity
+        return self.data[i:i + stop - start]
+
+    def release(self, before):
+        """Audio before `before` is no longer needed; keep only the configured history of it."""
+        self.released = max(self.released, min(before, self.end))
+        self._drop(self.released - self.history)
+
+    def drain(self):
+        """Spill everything still retained (when the stream ends)."""
+        self._drop(self.end)
+
+    def _drop(self, before):
+        if before <= self.start:
+            return
+        if self.spill is not None:
+            self.spill(self.view(self.start, before).tobytes())
+        self.start = before
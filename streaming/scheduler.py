@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+
+class AdaptiveScheduler:
+    """Paces one session's transcription steps to what inference can sustain.
+
+    Steps are due `interval` seconds after the previous one started, not
+    after it finished, so a slow step is not followed by a full idle tick.
+    Each step takes all the audio decoded by then: when inference is slower
+    than the tick, the windows that would have been sent in between are
+    never queued, and their audio is coalesced into the next request.
+
+    Inference is tracked as moving averages of the real-time factor
+    (inference seconds per second of window audio) and the wall time per
+    step. Under load the interval widens so inference takes about
+    `target_load` of the session's time (up to `max_interval`), and each
+    request then carries more new audio. It narrows back towards
+    `min_interval` as inference catches up. Steps with less than
+    `min_new_seconds` of new audio are not worth a request and wait.
+
+    `lag` is how far the transcript trails the stream: seconds of decoded
+    audio not covered by the last completed step.
+    """
+
+    def __init__(self, min_interval=1.0, max_interval=5.0, target_load=0.7, smoothing=0.3,
+                 min_new_seconds=0.25):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_load = target_load
+        self.smoothing = smoothing
+        self.min_new_seconds = min_new_seconds
+        self.interval = min_interval
+        self.rtf = None
+        self.step_seconds = None
+        self.lag = 0.0
+        self.coalesced = 0  # ticks folded into a later request while inference was busy
+        self.started = time.monotonic()
+        self.next_due = self.started + min_interval
+
+    async def wait(self):
+        """Sleep until the next step is due."""
+        await asyncio.sleep(max(self.next_due - time.monotonic(), 0))
+        self.started = time.monotonic()
+        # If nothing runs this time, poll again at the base rate
+        self.next_due = self.started + self.min_interval
+
+    def ready(self, new_seconds):
+        return new_seconds >= self.min_new_seconds
+
+    def _average(self, current, sample):
+        return sample if current is None else current + self.smoothing * (sample - current)
+
+    def record(self, window_seconds, lag_seconds):
+        """Account for the step started by the last `wait`; returns its wall time in seconds."""
+        elapsed = time.monotonic() - self.started
+        if window_seconds > 0:
+            self.rtf = self._average(self.rtf, elapsed / window_seconds)
+        self.step_seconds = self._average(self.step_seconds, elapsed)
+        self.lag = lag_seconds
+        self.coalesced += int(elapsed // self.min_interval)
+
+        self.interval = min(max(self.step_seconds / self.target_load, self.min_interval), self.max_interval)
+        self.next_due = self.started + self.interval
+        return elapsed
+
+    def stats(self):
+        return {
+            "interval": round(self.interval, 2),
+            "rtf": round(self.rtf, 3) if self.rtf is not None else None,
+            "lag": round(self.lag, 2),
+            "coalesced": self.coalesced,
+        }
@@ -1,26 +1,42 @@
 from fastapi import FastAPI, UploadFile, File
 from fastapi.responses import StreamingResponse, HTMLResponse, JSONResponse
+from contextlib import asynccontextmanager
 import uvicorn
 import asyncio
-import httpx
-from io import BytesIO
 
-app = FastAPI()
+from decoder import StreamingDecoder
+from ringbuffer import PcmRingBuffer
+from whisper_api import WhisperClient
+from windows import WindowedTranscriber
 
-# Global audio buffer to accumulate incoming chunks
-audio_buffer = bytearray()
+# Sliding window parameters, in seconds of decoded audio
+WINDOW_SECONDS = 10.0     # each request transcribes this much audio
+STRIDE_SECONDS = 2.0      # a new window every this much audio
 
-# Sliding window parameters (in bytes, for demonstration purposes)
-# In practice, you might want to convert from a time duration to bytes.
-WINDOW_SIZE = 100000      # e.g. ~10 seconds of audio (this is a rough estimate)
-STRIDE = 20000            # e.g. slide forward by ~2 seconds worth of bytes
-
-# Global pointer and state for sliding window
-last_processed_position = 0
-previous_transcription = ""
+# Decoded 16 kHz mono audio, fed by one ffmpeg process as chunks arrive; a fixed
+# ring that only keeps what the next windows need
+RING_SECONDS = 60.0
+pcm = PcmRingBuffer(RING_SECONDS)
+decoder = None
+# Earliest sample each open transcript stream still needs; audio is only released below all of them
+readers = {}
 
 # Faster Whisper container endpoint running locally (by Trelis Research)
 FAST_WHISPER_URL = "http://localhost:8000"
+whisper = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global whisper
+    whisper = WhisperClient(FAST_WHISPER_URL)
+    yield
+    if decoder is not None:
+        decoder.close()
+    await whisper.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 html_content = r"""
 <!DOCTYPE html>
@@ -60,7 +76,8 @@ html_content = r"""
     const eventSource = new EventSource("/transcript");
     eventSource.onmessage = (event) => {
       const transcriptEl = document.getElementById("transcript");
-      transcriptEl.textContent = event.data; // update with latest diff
+      // Each event carries only words not sent before
+      transcriptEl.textContent += (transcriptEl.textContent ? " " : "") + event.data;
     };
   </script>
 </body>
@@ -74,12 +91,18 @@ def get_index():
 # Endpoint to receive audio chunks from the browser
 @app.post("/upload_chunk")
 async def upload_chunk(file: UploadFile = File(...)):
-    global audio_buffer
+    global decoder
     chunk = await file.read()
-    audio_buffer.extend(chunk)
+    if decoder is None:
+        decoder = StreamingDecoder(pcm.write)
+        await decoder.start()
+    try:
+        await decoder.feed(chunk)
+    except RuntimeError as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
     return {"message": "Chunk received"}
 
-# SSE endpoint using sliding window to send only new transcription parts
+# SSE endpoint using sliding windows over decoded audio to send only new words
 @app.get("/transcript")
 async def transcript_stream():
     headers = {
@@ -87,44 +110,29 @@ async def transcript_stream():
         "X-Accel-Buffering": "no"
     }
     async def event_generator():
-        global last_processed_position, previous_transcription, audio_buffer
-        while True:
-            # Check if there's enough new audio to slide the window
-            if len(audio_buffer) - last_processed_position >= STRIDE:
-                # Ensure we have a full window; if not, use what we have
-                end_pos = last_processed_position + WINDOW_SIZE
-                if end_pos > len(audio_buffer):
-                    current_window = audio_buffer[last_processed_position:]
-                else:
-                    current_window = audio_buffer[last_processed_position:end_pos]
-                # Slide the window forward by STRIDE bytes
-                last_processed_position += STRIDE
-
-                # Wrap current_window in a file-like object
-                audio_file_like = BytesIO(current_window)
-                async with httpx.AsyncClient(http2=False, timeout=None) as client:
-                    files = {"file": ("audio.wav", audio_file_like, "audio/wav")}
-                    data = {"language": "en"}
-                    new_transcription = ""
-                    try:
-                        async with client.stream("POST", f"{FAST_WHISPER_URL}/v1/audio/transcriptions", files=files, data=data) as resp:
-                            async for line in resp.aiter_lines():
-                                if line:
-                                    new_transcription += line + "\n"
-                                    print("Streamed line:", line)  # Debug output on server
-                    except Exception as e:
-                        new_transcription = f"Error during transcription: {str(e)}"
-                        print(new_transcription)
-                # Compute the diff: if new_transcription starts with previous_transcription, only yield the new part
-                if new_transcription.startswith(previous_transcription):
-                    diff = new_transcription[len(previous_transcription):]
-                else:
-                    diff = new_transcription
-                previous_transcription = new_transcription
-
-                if diff.strip():
-                    yield f"data: {diff.strip()}\n\n"
-            await asyncio.sleep(1)
+        windows = WindowedTranscriber(
+            whisper.transcribe_words, window_seconds=WINDOW_SECONDS, stride_seconds=STRIDE_SECONDS
+        )
+        readers[windows] = pcm.start
+        try:
+            while True:
+                # A zero-copy view of the samples the next windows need
+                start = max(windows.window_start, pcm.start)
+                try:
+                    words = await windows.step(pcm.view(start), start)
+                except Exception as e:
+                    print(f"Error during transcription: {e}")
+                    words = []
+                readers[windows] = windows.window_start
+                pcm.release(min(readers.values()))
+                # Words from the overlap that were already sent are dropped by timestamp
+                new_text = "".join(word for _, _, word in words).strip()
+                if new_text:
+                    print("New words:", new_text)
+                    yield f"data: {new_text}\n\n"
+                await asyncio.sleep(1)
+        finally:
+            readers.pop(windows, None)
     return StreamingResponse(event_generator(), headers=headers, media_type="text/event-stream")
 
 if __name__ == "__main__":
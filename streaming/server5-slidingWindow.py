@@ -1,20 +1,72 @@
-from fastapi import FastAPI, UploadFile, File
+from fastapi import FastAPI, UploadFile, File, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse, HTMLResponse, JSONResponse
+from contextlib import asynccontextmanager
 import uvicorn
 import asyncio
-import httpx
 import json
-from io import BytesIO
 import re
-from difflib import SequenceMatcher
+import struct
 
-app = FastAPI()
+from functools import partial
 
-# Global audio buffer to accumulate incoming chunks
-audio_buffer = bytearray()
+from archive import PcmArchive
+from incremental import IncrementalTranscriber
+from decoder import StreamingDecoder
+from pcm import SAMPLE_RATE, wav_bytes
+from scheduler import AdaptiveScheduler
+from sessions import SessionManager, SessionLimitError
+from whisper_api import RequestSuperseded, WhisperClient
+
+# Audio that has left a session's ring buffer is appended to files here (None disables
+# archival); with a bucket set, each file is uploaded to S3 when its session ends
+ARCHIVE_DIR = None
+ARCHIVE_S3_BUCKET = None
+
+# Per-recorder audio buffers and transcript state, keyed by session ID
+sessions = SessionManager(archive_dir=ARCHIVE_DIR, archive_bucket=ARCHIVE_S3_BUCKET)
+
+# Session ID comes from ?session=<id> or this cookie (set when the page is served)
+SESSION_COOKIE = "session_id"
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+# Pooled keep-alive client for FAST_WHISPER_URL, created on startup
+whisper = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global whisper
+    whisper = WhisperClient(FAST_WHISPER_URL, max_concurrency=WHISPER_MAX_CONCURRENCY)
+    evictor = asyncio.create_task(sessions.run_evictor())
+    yield
+    evictor.cancel()
+    sessions.close_all()
+    await PcmArchive.wait_closed()
+    await whisper.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+def resolve_session_id(request, response=None):
+    """Session ID for this request; a new one is issued (and set as a cookie) if missing."""
+    session_id = request.query_params.get("session") or request.cookies.get(SESSION_COOKIE)
+    if not session_id or not SESSION_ID_PATTERN.match(session_id):
+        session_id = SessionManager.new_id()
+    if response is not None and request.cookies.get(SESSION_COOKIE) != session_id:
+        response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite="lax")
+    return session_id
 
 # Faster Whisper container endpoint running locally (by Trelis Research)
 FAST_WHISPER_URL = "http://localhost:8000"
+# Requests in flight to FAST_WHISPER_URL across all sessions
+WHISPER_MAX_CONCURRENCY = 4
+
+# WebSocket ingest: unacknowledged frames a client may have in flight, and the
+# frame header (uint32 sequence number, uint64 byte offset of the payload)
+WS_WINDOW = 8
+WS_FRAME_HEADER = struct.Struct("!IQ")
 
 html_content = r"""
 <!DOCTYPE html>
@@ -32,6 +84,7 @@ html_content = r"""
       white-space: pre-wrap;
       line-height: 1.5;
     }
+    #transcript .partial { color: #888; }
     #debug { 
       font-family: monospace; 
       background-color: #f0f0f0; 
@@ -57,7 +110,17 @@ html_content = r"""
   <script>
     let mediaRecorder;
     let audioChunks = [];
-    let serverTranscriptId = 0; // Track transcript version
+    let finalText = "";   // Committed words; never change once received
+    let partialText = ""; // Unstable tail; replaced on every update
+
+    function renderTranscript() {
+      const transcriptEl = document.getElementById("transcript");
+      transcriptEl.textContent = finalText;
+      const partialEl = document.createElement("span");
+      partialEl.className = "partial";
+      partialEl.textContent = (finalText && partialText ? " " : "") + partialText;
+      transcriptEl.appendChild(partialEl);
+    }
     
     // Start recording when user clicks the button
     document.getElementById("recordButton").onclick = async () => {
@@ -72,11 +135,18 @@ html_content = r"""
         mediaRecorder.ondataavailable = async (event) => {
           if (event.data.size > 0) {
             audioChunks.push(event.data);
+            if (audioSocket) {
+              // Keep chunks in recording order while their bytes are read
+              sendChain = sendChain
+                .then(() => event.data.arrayBuffer())
+                .then((buffer) => audioSocket.send(buffer));
+              return;
+            }
             const formData = new FormData();
             formData.append("file", event.data, "chunk.wav");
             
             try {
-              await fetch("/upload_chunk", { method: "POST", body: formData });
+              await fetch("/upload_chunk" + location.search, { method: "POST", body: formData });
             } catch (err) {
               console.error('Error sending chunk:', err);
             }
@@ -102,8 +172,14 @@ html_content = r"""
     document.getElementById("clearButton").onclick = () => {
       document.getElementById("transcript").innerHTML = "";
       document.getElementById("debug").innerHTML = "";
-      serverTranscriptId = 0;
-      fetch("/clear_buffer", { method: "POST" });
+      finalText = "";
+      partialText = "";
+      if (audioSocket) {
+        // Sent in order with the audio frames, so none of the new recording is dropped as a resend
+        audioSocket.reset();
+      } else {
+        fetch("/clear_buffer" + location.search, { method: "POST" });
+      }
     };
     
     document.getElementById("toggleDebug").onclick = () => {
@@ -120,94 +196,318 @@ html_content = r"""
       return message;
     }
 
-    // Subscribe to the SSE endpoint for transcript updates
-    const eventSource = new EventSource("/transcript");
-    eventSource.onmessage = (event) => {
-      const transcriptEl = document.getElementById("transcript");
+    function handleEvent(data) {
       const debugEl = document.getElementById("debug");
-      
-      if (event.data) {
-        try {
-          const data = JSON.parse(event.data);
-          
-          if (data.type === "transcript") {
-            // Only update if this is a newer transcript
-            if (data.id > serverTranscriptId) {
-              transcriptEl.textContent = data.text;
-              serverTranscriptId = data.id;
-            }
-          } else if (data.type === "debug") {
-            // Add filtered debug info
-            const timeStamp = new Date().toISOString().substr(11, 8);
-            const filteredMessage = filterDebugMessage(data.message);
-            debugEl.innerHTML += `<div>[${timeStamp}] ${filteredMessage}</div>`;
-            // Scroll to bottom of debug
-            debugEl.scrollTop = debugEl.scrollHeight;
+      if (data.type === "transcript") {
+        // Snapshot on connect (or after the session was cleared)
+        finalText = data.text;
+        partialText = data.partial || "";
+        renderTranscript();
+      } else if (data.type === "final") {
+        finalText = (finalText + data.text).trim();
+        renderTranscript();
+      } else if (data.type === "partial") {
+        partialText = data.text;
+        renderTranscript();
+      } else if (data.type === "debug") {
+        // Add filtered debug info
+        const timeStamp = new Date().toISOString().substr(11, 8);
+        const filteredMessage = filterDebugMessage(data.message);
+        debugEl.innerHTML += `<div>[${timeStamp}] ${filteredMessage}</div>`;
+        // Scroll to bottom of debug
+        debugEl.scrollTop = debugEl.scrollHeight;
+      }
+    }
+
+    // Binary audio and transcript events over one WebSocket. Each frame is a
+    // 12-byte header (uint32 sequence number, uint64 byte offset) followed by
+    // audio bytes. Frames stay queued until acknowledged and at most `window`
+    // are unacknowledged at once. After a reconnect the server's hello says
+    // how many bytes it already has, and everything after that is resent.
+    // reset() clears the session with a "clear" message on the same socket;
+    // until the server answers "cleared", acks still refer to the old
+    // stream and are ignored, and no new frames are sent.
+    class AudioSocket {
+      constructor(url) {
+        this.url = url;
+        this.queue = [];
+        this.seq = 0;
+        this.offset = 0;
+        this.clearing = false;
+        this.window = 8;
+        this.retryDelay = 500;
+        this.connect();
+      }
+
+      connect() {
+        this.ws = new WebSocket(this.url);
+        this.ws.binaryType = "arraybuffer";
+        this.ws.onopen = () => { this.retryDelay = 500; };
+        this.ws.onmessage = (event) => {
+          try {
+            this.onMessage(JSON.parse(event.data));
+          } catch (e) {
+            console.error("Error parsing socket message:", e);
           }
-        } catch (e) {
-          console.error("Error parsing event data:", e);
-          // Fall back to simple append if not JSON
-          debugEl.innerHTML += `<div>Error: ${e.message}</div>`;
+        };
+        this.ws.onclose = () => {
+          this.ws = null;
+          document.getElementById("debug").innerHTML += `<div>WebSocket closed, reconnecting</div>`;
+          setTimeout(() => this.connect(), this.retryDelay);
+          this.retryDelay = Math.min(this.retryDelay * 2, 10000);
+        };
+      }
+
+      onMessage(data) {
+        if (this.clearing && (data.type === "hello" || data.type === "resync" || data.type === "ack")) {
+          if (data.type === "hello") {
+            // Reconnected before the clear got through; ask again on the new socket
+            this.sendClear();
+          }
+        } else if (data.type === "cleared") {
+          this.clearing = false;
+          this.queue.forEach((frame) => { frame.sent = false; });
+          this.flush();
+        } else if (data.type === "hello" || data.type === "resync") {
+          if (data.window) {
+            this.window = data.window;
+          }
+          this.acknowledge(data.offset);
+          this.queue.forEach((frame) => { frame.sent = false; });
+          this.flush();
+        } else if (data.type === "ack") {
+          this.acknowledge(data.offset);
+          this.flush();
+        } else if (data.type === "error") {
+          console.error("Server error:", data.message);
+          document.getElementById("debug").innerHTML += `<div>Error: ${data.message}</div>`;
+        } else {
+          handleEvent(data);
         }
       }
-    };
-    
-    eventSource.onerror = (err) => {
-      console.error('EventSource error:', err);
-      document.getElementById("debug").innerHTML += `<div>EventSource error</div>`;
-    };
+
+      acknowledge(offset) {
+        while (this.queue.length && this.queue[0].offset + this.queue[0].size <= offset) {
+          this.queue.shift();
+        }
+      }
+
+      send(buffer) {
+        const frame = new Uint8Array(12 + buffer.byteLength);
+        const view = new DataView(frame.buffer);
+        view.setUint32(0, this.seq++);
+        view.setBigUint64(4, BigInt(this.offset));
+        frame.set(new Uint8Array(buffer), 12);
+        this.queue.push({ offset: this.offset, size: buffer.byteLength, data: frame, sent: false });
+        this.offset += buffer.byteLength;
+        this.flush();
+      }
+
+      flush() {
+        if (this.clearing || !this.ws || this.ws.readyState !== WebSocket.OPEN) {
+          return;
+        }
+        let inFlight = this.queue.filter((frame) => frame.sent).length;
+        for (const frame of this.queue) {
+          if (inFlight >= this.window) {
+            break;
+          }
+          if (!frame.sent) {
+            this.ws.send(frame.data);
+            frame.sent = true;
+            inFlight++;
+          }
+        }
+      }
+
+      reset() {
+        this.queue = [];
+        this.seq = 0;
+        this.offset = 0;
+        this.clearing = true;
+        this.sendClear();
+      }
+
+      sendClear() {
+        if (this.ws && this.ws.readyState === WebSocket.OPEN) {
+          this.ws.send(JSON.stringify({ type: "clear" }));
+        }
+      }
+    }
+
+    // WebSocket by default; ?transport=sse keeps the POST /upload_chunk + SSE path
+    const useWebSocket = "WebSocket" in window && new URLSearchParams(location.search).get("transport") !== "sse";
+    let audioSocket = null;
+    let sendChain = Promise.resolve();
+
+    if (useWebSocket) {
+      const scheme = location.protocol === "https:" ? "wss://" : "ws://";
+      audioSocket = new AudioSocket(scheme + location.host + "/ws" + location.search);
+    } else {
+      // Subscribe to the SSE endpoint for transcript updates
+      const eventSource = new EventSource("/transcript" + location.search);
+      eventSource.onmessage = (event) => {
+        if (event.data) {
+          try {
+            handleEvent(JSON.parse(event.data));
+          } catch (e) {
+            console.error("Error parsing event data:", e);
+            // Fall back to simple append if not JSON
+            document.getElementById("debug").innerHTML += `<div>Error: ${e.message}</div>`;
+          }
+        }
+      };
+      
+      eventSource.onerror = (err) => {
+        console.error('EventSource error:', err);
+        document.getElementById("debug").innerHTML += `<div>EventSource error</div>`;
+      };
+    }
   </script>
 </body>
 </html>
 """
 
 @app.get("/", response_class=HTMLResponse)
-def get_index():
-    return HTMLResponse(content=html_content)
+def get_index(request: Request):
+    response = HTMLResponse(content=html_content)
+    try:
+        sessions.get_or_create(resolve_session_id(request, response))
+    except SessionLimitError as e:
+        return session_limit_response(e)
+    return response
 
 # Endpoint to receive audio chunks from the browser
 @app.post("/upload_chunk")
-async def upload_chunk(file: UploadFile = File(...)):
-    global audio_buffer
+async def upload_chunk(request: Request, file: UploadFile = File(...)):
+    response = JSONResponse({"message": "Chunk received"})
     chunk = await file.read()
-    audio_buffer.extend(chunk)
-    return {"message": "Chunk received"}
+    try:
+        session = sessions.get_or_create(resolve_session_id(request, response))
+        await ingest(session, chunk)
+    except SessionLimitError as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
+    except RuntimeError as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+    return response
+
+# Binary audio in, transcript events out, on one socket
+@app.websocket("/ws")
+async def audio_socket(websocket: WebSocket):
+    session_id = resolve_session_id(websocket)
+    await websocket.accept()
+    try:
+        session = sessions.get_or_create(session_id)
+    except SessionLimitError as e:
+        await websocket.send_json({"type": "error", "message": str(e)})
+        await websocket.close(code=1013)
+        return
+    ensure_transcriber(session)
 
-# Endpoint to clear the buffer and history
+    send_lock = asyncio.Lock()
+
+    async def send(payload):
+        async with send_lock:
+            await websocket.send_text(json.dumps(payload))
+
+    async def forward_events():
+        while True:
+            await send(await subscriber.get())
+
+    # The hello tells a reconnecting client where to resume; the snapshot follows from the hub
+    await send({"type": "hello", "session": session.id, "offset": session.received_bytes, "window": WS_WINDOW})
+    subscriber = session.hub.subscribe()
+    forwarder = asyncio.create_task(forward_events())
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            frame = message.get("bytes")
+            if frame is None:
+                # Control messages arrive in order with the audio frames around them
+                try:
+                    control = json.loads(message.get("text") or "")
+                except ValueError:
+                    control = None
+                if isinstance(control, dict) and control.get("type") == "clear":
+                    clear_session(session)
+                    await send({"type": "cleared", "offset": session.received_bytes})
+                continue
+            if len(frame) < WS_FRAME_HEADER.size:
+                await send({"type": "error", "message": "Frame shorter than its header"})
+                continue
+
+            seq, offset = WS_FRAME_HEADER.unpack_from(frame)
+            if offset > session.received_bytes:
+                # A frame went missing; ask for everything from what we have
+                await send({"type": "resync", "offset": session.received_bytes})
+                continue
+            # Frames resent after a reconnect may overlap what already arrived
+            payload = memoryview(frame)[WS_FRAME_HEADER.size + session.received_bytes - offset:]
+            if payload:
+                try:
+                    await ingest(session, payload)
+                except SessionLimitError as e:
+                    await send({"type": "error", "message": str(e)})
+                    await websocket.close(code=1009)
+                    break
+                except RuntimeError as e:
+                    # The session's decoder is gone; acking further frames would drop them silently
+                    await send({"type": "error", "message": str(e)})
+                    await websocket.close(code=1011)
+                    break
+            await send({"type": "ack", "seq": seq, "offset": session.received_bytes})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        forwarder.cancel()
+        session.hub.unsubscribe(subscriber)
+
+# Endpoint to clear this session's buffer and history
 @app.post("/clear_buffer")
-async def clear_buffer():
-    global audio_buffer
-    audio_buffer = bytearray()
+async def clear_buffer(request: Request):
+    session = sessions.get(resolve_session_id(request))
+    if session is not None:
+        clear_session(session)
     return {"message": "Buffer cleared"}
 
-# Debug endpoint to perform a one-time transcription (for testing)
+def clear_session(session):
+    # Whatever is in flight transcribes audio that no longer exists
+    whisper.cancel(session.id)
+    sessions.clear(session)
+
+# Active sessions and buffered bytes
+@app.get("/sessions")
+async def session_stats():
+    return {**sessions.stats(), "whisper": whisper.stats()}
+
+# Debug endpoint to perform a one-time transcription of the retained audio (for testing)
 @app.get("/debug_transcript")
-async def debug_transcript():
-    global audio_buffer
-    if len(audio_buffer) == 0:
+async def debug_transcript(request: Request):
+    session_id = resolve_session_id(request)
+    session = sessions.get(session_id)
+    if session is None or session.audio is None or len(session.audio) == 0:
         return JSONResponse({"error": "Audio buffer is empty"}, status_code=400)
-    audio_file_like = BytesIO(audio_buffer)
-    async with httpx.AsyncClient(http2=False, timeout=30.0) as client:
-        files = {"file": ("audio.wav", audio_file_like, "audio/wav")}
-        data = {"language": "en"}
-        try:
-            response = await client.post(f"{FAST_WHISPER_URL}/v1/audio/transcriptions", files=files, data=data)
-            transcription = response.text
-            print("Debug transcription:", transcription)
-            return JSONResponse({"transcription": transcription})
-        except Exception as e:
-            print("Debug error:", e)
-            return JSONResponse({"error": str(e)}, status_code=500)
-
-def extract_text_from_json_response(line):
-    """Extract text from JSON response or return the line itself."""
     try:
-        result = json.loads(line)
-        if "text" in result:
-            return result["text"].strip()
-    except json.JSONDecodeError:
-        pass
-    return line.strip()
+        # Shares the inference slots with live sessions; a newer debug request replaces this one
+        transcription = await whisper.transcribe_text(
+            wav_bytes(session.audio.view()), key=f"{session_id}:debug", timeout=30.0
+        )
+        print("Debug transcription:", transcription)
+        return JSONResponse({"transcription": transcription})
+    except RequestSuperseded:
+        return JSONResponse({"error": "Superseded by a newer debug request"}, status_code=409)
+    except Exception as e:
+        print("Debug error:", e)
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+def session_limit_response(error):
+    """All session slots are taken by active recorders; like the WebSocket's 1013, try again later."""
+    return JSONResponse({"error": str(error)}, status_code=503, headers={"Retry-After": "30"})
+
+def sse(payload):
+    return "data: " + json.dumps(payload) + "\n\n"
 
 def filter_system_metadata(text):
     """Filter out system metadata tags from text."""
@@ -215,49 +515,107 @@ def filter_system_metadata(text):
     filtered_text = re.sub(r'<userStyle>.*?</userStyle>', '', text)
     return filtered_text
 
-def find_new_content(old_text, new_text):
-    """Find what content in new_text is not in old_text."""
-    # If the new text is shorter, it's likely a completely different segment
-    if len(new_text) < len(old_text) * 0.8:
-        return new_text
-    
-    # Use SequenceMatcher to find the best match
-    matcher = SequenceMatcher(None, old_text.lower(), new_text.lower())
-    match = matcher.find_longest_match(0, len(old_text), 0, len(new_text))
-    
-    # If there's a substantial match at the beginning
-    if match.b == 0 and match.size > len(old_text) * 0.7:
-        # The new text is an extension of the old text
-        # Return just the new part
-        if match.size < len(new_text):
-            # There's content after the match
-            return new_text[match.size:]
-    
-    # Find if the new text contains the whole old text
-    if old_text.lower() in new_text.lower():
-        # Return the entire new text as it's a more complete version
-        return new_text
-    
-    # Check if the ends of old_text are at the beginning of new_text
-    # This helps catch overlapping speech
-    words_old = old_text.lower().split()
-    words_new = new_text.lower().split()
-    
-    # Try to find the last few words of old_text at the beginning of new_text
-    max_overlap_size = min(10, len(words_old), len(words_new))
-    for overlap_size in range(max_overlap_size, 2, -1):
-        overlap_old = ' '.join(words_old[-overlap_size:])
-        overlap_new = ' '.join(words_new[:overlap_size])
-        
-        if overlap_old == overlap_new:
-            # Found overlap, return everything after the overlap
-            return new_text
-    
-    # Default: can't find clear relationships, return the new text
-    return new_text
+async def ingest(session, chunk):
+    """Feed a chunk of container bytes to the session's decoder, which fills its ring buffer."""
+    if session.decoder_error:
+        # The rest of a stream cannot be decoded without its start; the client has to clear and restart
+        raise RuntimeError(f"{session.decoder_error}; clear the session to record again")
+    sessions.receive(session, chunk)
+    if session.decoder is None:
+        def on_pcm(data):
+            # A decoder replaced by a clear may still flush output; drop it
+            if decoder is session.decoder:
+                session.audio.write(data)
+
+        def on_exit(decoder):
+            if decoder is session.decoder:
+                session.decoder_error = f"Audio decoder failed: {decoder.error}"
+                session.close_decoder()
+                session.hub.publish({"type": "debug", "message": f"Error: {session.decoder_error}"})
+
+        decoder = StreamingDecoder(on_pcm, on_exit)
+        session.decoder = decoder
+        await decoder.start()
+    await session.decoder.feed(chunk)
+    # Only bytes the decoder took count towards the resume offset, so a failed feed is resent
+    session.received_bytes += len(chunk)
+    ensure_transcriber(session)
+
+def ensure_transcriber(session):
+    """Start the session's transcription task if it is not running."""
+    if session.task is None or session.task.done():
+        session.task = asyncio.create_task(transcription_loop(session))
+
+async def transcription_loop(session):
+    """The one transcription task per session; its events reach every stream through the hub."""
+    hub = session.hub
+    # Widens the tick when inference lags; audio arriving meanwhile goes into the next request
+    scheduler = AdaptiveScheduler()
+    while True:
+        await scheduler.wait()
+        audio = session.audio
+        if audio is None or not scheduler.ready((audio.end - session.processed_samples) / SAMPLE_RATE):
+            continue
+
+        session.processed_samples = audio.end
+        if session.engine is None:
+            session.engine = IncrementalTranscriber(partial(whisper.transcribe_words, key=session.id))
+        engine = session.engine
+        try:
+            # A view of the window in the ring buffer; nothing is copied until it is encoded.
+            # If inference fell a whole ring behind, the engine commits what it had for the lost audio
+            offset = max(engine.window_start, audio.start)
+            samples = audio.view(offset)
+            window_seconds = len(samples) / SAMPLE_RATE
+            total_seconds = audio.end / SAMPLE_RATE
+            committed = await engine.step(samples, offset)
+        except RequestSuperseded:
+            continue
+        except Exception as e:
+            hub.publish({"type": "debug", "message": f"Error: Error during transcription: {e}"})
+            await asyncio.sleep(2)
+            continue
+        # Audio decoded while the step ran is what the transcript now trails by
+        elapsed = scheduler.record(window_seconds, (audio.end - offset - len(samples)) / SAMPLE_RATE)
+
+        hub.publish({
+            "type": "debug",
+            "message": f"Window {window_seconds:.1f}s of {total_seconds:.1f}s "
+                       f"({len(audio) / SAMPLE_RATE:.1f}s retained): "
+                       f"inference {elapsed * 1000:.0f} ms (RTF {scheduler.rtf or 0:.2f}), "
+                       f"lag {scheduler.lag:.1f}s, next in {scheduler.interval:.1f}s, "
+                       f"committed {len(committed)} word(s), {len(hub)} subscriber(s)",
+            **scheduler.stats()
+        })
+
+        # The buffer may have been cleared while this step was running
+        if engine is not session.engine:
+            continue
+        # Committed audio before the next window is only kept as history (and archived)
+        audio.release(engine.window_start)
+        partial_text = filter_system_metadata(engine.partial_text)
+        if not committed and partial_text == session.partial:
+            continue
+
+        session.transcript = engine.text
+        session.partial = partial_text
+        session.transcript_id += 1
+        if committed:
+            hub.publish({
+                "type": "final",
+                "id": session.transcript_id,
+                "text": filter_system_metadata("".join(word for _, _, word in committed)),
+                "words": [[round(start, 2), round(end, 2), word] for start, end, word in committed]
+            })
+        hub.publish({"type": "partial", "id": session.transcript_id, "text": session.partial})
 
 @app.get("/transcript")
-async def transcript_stream():
+async def transcript_stream(request: Request):
+    try:
+        session = sessions.get_or_create(resolve_session_id(request))
+    except SessionLimitError as e:
+        return session_limit_response(e)
+    ensure_transcriber(session)
     headers = {
         "Cache-Control": "no-cache",
         "Content-Type": "text/event-stream",
@@ -266,146 +624,13 @@ async def transcript_stream():
     }
     
     async def event_generator():
-        # Server-side transcript management
-        current_transcript = ""
-        transcript_id = 0
-        last_new_text = ""
-        
-        # Initial empty message to establish connection
-        yield "data: " + json.dumps({"type": "transcript", "id": transcript_id, "text": ""}) + "\n\n"
-        
-        while True:
-            if len(audio_buffer) > 0:
-                # Create a copy of the buffer to avoid race conditions
-                buffer_copy = audio_buffer.copy()
-                audio_file_like = BytesIO(buffer_copy)
-                
-                async with httpx.AsyncClient(http2=False, timeout=None) as client:
-                    files = {"file": ("audio.wav", audio_file_like, "audio/wav")}
-                    data = {"language": "en"}
-                    new_text = ""
-                    
-                    try:
-                        # Use the streaming approach
-                        async with client.stream("POST", f"{FAST_WHISPER_URL}/v1/audio/transcriptions", files=files, data=data) as resp:
-                            async for line in resp.aiter_lines():
-                                if line:
-                                    raw_text = extract_text_from_json_response(line)
-                                    new_text = filter_system_metadata(raw_text)
-                                    yield "data: " + json.dumps({
-                                        "type": "debug", 
-                                        "message": f"Raw whisper output: {new_text}"
-                                    }) + "\n\n"
-                    except Exception as e:
-                        error_msg = f"Error during transcription: {str(e)}"
-                        yield "data: " + json.dumps({
-                            "type": "debug", 
-                            "message": f"Error: {error_msg}"
-                        }) + "\n\n"
-                        await asyncio.sleep(2)
-                        continue
-                
-                # Skip if we received empty output or exact same text as last time
-                if not new_text or new_text == last_new_text:
-                    await asyncio.sleep(1)
-                    continue
-                
-                # Keep track of what we processed
-                last_new_text = new_text
-                
-                # First transcript or completely new segment
-                if not current_transcript:
-                    current_transcript = new_text
-                    transcript_id += 1
-                    yield "data: " + json.dumps({
-                        "type": "transcript", 
-                        "id": transcript_id, 
-                        "text": current_transcript
-                    }) + "\n\n"
-                    continue
-                
-                # Check if new text is substantially different
-                # Calculate word overlap percentage
-                current_words = set(current_transcript.lower().split())
-                new_words = set(new_text.lower().split())
-                overlap = len(current_words.intersection(new_words))
-                total_words = len(current_words.union(new_words))
-                overlap_ratio = overlap / total_words if total_words > 0 else 0
-                
-                yield "data: " + json.dumps({
-                    "type": "debug", 
-                    "message": f"Word overlap: {overlap}/{total_words} = {overlap_ratio:.2f}"
-                }) + "\n\n"
-                
-                # IMPROVED: Check if the new text is simply more complete than current
-                if new_text.lower().startswith(current_transcript.lower()[:min(30, len(current_transcript))]):
-                    # New text seems to be an extension of current text
-                    yield "data: " + json.dumps({
-                        "type": "debug", 
-                        "message": "Detected extension of current transcript"
-                    }) + "\n\n"
-                    
-                    if len(new_text) > len(current_transcript):
-                        current_transcript = new_text
-                        transcript_id += 1
-                        yield "data: " + json.dumps({
-                            "type": "transcript", 
-                            "id": transcript_id, 
-                            "text": current_transcript
-                        }) + "\n\n"
-                    continue
-                
-                # If there's substantial overlap but new text contains new content
-                if overlap_ratio > 0.4 and len(new_text) > len(current_transcript) * 0.8:
-                    yield "data: " + json.dumps({
-                        "type": "debug", 
-                        "message": "Substantial overlap - checking for new content"
-                    }) + "\n\n"
-                    
-                    # MAJOR IMPROVEMENT: Find what's really new in the text
-                    current_transcript = new_text  # Replace with the complete new version
-                    transcript_id += 1
-                    yield "data: " + json.dumps({
-                        "type": "transcript", 
-                        "id": transcript_id, 
-                        "text": current_transcript
-                    }) + "\n\n"
-                else:
-                    # Low overlap or very different length - likely a new segment
-                    # Check if the new text is completely different
-                    if overlap_ratio < 0.3:
-                        # Append as a new segment
-                        yield "data: " + json.dumps({
-                            "type": "debug", 
-                            "message": "Low overlap - adding as new segment"
-                        }) + "\n\n"
-                        
-                        current_transcript += " ... " + new_text
-                        transcript_id += 1
-                        yield "data: " + json.dumps({
-                            "type": "transcript", 
-                            "id": transcript_id, 
-                            "text": current_transcript
-                        }) + "\n\n"
-                    else:
-                        # Medium overlap - check which is more complete
-                        if len(new_text) > len(current_transcript) * 1.2:
-                            # New text is substantially longer
-                            yield "data: " + json.dumps({
-                                "type": "debug", 
-                                "message": "Medium overlap but new text is longer - replacing current"
-                            }) + "\n\n"
-                            
-                            current_transcript = new_text
-                            transcript_id += 1
-                            yield "data: " + json.dumps({
-                                "type": "transcript", 
-                                "id": transcript_id, 
-                                "text": current_transcript
-                            }) + "\n\n"
-            
-            # Wait before polling again
-            await asyncio.sleep(1)
+        # Starts with a snapshot of the transcript so far
+        subscriber = session.hub.subscribe()
+        try:
+            while True:
+                yield sse(await subscriber.get())
+        finally:
+            session.hub.unsubscribe(subscriber)
     
     return StreamingResponse(event_generator(), headers=headers, media_type="text/event-stream")
 
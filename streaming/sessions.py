@@ -0,0 +1,213 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+
+from archive import PcmArchive
+from hub import Hub
+from ringbuffer import PcmRingBuffer
+
+# Sessions idle longer than this (no chunks, no open transcript streams) are evicted
+SESSION_IDLE_TIMEOUT = 300
+# Upper bound on buffered audio across all sessions
+MAX_TOTAL_BYTES = 512 * 1024 * 1024
+MAX_SESSIONS = 100
+# Each session's decoded audio lives in a fixed ring of this many seconds (room for the
+# transcriber's largest window plus lag); released audio is kept this long as history
+RING_SECONDS = 60
+HISTORY_SECONDS = 10
+
+
+class SessionLimitError(Exception):
+    """A session's audio buffer cannot be allocated without exceeding the server's memory cap."""
+
+
+class Session:
+    """One recorder: its audio, transcript state and event hub."""
+
+    def __init__(self, session_id):
+        self.id = session_id
+        # The session's decoder turns container bytes into 16 kHz PCM in `audio` (a PcmRingBuffer,
+        # allocated on the first chunk); audio leaving the ring goes to `archive` if enabled
+        self.decoder = None
+        self.decoder_error = None  # set when the decoder died; audio is refused until a clear
+        self.audio = None
+        self.archive = None
+        # Bytes received since the session started (or was cleared); the WebSocket resume offset
+        self.received_bytes = 0
+        self.transcript = ""
+        self.partial = ""
+        self.transcript_id = 0
+        # Streaming engine state, created by the server on first use
+        self.engine = None
+        self.processed_samples = 0  # absolute end of the audio the engine has already seen
+        # The session's one transcription task publishes to every subscriber through the hub
+        self.task = None
+        self.hub = Hub(self.snapshot)
+        self.created_at = time.monotonic()
+        self.last_active = self.created_at
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    def snapshot(self):
+        return {"type": "transcript", "id": self.transcript_id, "text": self.transcript, "partial": self.partial}
+
+    def clear(self):
+        self.received_bytes = 0
+        self.close_decoder()
+        self.decoder_error = None
+        self.close_audio()
+        self.transcript = ""
+        self.partial = ""
+        self.transcript_id += 1
+        self.engine = None
+        self.processed_samples = 0
+        self.hub.publish(self.snapshot())
+
+    def close_decoder(self):
+        if self.decoder is not None:
+            self.decoder.close()
+            self.decoder = None
+
+    def close_audio(self):
+        """Release the ring buffer, archiving whatever it still holds."""
+        if self.audio is not None:
+            self.audio.drain()
+            self.audio = None
+        if self.archive is not None:
+            self.archive.close_soon()
+            self.archive = None
+
+    def close(self):
+        self.close_decoder()
+        self.close_audio()
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def is_idle(self, now, timeout):
+        return not self.hub and now - self.last_active > timeout
+
+    def __len__(self):
+        return self.audio.nbytes if self.audio is not None else 0
+
+
+class SessionManager:
+    """Sessions keyed by ID, least recently active first.
+
+    Idle sessions are evicted by `evict_idle` (run periodically by the server).
+    A session's memory is its ring buffer, a fixed `ring_seconds` of PCM
+    allocated on its first chunk, so usage no longer grows with session
+    length. When a new ring would exceed `max_total_bytes`, the least
+    recently active sessions without subscribers are evicted to make room;
+    if that is not enough the chunk is refused with SessionLimitError.
+
+    With `archive_dir` set, audio leaving each ring is appended to a file
+    there (and uploaded to `archive_bucket` on S3 when the session ends).
+    """
+
+    def __init__(self, idle_timeout=SESSION_IDLE_TIMEOUT, max_total_bytes=MAX_TOTAL_BYTES,
+                 max_sessions=MAX_SESSIONS, ring_seconds=RING_SECONDS, history_seconds=HISTORY_SECONDS,
+                 archive_dir=None, archive_bucket=None):
+        self.idle_timeout = idle_timeout
+        self.max_total_bytes = max_total_bytes
+        self.max_sessions = max_sessions
+        self.ring_seconds = ring_seconds
+        self.history_seconds = history_seconds
+        self.archive_dir = archive_dir
+        self.archive_bucket = archive_bucket
+        self.sessions = OrderedDict()
+        self.total_bytes = 0
+
+    @staticmethod
+    def new_id():
+        return uuid.uuid4().hex
+
+    def get(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is not None:
+            self.sessions.move_to_end(session_id)
+            session.touch()
+        return session
+
+    def get_or_create(self, session_id):
+        session = self.get(session_id)
+        if session is None:
+            if len(self.sessions) >= self.max_sessions:
+                self._evict_lru(exclude=None, need_bytes=0, need_slot=True)
+            session = Session(session_id)
+            self.sessions[session_id] = session
+        return session
+
+    def receive(self, session, chunk):
+        """Allocate the session's ring buffer on the first chunk and mark the session active.
+
+        Container bytes are not kept: they go straight to the decoder, whose
+        PCM is written to `session.audio`. The caller advances
+        `session.received_bytes` once the decoder has taken the chunk.
+        """
+        if session.audio is None:
+            need = PcmRingBuffer.nbytes_for(self.ring_seconds)
+            if self.total_bytes + need > self.max_total_bytes:
+                self._evict_lru(exclude=session.id, need_bytes=need)
+            if self.archive_dir:
+                session.archive = PcmArchive(self.archive_dir, session.id, s3_bucket=self.archive_bucket)
+            session.audio = PcmRingBuffer(self.ring_seconds, self.history_seconds,
+                                          spill=session.archive.spill if session.archive else None)
+            self.total_bytes += session.audio.nbytes
+        session.touch()
+
+    def clear(self, session):
+        self.total_bytes -= len(session)
+        session.clear()
+
+    def remove(self, session_id):
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            self.total_bytes -= len(session)
+            session.close()
+        return session
+
+    def close_all(self):
+        for session_id in list(self.sessions):
+            self.remove(session_id)
+
+    def evict_idle(self):
+        now = time.monotonic()
+        expired = [sid for sid, s in self.sessions.items() if s.is_idle(now, self.idle_timeout)]
+        for session_id in expired:
+            self.remove(session_id)
+        return expired
+
+    def _evict_lru(self, exclude, need_bytes, need_slot=False):
+        def satisfied():
+            return ((not need_slot or len(self.sessions) < self.max_sessions)
+                    and self.total_bytes + need_bytes <= self.max_total_bytes)
+
+        for session_id, session in list(self.sessions.items()):
+            if satisfied():
+                return
+            if session_id != exclude and not session.hub:
+                print(f"Evicting session {session_id} ({len(session)} bytes) to stay within limits")
+                self.remove(session_id)
+        if not satisfied():
+            raise SessionLimitError(
+                f"Limits reached: {len(self.sessions)} sessions, {self.total_bytes} bytes buffered"
+            )
+
+    def stats(self):
+        return {
+            "sessions": len(self.sessions),
+            "subscribers": sum(len(s.hub) for s in self.sessions.values()),
+            "total_bytes": self.total_bytes,
+            "max_total_bytes": self.max_total_bytes,
+        }
+
+    async def run_evictor(self, interval=30):
+        """Evict idle sessions every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            evicted = self.evict_idle()
+            if evicted:
+                print(f"Evicted {len(evicted)} idle session(s)")
@@ -4,4 +4,5 @@ pip install uvicorn
 pip install python-multipart
 pip install openai-whisper
 pip install httpx
-
+pip install numpy
+apt-get install -y ffmpeg
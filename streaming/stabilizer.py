@@ -0,0 +1,47 @@
+import re
+from collections import deque
+
+_NORMALIZE = re.compile(r"[^\w']+")
+
+
+def normalize(word):
+    """Comparison key for a word: case and punctuation do not count as disagreement."""
+    return _NORMALIZE.sub("", word.lower())
+
+
+class LocalAgreement:
+    """LocalAgreement-n stabilizer for streaming hypotheses.
+
+    Each hypothesis is the list of (start, end, word) tuples the model
+    produced for the audio after the committed point. A word is committed
+    once the last `n` hypotheses agree on it and on every word before it,
+    i.e. it lies in their longest common prefix. Committed words are
+    trimmed from the stored hypotheses, so each update only compares the
+    uncommitted tails and runs in time linear in their length.
+    """
+
+    def __init__(self, n=2):
+        if n < 2:
+            raise ValueError("LocalAgreement needs n >= 2")
+        self.n = n
+        self.history = deque(maxlen=n - 1)
+
+    def update(self, hypothesis):
+        """Add a hypothesis; returns (committed, partial) word lists."""
+        keys = [normalize(word) for _, _, word in hypothesis]
+        agreed = len(hypothesis) if len(self.history) == self.n - 1 else 0
+        for previous in self.history:
+            agreed = min(agreed, len(previous))
+            for i in range(agreed):
+                if previous[i] != keys[i]:
+                    agreed = i
+                    break
+
+        committed, partial = hypothesis[:agreed], hypothesis[agreed:]
+        # Earlier hypotheses agreed on the committed words, so drop them everywhere
+        self.history = deque((previous[agreed:] for previous in self.history), maxlen=self.n - 1)
+        self.history.append(keys[agreed:])
+        return committed, partial
+
+    def reset(self):
+        self.history.clear()
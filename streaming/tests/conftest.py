@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import streaming modules the way the servers do (`from ringbuffer import ...`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,55 @@
+import numpy as np
+
+from pcm import SAMPLE_RATE
+from ringbuffer import PcmRingBuffer
+
+
+def _samples(start, count):
+    return (np.arange(start, start + count) % 30000).astype(np.int16)
+
+
+def test_views_are_contiguous_across_the_wrap():
+    ring = PcmRingBuffer(1.0)
+    ring.write(_samples(0, 12000))
+    ring.release(10000)
+    ring.write(_samples(12000, 8000))  # wraps past the end of storage
+
+    view = ring.view(10000, 20000)
+    assert np.shares_memory(view, ring.data)
+    assert np.array_equal(view, _samples(10000, 10000))
+
+
+def test_release_keeps_history_and_spills_in_order():
+    spilled = []
+    ring = PcmRingBuffer(1.0, history_seconds=0.25, spill=spilled.append)
+    ring.write(_samples(0, 10000))
+    ring.release(8000)
+
+    assert ring.start == 8000 - SAMPLE_RATE // 4
+    assert b"".join(spilled) == _samples(0, ring.start).tobytes()
+    assert len(ring) == 10000 - ring.start
+
+    ring.drain()
+    assert b"".join(spilled) == _samples(0, 10000).tobytes()
+
+
+def test_reader_falling_behind_loses_oldest_audio():
+    spilled = []
+    ring = PcmRingBuffer(1.0, spill=spilled.append)
+    ring.write(_samples(0, 10000))
+    ring.write(_samples(10000, 10000))
+    assert ring.overflowed == 20000 - SAMPLE_RATE
+    assert ring.start == 20000 - SAMPLE_RATE
+    assert np.array_equal(ring.view(), _samples(ring.start, SAMPLE_RATE))
+
+    # A single write longer than the whole buffer keeps only its tail
+    ring.write(_samples(20000, 40000))
+    assert np.array_equal(ring.view(), _samples(60000 - SAMPLE_RATE, SAMPLE_RATE))
+    assert b"".join(spilled) == _samples(0, 60000 - SAMPLE_RATE).tobytes()
+
+
+def test_view_clamps_to_retained_audio():
+    ring = PcmRingBuffer(1.0)
+    ring.write(_samples(0, 100))
+    assert np.array_equal(ring.view(50, 1000), _samples(50, 50))
+    assert len(ring.view(200, 300)) == 0
@@ -0,0 +1,49 @@
+import pytest
+
+from stabilizer import LocalAgreement
+
+
+def _words(text, start=0.0):
+    return [(start + i, start + i + 1, word) for i, word in enumerate(text.split())]
+
+
+def test_commits_common_prefix_of_last_two():
+    agreement = LocalAgreement(n=2)
+    committed, partial = agreement.update(_words("the quick brown"))
+    assert committed == [] and [w for _, _, w in partial] == ["the", "quick", "brown"]
+
+    committed, partial = agreement.update(_words("the quick brown fox"))
+    assert [w for _, _, w in committed] == ["the", "quick", "brown"]
+    assert [w for _, _, w in partial] == ["fox"]
+
+    # Only the uncommitted tail is compared from now on
+    committed, partial = agreement.update(_words("fox jumps"))
+    assert [w for _, _, w in committed] == ["fox"]
+    assert [w for _, _, w in partial] == ["jumps"]
+
+
+def test_case_and_punctuation_do_not_break_agreement():
+    agreement = LocalAgreement(n=2)
+    agreement.update(_words("Hello, world"))
+    committed, _ = agreement.update(_words("hello world."))
+    assert [w for _, _, w in committed] == ["hello", "world."]
+
+
+def test_disagreement_stops_the_prefix():
+    agreement = LocalAgreement(n=2)
+    agreement.update(_words("a b c"))
+    committed, partial = agreement.update(_words("a x c"))
+    assert [w for _, _, w in committed] == ["a"]
+    assert [w for _, _, w in partial] == ["x", "c"]
+
+
+def test_n_three_needs_three_hypotheses():
+    agreement = LocalAgreement(n=3)
+    agreement.update(_words("a b"))
+    assert agreement.update(_words("a b"))[0] == []
+    assert [w for _, _, w in agreement.update(_words("a c"))[0]] == ["a"]
+
+    agreement.reset()
+    assert agreement.update(_words("a b"))[0] == []
+    with pytest.raises(ValueError):
+        LocalAgreement(n=1)
@@ -0,0 +1,20 @@
+from windows import WordDeduplicator
+
+
+def test_drops_words_already_emitted_by_an_overlapping_window():
+    dedup = WordDeduplicator()
+    first = [(0.0, 0.5, "hello"), (0.6, 1.0, "there")]
+    assert dedup.filter(first) == first
+    dedup.mark(first)
+
+    # The next window re-hears "there" and continues
+    assert dedup.filter([(0.6, 1.0, "there"), (1.1, 1.5, "friend")]) == [(1.1, 1.5, "friend")]
+
+
+def test_boundary_word_with_shifted_timestamps_is_dropped_once():
+    dedup = WordDeduplicator(tolerance=0.2)
+    dedup.mark([(0.6, 1.0, "there")])
+    # Midpoint after the last emitted end, but the same word within tolerance
+    assert dedup.filter([(0.95, 1.3, "There."), (1.4, 1.8, "there")]) == [(1.4, 1.8, "there")]
+    # A different word right at the boundary is new
+    assert dedup.filter([(0.95, 1.3, "where")]) == [(0.95, 1.3, "where")]
@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import httpx
+
+TRANSCRIPTIONS_PATH = "/v1/audio/transcriptions"
+
+
+class RequestSuperseded(Exception):
+    """A newer request for the same key replaced this one before it finished."""
+
+
+class WhisperClient:
+    """Application-lifetime client for a faster-whisper (OpenAI-compatible) server.
+
+    One pooled httpx.AsyncClient keeps connections alive across requests.
+    At most `max_concurrency` requests are in flight towards the server;
+    others wait for a slot. Requests made with a `key` (e.g. a session ID)
+    supersede the previous request with that key: the older one is
+    cancelled, releasing its slot, and its caller gets RequestSuperseded.
+    """
+
+    def __init__(self, base_url, max_concurrency=4, timeout=60.0, connect_timeout=5.0, language="en"):
+        self.url = base_url.rstrip("/") + TRANSCRIPTIONS_PATH
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.language = language
+        self.client = httpx.AsyncClient(
+            http2=False,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.in_flight = {}
+        self.counters = {"requests": 0, "failures": 0, "superseded": 0, "in_flight": 0, "seconds": 0.0}
+
+    async def transcribe_words(self, wav, prompt="", key=None, timeout=None):
+        """Timestamped words (``{"start", "end", "word"}`` dicts) for one PCM window."""
+        data = {
+            "language": self.language,
+            "response_format": "verbose_json",
+            "timestamp_granularities[]": "word",
+            "prompt": prompt,
+        }
+        result = await self._request(key, wav, data, timeout)
+        words = result.get("words")
+        if words is None:
+            words = [word for segment in result.get("segments", []) for word in segment.get("words") or []]
+        return words
+
+    async def transcribe_text(self, wav, key=None, timeout=None):
+        """Plain transcript text for a PCM window (e.g. a whole buffer, for debugging)."""
+        result = await self._request(key, wav, {"language": self.language, "response_format": "json"}, timeout)
+        return result.get("text", "")
+
+    async def _request(self, key, wav, data, timeout):
+        request = asyncio.ensure_future(self._post(wav, data, timeout))
+        if key is not None:
+            self.cancel(key)
+            self.in_flight[key] = request
+        try:
+            return await request
+        except asyncio.CancelledError:
+            # Our own task being cancelled must propagate; a cancelled request means superseded
+            if not request.cancelled() or asyncio.current_task().cancelling():
+                raise
+            self.counters["superseded"] += 1
+            raise RequestSuperseded(f"Request for {key} was superseded") from None
+        finally:
+            if key is not None and self.in_flight.get(key) is request:
+                del self.in_flight[key]
+
+    def cancel(self, key):
+        """Cancel the in-flight request for `key`, if any."""
+        request = self.in_flight.pop(key, None)
+        if request is not None and not request.done():
+            request.cancel()
+
+    async def _post(self, wav, data, timeout):
+        files = {"file": ("window.wav", wav, "audio/wav")}
+        async with self.slots:
+            started = time.monotonic()
+            self.counters["in_flight"] += 1
+            try:
+                response = await self.client.post(
+                    self.url, files=files, data=data, timeout=timeout or self.timeout
+                )
+                response.raise_for_status()
+                return response.json()
+            except (httpx.HTTPError, ValueError):
+                self.counters["failures"] += 1
+                raise
+            finally:
+                self.counters["in_flight"] -= 1
+                self.counters["requests"] += 1
+                self.counters["seconds"] = round(self.counters["seconds"] + time.monotonic() - started, 3)
+
+    def stats(self):
+        return dict(self.counters)
+
+    async def aclose(self):
+        for key in list(self.in_flight):
+            self.cancel(key)
+        await self.client.aclose()
@@ -0,0 +1,102 @@
+from pcm import SAMPLE_RATE, wav_bytes
+from stabilizer import normalize
+
+
+class WordDeduplicator:
+    """Drops words that an overlapping window already emitted.
+
+    A word whose midpoint lies at or before the end of the last emitted
+    word re-hears emitted audio. Right at that boundary two windows'
+    timestamps can disagree by a few tens of milliseconds, so a word
+    starting within `tolerance` seconds of it is also dropped when its text
+    matches the last emitted word.
+    """
+
+    def __init__(self, tolerance=0.2):
+        self.tolerance = tolerance
+        self.emitted_until = 0.0
+        self.last_key = None
+
+    def filter(self, words):
+        """The (start, end, word) tuples in `words` not yet emitted."""
+        fresh = []
+        for start, end, word in words:
+            if (start + end) / 2 <= self.emitted_until:
+                continue
+            if not fresh and start < self.emitted_until + self.tolerance and normalize(word) == self.last_key:
+                continue
+            fresh.append((start, end, word))
+        return fresh
+
+    def mark(self, words):
+        """Record `words` as emitted."""
+        if words:
+            self.emitted_until = max(self.emitted_until, words[-1][1])
+            self.last_key = normalize(words[-1][2])
+
+
+class WindowedTranscriber:
+    """Fixed-length windows over decoded PCM, parameterized in seconds.
+
+    A window ends every `stride_seconds` of audio and covers the
+    `window_seconds` before that point (less at the very start). Words within
+    `edge_seconds` of a window's end may be cut off, so they are left to the
+    next window, which hears them whole; words from the overlap that were
+    already emitted are dropped by timestamp. Every window costs the same
+    however long the stream runs.
+
+    `transcribe(wav, prompt)` is an async callable returning
+    ``{"start", "end", "word"}`` dicts relative to the window.
+    """
+
+    def __init__(self, transcribe, window_seconds=10.0, stride_seconds=2.0, edge_seconds=0.5,
+                 prompt_chars=200):
+        if stride_seconds + edge_seconds > window_seconds:
+            raise ValueError("stride + edge must fit in the window, or audio between windows is never emitted")
+        self.transcribe = transcribe
+        self.window = int(window_seconds * SAMPLE_RATE)
+        self.stride = int(stride_seconds * SAMPLE_RATE)
+        self.edge = edge_seconds
+        self.prompt_chars = prompt_chars
+        self.dedup = WordDeduplicator()
+        self.next_end = self.stride
+        self.text = ""
+
+    @property
+    def window_start(self):
+        """Earliest absolute sample the next window needs."""
+        return max(0, self.next_end - self.window)
+
+    async def step(self, audio, offset=0, final=False):
+        """Run every window that `audio` (first sample at absolute index `offset`) completes.
+
+        With `final`, the remaining audio is flushed as one last window with
+        no edge held back. Returns the newly emitted words. If `audio` starts
+        after the next window would (a late reader of a shared buffer that has
+        dropped older audio), windows resume with the first full one inside it.
+        """
+        end = offset + len(audio)
+        emitted = []
+        if self.window_start < offset:
+            self.next_end = offset + self.window
+        while self.next_end <= end:
+            emitted += await self._window(audio, offset, self.next_end, self.edge)
+            self.next_end += self.stride
+        if final and end > self.next_end - self.stride:
+            emitted += await self._window(audio, offset, end, 0.0)
+            self.next_end = end + self.stride
+        return emitted
+
+    async def _window(self, audio, offset, stop, edge):
+        start = max(offset, stop - self.window)
+        if stop <= start:
+            return []
+        shift = start / SAMPLE_RATE
+        words = await self.transcribe(wav_bytes(audio[start - offset:stop - offset]), self.text[-self.prompt_chars:])
+
+        limit = stop / SAMPLE_RATE - edge
+        absolute = [(w["start"] + shift, w["end"] + shift, w["word"]) for w in words]
+        fresh = [w for w in self.dedup.filter(absolute) if (w[0] + w[1]) / 2 < limit]
+        self.dedup.mark(fresh)
+        self.text = (self.text + "".join(word for _, _, word in fresh)).strip()
+        return fresh
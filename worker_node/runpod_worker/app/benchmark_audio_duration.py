@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: in-process header probing vs. the ffprobe subprocess.
+
+Usage:
+    python benchmark_audio_duration.py [files...] [--iterations N]
+
+Without files, a set of synthetic clips is generated in a temp directory
+(WAV always; WebM, Ogg/Opus, FLAC and MP3 too when ffmpeg is on PATH).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import struct
+import subprocess
+import tempfile
+import time
+import wave
+
+from utils.audio_probe import probe_duration
+
+
+def ffprobe_duration(ffprobe_path, audio_path):
+    """Same invocation AudioDurationHandler._get_duration_ffprobe uses."""
+    result = subprocess.run(
+        [ffprobe_path, '-v', 'error', '-show_entries', 'format=duration', '-of', 'json', audio_path],
+        capture_output=True, text=True, timeout=10
+    )
+    if result.returncode != 0:
+        return None
+    try:
+        return float(json.loads(result.stdout)['format']['duration'])
+    except (KeyError, ValueError):
+        return None
+
+
+def make_fixtures(directory, seconds=30):
+    """Write a 16 kHz mono WAV and, if ffmpeg is available, transcode it to the other formats."""
+    wav_path = os.path.join(directory, 'fixture.wav')
+    with wave.open(wav_path, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(16000)
+        frame = struct.pack('<h', 0)
+        w.writeframes(frame * 16000 * seconds)
+    paths = [wav_path]
+
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg:
+        for name, args in [
+            ('fixture.webm', ['-c:a', 'libopus', '-f', 'webm']),
+            ('fixture.opus', ['-c:a', 'libopus']),
+            ('fixture.flac', []),
+            ('fixture.mp3', ['-c:a', 'libmp3lame']),
+        ]:
+            out = os.path.join(directory, name)
+            result = subprocess.run(
+                [ffmpeg, '-loglevel', 'error', '-y', '-i', wav_path] + args + [out],
+                capture_output=True
+            )
+            if result.returncode == 0:
+                paths.append(out)
+    return paths
+
+
+def time_calls(func, iterations):
+    timings = []
+    value = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        value = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return value, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*', help='Audio files to probe')
+    parser.add_argument('--iterations', type=int, default=50, help='Calls per file and method')
+    args = parser.parse_args()
+
+    ffprobe_path = shutil.which('ffprobe')
+    with tempfile.TemporaryDirectory() as tmp:
+        files = args.files or make_fixtures(tmp)
+
+        print(f"{'file':<28} {'header (ms)':>12} {'ffprobe (ms)':>13} {'speedup':>8}  duration")
+        for path in files:
+            native, native_ms = time_calls(lambda: probe_duration(path), args.iterations)
+            line = f"{os.path.basename(path):<28} {native_ms:>12.3f}"
+            if ffprobe_path:
+                probed, ffprobe_ms = time_calls(lambda: ffprobe_duration(ffprobe_path, path), args.iterations)
+                speedup = ffprobe_ms / native_ms if native_ms else float('inf')
+                line += f" {ffprobe_ms:>13.3f} {speedup:>7.0f}x  {native} vs {probed}"
+            else:
+                line += f" {'n/a':>13} {'':>8}  {native}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Worker throughput benchmark: real-time factor matrix for sizing GPUs.
+
+Runs a fixed set of audio fixtures through the same Transcriber pipeline
+that AudioTranscriptionWorker.transcribe_audio uses, across model sizes,
+compute types, beam sizes, CPU thread counts and batch sizes (concurrent
+inference slots used for long-audio chunks). Each model configuration runs
+in its own process so warm-up time and peak RSS are measured cleanly.
+
+Usage (CPU-only defaults):
+    python benchmark_worker.py --models tiny base --compute-types int8 \\
+        --beam-sizes 1 5 --threads 0 4 --batch-sizes 1 2 \\
+        --output results.json --csv results.csv
+
+VAD, long-audio chunking and word timestamps come from worker.config.yaml
+(or --config), exactly as the worker builds its pipeline; only the
+long-audio worker count is replaced by the batch size under test.
+
+Fixtures: every audio file in --fixtures-dir is used. If the directory is
+empty or missing, a deterministic set of speech-like synthetic clips
+(5 s, 30 s and 240 s, the last one long enough for chunked mode) is
+generated there first. The default directory is a user cache directory,
+outside the source tree.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import queue
+import resource
+import time
+import wave
+
+from utils.audio_probe import probe_duration
+
+SYNTHETIC_FIXTURES = [
+    ('speechlike_5s.wav', 5),
+    ('speechlike_30s.wav', 30),
+    ('speechlike_240s.wav', 240),
+]
+AUDIO_EXTENSIONS = ('.wav', '.webm', '.ogg', '.opus', '.flac', '.mp3', '.m4a')
+DEFAULT_FIXTURES_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'worker-benchmark', 'fixtures'
+)
+
+
+def generate_fixture(path, seconds, sample_rate=16000, seed=0):
+    """Write a deterministic speech-like clip: voiced harmonics, syllable-rate envelope, pauses."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed + seconds)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+
+    # Pauses of 0.3-1.5 s every 3-8 s, like phrase boundaries
+    pause_mask = np.ones_like(t)
+    position = rng.uniform(3, 8)
+    while position < seconds:
+        pause = rng.uniform(0.3, 1.5)
+        pause_mask[(t >= position) & (t < position + pause)] = 0
+        position += pause + rng.uniform(3, 8)
+
+    noise = rng.normal(0, 0.003, len(t))
+    audio = 0.3 * voiced * envelope * pause_mask + noise
+    samples = np.clip(audio * 32767, -32768, 32767).astype('<i2')
+
+    with wave.open(path, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(samples.tobytes())
+
+
+def load_fixtures(directory):
+    os.makedirs(directory, exist_ok=True)
+    files = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(AUDIO_EXTENSIONS)
+    )
+    if not files:
+        for name, seconds in SYNTHETIC_FIXTURES:
+            path = os.path.join(directory, name)
+            generate_fixture(path, seconds)
+            files.append(path)
+    return [(path, probe_duration(path) or 0.0) for path in files]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_config(config, fixtures, beam_sizes, repeat, results, config_path=None):
+    """Child process: load one model configuration and time every fixture and beam size."""
+    from utils.model_manager import ModelManager
+    from worker_node_v2 import GlobalConfig, build_transcriber
+
+    try:
+        start = time.monotonic()
+        manager = ModelManager(max_models=1, cpu_threads=config['cpu_threads'],
+                               num_workers=config['batch_size'])
+        settings = GlobalConfig.from_yaml(config_path)
+        transcriber = build_transcriber(settings, manager, workers=config['batch_size'])
+        spec = (config['model'], config['compute_type'], config['device'])
+
+        # Warm-up: model load plus one transcription of the shortest clip
+        manager.preload(*spec)
+        transcriber.transcribe(min(fixtures, key=lambda fixture: fixture[1])[0], *spec)
+        warmup_seconds = time.monotonic() - start
+
+        rows = []
+        for beam_size in beam_sizes:
+            for path, audio_seconds in fixtures:
+                latencies = []
+                for _ in range(repeat):
+                    t0 = time.monotonic()
+                    transcriber.transcribe(path, *spec, beam_size=beam_size)
+                    latencies.append(time.monotonic() - t0)
+                p50 = percentile(latencies, 50)
+                rows.append(dict(
+                    config,
+                    beam_size=beam_size,
+                    fixture=os.path.basename(path),
+                    audio_seconds=round(audio_seconds, 2),
+                    rtf=round(p50 / audio_seconds, 4) if audio_seconds else None,
+                    latency_p50=round(p50, 3),
+                    latency_p90=round(percentile(latencies, 90), 3),
+                    latency_p99=round(percentile(latencies, 99), 3),
+                    warmup_seconds=round(warmup_seconds, 3),
+                ))
+
+        # ru_maxrss is in KB on Linux
+        peak_rss_mb = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        for row in rows:
+            row['peak_rss_mb'] = peak_rss_mb
+        results.put(rows)
+    except Exception as e:
+        results.put([dict(config, error=str(e))])
+
+
+def collect_rows(process, results, config, timeout):
+    """Wait for the child's rows; a crash or a run longer than `timeout` seconds becomes an error row."""
+    deadline = time.monotonic() + timeout if timeout else None
+    while True:
+        try:
+            return results.get(timeout=1.0)
+        except queue.Empty:
+            pass
+        if not process.is_alive():
+            # Rows put just before exiting may still be in the pipe
+            try:
+                return results.get(timeout=1.0)
+            except queue.Empty:
+                return [dict(config, error=f"child exited with code {process.exitcode} before reporting")]
+        if deadline and time.monotonic() > deadline:
+            process.terminate()
+            return [dict(config, error=f"timed out after {timeout}s")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--models', nargs='+', default=['tiny', 'base'])
+    parser.add_argument('--compute-types', nargs='+', default=['int8'])
+    parser.add_argument('--device', default='cpu', choices=['cpu', 'cuda'])
+    parser.add_argument('--beam-sizes', nargs='+', type=int, default=[1, 5])
+    parser.add_argument('--threads', nargs='+', type=int, default=[0],
+                        help='CTranslate2 cpu_threads (0 = library default)')
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[1],
+                        help='Concurrent inference slots (num_workers / long-audio workers)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per fixture')
+    parser.add_argument('--fixtures-dir', default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument('--config', help='Worker config YAML (default: worker.config.yaml next to the worker)')
+    parser.add_argument('--timeout', type=float, default=3600,
+                        help='Seconds allowed per configuration (0 = no limit)')
+    parser.add_argument('--output', help='Write the matrix as JSON to this path')
+    parser.add_argument('--csv', help='Write the matrix as CSV to this path')
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures_dir)
+    ctx = multiprocessing.get_context('spawn')
+    all_rows = []
+
+    for model, compute_type, threads, batch_size in itertools.product(
+            args.models, args.compute_types, args.threads, args.batch_sizes):
+        config = {
+            'model': model,
+            'compute_type': compute_type,
+            'device': args.device,
+            'cpu_threads': threads,
+            'batch_size': batch_size,
+        }
+        print(f"Running {config} ...", flush=True)
+        results = ctx.Queue()
+        process = ctx.Process(target=run_config, args=(config, fixtures, args.beam_sizes, args.repeat, results,
+                                                                 args.config))
+        process.start()
+        rows = collect_rows(process, results, config, args.timeout)
+        process.join()
+        all_rows.extend(rows)
+
+        for row in rows:
+            if 'error' in row:
+                print(f"  failed: {row['error']}")
+            else:
+                print(f"  beam={row['beam_size']} {row['fixture']:<24} rtf={row['rtf']} "
+                      f"p50={row['latency_p50']}s p90={row['latency_p90']}s "
+                      f"rss={row['peak_rss_mb']}MB warmup={row['warmup_seconds']}s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(all_rows, f, indent=2)
+    if args.csv:
+        fieldnames = sorted({key for row in all_rows for key in row})
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(all_rows)
+
+
+if __name__ == "__main__":
+    main()
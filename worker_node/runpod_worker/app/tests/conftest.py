@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import worker modules the way worker_node_v2.py does (`from utils...`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
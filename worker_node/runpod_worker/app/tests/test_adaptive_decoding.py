@@ -0,0 +1,35 @@
+from utils.adaptive_decoding import AdaptiveDecodingController
+
+
+def test_tiers_follow_backlog_and_age():
+    controller = AdaptiveDecodingController(smoothing=1.0)
+    assert controller.decide(backlog=1, task_age=10).tier == 'quality'
+    assert controller.decide(backlog=10, task_age=10).tier == 'balanced'
+    assert controller.decide(backlog=1, task_age=300).tier == 'balanced'
+    assert controller.decide(backlog=25, task_age=10).tier == 'fast'
+    assert controller.decide(backlog=1, task_age=900).tier == 'fast'
+    assert controller.stats()['tasks_per_tier'] == {'quality': 1, 'balanced': 2, 'fast': 2}
+
+
+def test_backlog_is_smoothed():
+    controller = AdaptiveDecodingController(smoothing=0.3)
+    assert controller.decide(backlog=0, task_age=0).tier == 'quality'
+    # One deep poll moves the average to 9, not straight to the fast tier
+    decision = controller.decide(backlog=30, task_age=0)
+    assert decision.tier == 'balanced'
+    assert decision.backlog == 9.0
+    # A missing backlog reuses the average
+    assert controller.decide(backlog=None, task_age=0).backlog == 9.0
+
+
+def test_configured_tiers_override_defaults():
+    controller = AdaptiveDecodingController(tiers={'fast': {'model_size': 'small'}}, smoothing=1.0)
+    decision = controller.decide(backlog=100, task_age=0)
+    assert (decision.beam_size, decision.temperature, decision.model_size) == (1, (0.0,), 'small')
+    assert decision.as_dict()['temperature'] == [0.0]
+
+
+def test_baseline_keeps_library_defaults():
+    decision = AdaptiveDecodingController().baseline()
+    assert (decision.tier, decision.beam_size, decision.temperature, decision.model_size) == (
+        'default', 1, None, None)
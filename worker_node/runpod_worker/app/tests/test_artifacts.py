@@ -0,0 +1,45 @@
+import gzip
+import json
+
+from utils.artifacts import build_artifact, render, to_srt, to_vtt
+
+SEGMENTS = [
+    {'start': 0.0, 'end': 2.5004, 'text': " Hello there.", 'avg_logprob': -0.21234, 'no_speech_prob': None,
+     'words': [{'start': 0.0, 'end': 0.4, 'word': " Hello", 'probability': 0.98765},
+               {'start': 0.5, 'end': 2.5, 'word': " there.", 'probability': None}]},
+    {'start': 3661.25, 'end': 3662.0, 'text': "Over an hour in. ", 'words': []},
+]
+
+
+def test_srt_cues():
+    assert to_srt(SEGMENTS) == (
+        "1\n00:00:00,000 --> 00:00:02,500\nHello there.\n"
+        "\n"
+        "2\n01:01:01,250 --> 01:01:02,000\nOver an hour in.\n"
+    )
+
+
+def test_vtt_cues():
+    assert to_vtt(SEGMENTS) == (
+        "WEBVTT\n"
+        "\n"
+        "00:00:00.000 --> 00:00:02.500\nHello there.\n"
+        "\n"
+        "01:01:01.250 --> 01:01:02.000\nOver an hour in.\n"
+    )
+
+
+def test_compact_json_artifact():
+    artifact = build_artifact(SEGMENTS, "Hello there. Over an hour in.", 3662.00049, model="small")
+    assert artifact['duration'] == 3662.0
+    assert artifact['model'] == "small"
+    first, second = artifact['segments']
+    assert first == {
+        'start': 0.0, 'end': 2.5, 'text': " Hello there.", 'avg_logprob': -0.212,
+        'words': [[0.0, 0.4, " Hello", 0.988], [0.5, 2.5, " there.", None]],
+    }
+    assert 'words' not in second
+
+    assert json.loads(gzip.decompress(render('json', artifact))) == artifact
+    # Identical transcripts compress to identical bytes
+    assert render('srt', artifact) == render('srt', build_artifact(SEGMENTS, "", 0))
@@ -0,0 +1,60 @@
+import shutil
+import subprocess
+import wave
+
+import pytest
+
+from utils.audio_probe import probe_duration
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which('ffmpeg') is None, reason="ffmpeg is needed to encode fixtures")
+
+
+def test_wav(tmp_path):
+    path = tmp_path / "clip.wav"
+    with wave.open(str(path), 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(16000)
+        w.writeframes(b"\x00\x00" * 16000 * 3)
+    assert probe_duration(str(path)) == pytest.approx(3.0)
+
+
+@requires_ffmpeg
+@pytest.mark.parametrize("name, codec", [
+    ("clip.flac", ["-c:a", "flac"]),
+    ("clip.ogg", ["-c:a", "libopus"]),
+    ("clip.webm", ["-c:a", "libopus"]),
+    ("clip.mp3", ["-c:a", "libmp3lame", "-b:a", "64k"]),
+])
+def test_encoded(tmp_path, name, codec):
+    path = tmp_path / name
+    subprocess.run(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=7.5",
+         *codec, str(path)],
+        check=True,
+    )
+    # Encoder padding and frame granularity add a few tens of milliseconds at most
+    assert probe_duration(str(path)) == pytest.approx(7.5, abs=0.1)
+
+
+@requires_ffmpeg
+def test_streamed_webm_without_duration(tmp_path):
+    # Written to a pipe like MediaRecorder output: no Duration element, only clusters
+    encoded = subprocess.run(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=30",
+         "-c:a", "libopus", "-f", "webm", "pipe:1"],
+        check=True, stdout=subprocess.PIPE,
+    ).stdout
+    path = tmp_path / "recording.webm"
+    path.write_bytes(encoded)
+    assert probe_duration(str(path)) == pytest.approx(30.0, abs=0.1)
+
+
+def test_unknown_or_truncated(tmp_path):
+    unknown = tmp_path / "notes.txt"
+    unknown.write_bytes(b"not audio at all")
+    truncated = tmp_path / "clip.flac"
+    truncated.write_bytes(b"fLaC\x00")
+    assert probe_duration(str(unknown)) is None
+    assert probe_duration(str(truncated)) is None
+    assert probe_duration(str(tmp_path / "missing.wav")) is None
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from utils.chunking import Chunk, plan_chunks, stitch_segments
+from utils.vad import SAMPLE_RATE, VoiceActivityDetector
+
+
+def _speech_with_gaps(seconds, gaps):
+    # Syllable-rate bursts over a quiet noise bed, with silent pauses at `gaps`
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = (np.sin(2 * np.pi * 4 * t) > 0).astype(np.float32)
+    for start, end in gaps:
+        envelope[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)] = 0
+    audio = 0.3 * envelope * np.sin(2 * np.pi * 220 * t) + 0.001 * rng.standard_normal(len(t))
+    return audio.astype(np.float32)
+
+
+def test_short_audio_is_one_chunk():
+    audio = _speech_with_gaps(20, [])
+    chunks = plan_chunks(audio, VoiceActivityDetector(), min_seconds=30, max_seconds=60, overlap_seconds=1)
+    assert chunks == [Chunk(0.0, 20.0, 0.0, 20.0)]
+
+
+def test_cuts_land_in_silences():
+    audio = _speech_with_gaps(150, [(44, 48), (98, 102)])
+    chunks = plan_chunks(audio, VoiceActivityDetector(), min_seconds=30, max_seconds=60, overlap_seconds=1)
+
+    assert len(chunks) == 3
+    assert 44 < chunks[0].own_end < 48
+    assert 98 < chunks[1].own_end < 102
+    # Owned regions tile the recording; sent regions add the overlap on both sides
+    assert chunks[0].own_start == 0.0 and chunks[-1].own_end == 150.0
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.own_start == previous.own_end
+        assert chunk.start == pytest.approx(chunk.own_start - 1)
+        assert previous.end == pytest.approx(previous.own_end + 1)
+
+
+def test_no_silence_cuts_at_max():
+    audio = _speech_with_gaps(130, [])
+    chunks = plan_chunks(audio, VoiceActivityDetector(), min_seconds=30, max_seconds=60, overlap_seconds=0)
+    assert [(chunk.own_start, chunk.own_end) for chunk in chunks] == [(0.0, 60.0), (60.0, 120.0), (120.0, 130.0)]
+
+
+def test_stitch_keeps_owned_segments_and_drops_repeats():
+    first = Chunk(0.0, 31.0, 0.0, 30.0)
+    second = Chunk(29.0, 60.0, 30.0, 60.0)
+    stitched = stitch_segments([
+        (first, [
+            {'start': 0.0, 'end': 10.0, 'text': "Hello there."},
+            {'start': 28.0, 'end': 31.0, 'text': "crossing the cut"},
+        ]),
+        (second, [
+            # Midpoint before the cut: owned by the first chunk
+            {'start': 29.0, 'end': 30.5, 'text': "the cut"},
+            {'start': 29.5, 'end': 31.0, 'text': "Crossing the cut!"},
+            {'start': 31.0, 'end': 40.0, 'text': "After."},
+        ]),
+    ])
+    assert [segment['text'] for segment in stitched] == ["Hello there.", "crossing the cut", "After."]
@@ -0,0 +1,89 @@
+import os
+import sys
+import types
+
+import pytest
+
+from utils.model_store import MANIFEST, ModelStore
+
+
+def _write_model(path, weights=b"weights"):
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "model.bin"), 'wb') as f:
+        f.write(weights)
+    with open(os.path.join(path, "config.json"), 'w') as f:
+        f.write("{}")
+
+
+def _seed(root, size="tiny"):
+    path = os.path.join(root, size)
+    _write_model(path)
+    ModelStore._write_manifest(path, ModelStore._describe(path))
+    return path
+
+
+def _corrupt_keeping_stat(path):
+    """Flip the weights' bytes without changing their size or mtime."""
+    model = os.path.join(path, "model.bin")
+    stat = os.stat(model)
+    with open(model, 'wb') as f:
+        f.write(b"WEIGHTS")
+    os.utime(model, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def test_verified_directory_resolves(tmp_path):
+    path = _seed(str(tmp_path))
+    for verify in ("full", "stat", "none"):
+        assert ModelStore(str(tmp_path), verify=verify, allow_download=False).resolve("tiny") == path
+
+
+def test_stat_mode_trusts_unchanged_files_full_mode_does_not(tmp_path):
+    path = _seed(str(tmp_path))
+    _corrupt_keeping_stat(path)
+    assert ModelStore(str(tmp_path), verify="stat", allow_download=False).resolve("tiny") == path
+    with pytest.raises(RuntimeError):
+        ModelStore(str(tmp_path), verify="full", allow_download=False).resolve("tiny")
+    assert not os.path.exists(path)
+
+
+def test_touched_file_is_rehashed_and_manifest_refreshed(tmp_path):
+    path = _seed(str(tmp_path))
+    model = os.path.join(path, "model.bin")
+    os.utime(model, ns=(0, 10**9))
+    store = ModelStore(str(tmp_path), verify="stat", allow_download=False)
+    assert store.resolve("tiny") == path
+    with open(os.path.join(path, MANIFEST)) as f:
+        assert '"mtime_ns": 1000000000' in f.read()
+
+
+def test_unmanaged_directory_needs_opt_in(tmp_path):
+    path = os.path.join(str(tmp_path), "tiny")
+    _write_model(path)
+    with pytest.raises(RuntimeError, match="adopt_unmanaged"):
+        ModelStore(str(tmp_path), allow_download=False).resolve("tiny")
+    assert os.path.exists(os.path.join(path, "model.bin"))
+
+    assert ModelStore(str(tmp_path), allow_download=False, adopt_unmanaged=True).resolve("tiny") == path
+    assert os.path.exists(os.path.join(path, MANIFEST))
+
+
+def test_missing_model_is_downloaded_with_manifest(tmp_path, monkeypatch):
+    downloads = []
+
+    def download_model(size, output_dir):
+        downloads.append(size)
+        _write_model(output_dir)
+
+    faster_whisper = types.ModuleType("faster_whisper")
+    faster_whisper.utils = types.ModuleType("faster_whisper.utils")
+    faster_whisper.utils.download_model = download_model
+    monkeypatch.setitem(sys.modules, "faster_whisper", faster_whisper)
+    monkeypatch.setitem(sys.modules, "faster_whisper.utils", faster_whisper.utils)
+
+    store = ModelStore(str(tmp_path))
+    path = store.resolve("tiny")
+    assert store.resolve("tiny") == path
+    assert downloads == ["tiny"]
+    assert os.path.exists(os.path.join(path, MANIFEST))
+    # No staging directories are left behind
+    assert sorted(os.listdir(str(tmp_path))) == [".tiny.lock", "tiny"]
@@ -0,0 +1,58 @@
+import os
+
+from utils.transcription_cache import CachedTranscript, TranscriptionCache
+
+
+def _audio(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_key_depends_on_content_and_variant(tmp_path):
+    cache = TranscriptionCache(str(tmp_path / "cache"))
+    first = _audio(tmp_path, "a.webm", b"same audio")
+    copy = _audio(tmp_path, "b.webm", b"same audio")
+    other = _audio(tmp_path, "c.webm", b"other audio")
+
+    assert cache.key_for(first, "small:int8:en:beam1") == cache.key_for(copy, "small:int8:en:beam1")
+    assert cache.key_for(first, "small:int8:en:beam1") != cache.key_for(first, "small:int8:en:beam5")
+    assert cache.key_for(first, "small:int8:en:beam1") != cache.key_for(other, "small:int8:en:beam1")
+
+
+def test_round_trip_and_stats(tmp_path):
+    cache = TranscriptionCache(str(tmp_path / "cache"))
+    segments = [{'start': 0.0, 'end': 1.0, 'text': "hi"}]
+
+    assert cache.get("k1") is None
+    cache.put("k1", "hi", segments)
+    cache.put("k2", "text only")
+    assert cache.get("k1") == CachedTranscript("hi", segments)
+    assert cache.get("k2") == CachedTranscript("text only", None)
+
+    stats = cache.stats()
+    assert (stats['local_hits'], stats['misses'], stats['stores']) == (2, 1, 2)
+    # Entries already on disk count towards the budget after a restart
+    assert TranscriptionCache(str(tmp_path / "cache")).stats()['local_bytes'] == stats['local_bytes']
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = TranscriptionCache(str(tmp_path / "cache"), max_bytes=10_000)
+    for i in range(3):
+        cache.put(f"k{i}", "x" * 3000)
+        os.utime(cache._path(f"k{i}"), (1000 + i, 1000 + i))
+    cache.get("k0")  # refreshes k0, leaving k1 the oldest
+
+    cache.put("k3", "x" * 3000)
+    assert cache.get("k1") is None
+    assert cache.get("k0") is not None and cache.get("k3") is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_unreadable_entry_is_discarded(tmp_path):
+    cache = TranscriptionCache(str(tmp_path / "cache"))
+    cache.put("k1", "hi")
+    with open(cache._path("k1"), 'w') as f:
+        f.write("{truncated")
+    assert cache.get("k1") is None
+    assert not os.path.exists(cache._path("k1"))
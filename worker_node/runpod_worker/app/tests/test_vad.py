@@ -0,0 +1,50 @@
+import numpy as np
+
+from utils.vad import SAMPLE_RATE, VoiceActivityDetector
+
+
+def _seconds(n):
+    return np.arange(int(n * SAMPLE_RATE)) / SAMPLE_RATE
+
+
+def test_steady_tone_is_speech():
+    audio = (0.3 * np.sin(2 * np.pi * 220 * _seconds(5))).astype(np.float32)
+    result = VoiceActivityDetector().analyze(audio)
+    assert not result.is_silent
+    assert result.speech_end - result.speech_start > 4.5
+
+
+def test_white_noise_is_speech():
+    rng = np.random.default_rng(0)
+    audio = (0.2 * rng.standard_normal(5 * SAMPLE_RATE)).clip(-1, 1).astype(np.float32)
+    result = VoiceActivityDetector().analyze(audio)
+    assert not result.is_silent
+    assert result.speech_end - result.speech_start > 4.5
+
+
+def test_low_snr_speech_is_kept():
+    # Syllable-like bursts about 9 dB above a steady noise bed
+    rng = np.random.default_rng(1)
+    t = _seconds(20)
+    envelope = (np.sin(2 * np.pi * 2.0 * t) > 0).astype(np.float32)
+    bursts = 0.08 * envelope * np.sin(2 * np.pi * 180 * t)
+    noise = 0.02 * rng.standard_normal(len(t))
+    audio = (bursts + noise).astype(np.float32)
+    result = VoiceActivityDetector().analyze(audio)
+    assert not result.is_silent
+    assert result.speech_end - result.speech_start > 19.0
+
+
+def test_silence_is_silent():
+    rng = np.random.default_rng(2)
+    audio = (0.0005 * rng.standard_normal(5 * SAMPLE_RATE)).astype(np.float32)
+    assert VoiceActivityDetector().analyze(audio).is_silent
+
+
+def test_leading_and_trailing_silence_is_trimmed():
+    tone = 0.3 * np.sin(2 * np.pi * 220 * _seconds(2))
+    quiet = np.zeros(3 * SAMPLE_RATE)
+    audio = np.concatenate([quiet, tone, quiet]).astype(np.float32)
+    result = VoiceActivityDetector(padding_ms=0).analyze(audio)
+    assert abs(result.speech_start - 3.0) < 0.1
+    assert abs(result.speech_end - 5.0) < 0.1
@@ -0,0 +1,118 @@
+# file: utils/adaptive_decoding.py
+
+import logging
+import threading
+from typing import Dict, Any, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIERS = {
+    'quality': {'beam_size': 5, 'temperature': [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]},
+    'balanced': {'beam_size': 2, 'temperature': [0.0, 0.4, 0.8]},
+    'fast': {'beam_size': 1, 'temperature': [0.0]},
+}
+
+
+class DecodingDecision(NamedTuple):
+    tier: str
+    beam_size: int
+    temperature: Optional[Tuple[float, ...]]  # None keeps faster-whisper's default fallback
+    model_size: Optional[str]  # None keeps the task's / configured model
+    backlog: Optional[float]
+    task_age: Optional[float]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'tier': self.tier,
+            'beam_size': self.beam_size,
+            'temperature': list(self.temperature) if self.temperature is not None else None,
+            'model_size': self.model_size,
+            'backlog': self.backlog,
+            'task_age': self.task_age,
+        }
+
+
+class AdaptiveDecodingController:
+    """Pick decoding settings per task from orchestrator backlog and task age.
+
+    Load is the larger of ``backlog / backlog_high`` and ``age / age_high``.
+    At or above 1.0 the ``fast`` tier is used (greedy decoding, no temperature
+    fallback, optionally a smaller model); when both backlog and age are at or
+    below their ``low`` marks the ``quality`` tier is used; otherwise
+    ``balanced``. Backlog is smoothed with an EWMA so a single poll does not
+    flip the tier.
+    """
+
+    def __init__(self, tiers: Optional[Dict[str, Dict[str, Any]]] = None,
+                 backlog_low: float = 2, backlog_high: float = 20,
+                 age_low_seconds: float = 60, age_high_seconds: float = 600,
+                 smoothing: float = 0.3):
+        self.tiers = {name: dict(DEFAULT_TIERS[name], **(tiers or {}).get(name, {}))
+                      for name in DEFAULT_TIERS}
+        self.backlog_low = backlog_low
+        self.backlog_high = backlog_high
+        self.age_low = age_low_seconds
+        self.age_high = age_high_seconds
+        self.smoothing = smoothing
+
+        self._lock = threading.Lock()
+        self._backlog_ewma = None
+        self._tier_counts = {name: 0 for name in self.tiers}
+
+    def decide(self, backlog: Optional[float], task_age: Optional[float]) -> DecodingDecision:
+        backlog = self._smooth(backlog)
+        load = max(
+            backlog / self.backlog_high if backlog is not None else 0.0,
+            task_age / self.age_high if task_age is not None else 0.0,
+        )
+
+        if load >= 1.0:
+            tier = 'fast'
+        elif ((backlog is None or backlog <= self.backlog_low)
+              and (task_age is None or task_age <= self.age_low)):
+            tier = 'quality'
+        else:
+            tier = 'balanced'
+
+        return self.tier(tier, backlog, task_age)
+
+    def baseline(self) -> DecodingDecision:
+        """Neutral decision used when adaptive decoding is disabled.
+
+        Keeps the configured model and the decode options the worker used
+        before tiers existed (beam size 1, library default temperatures).
+        """
+        return DecodingDecision(tier='default', beam_size=1, temperature=None, model_size=None,
+                                backlog=None, task_age=None)
+
+    def tier(self, name: str, backlog: Optional[float] = None,
+             task_age: Optional[float] = None) -> DecodingDecision:
+        """Decision for a fixed tier, bypassing the load calculation."""
+        settings = self.tiers[name]
+        with self._lock:
+            self._tier_counts[name] += 1
+        return DecodingDecision(
+            tier=name,
+            beam_size=int(settings['beam_size']),
+            temperature=tuple(settings['temperature']),
+            model_size=settings.get('model_size'),
+            backlog=round(backlog, 2) if backlog is not None else None,
+            task_age=round(task_age, 1) if task_age is not None else None,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'tasks_per_tier': dict(self._tier_counts),
+                'backlog_ewma': round(self._backlog_ewma, 2) if self._backlog_ewma is not None else None,
+            }
+
+    def _smooth(self, backlog: Optional[float]) -> Optional[float]:
+        if backlog is None:
+            return self._backlog_ewma
+        with self._lock:
+            if self._backlog_ewma is None:
+                self._backlog_ewma = float(backlog)
+            else:
+                self._backlog_ewma += self.smoothing * (backlog - self._backlog_ewma)
+            return self._backlog_ewma
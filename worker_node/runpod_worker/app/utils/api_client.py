@@ -0,0 +1,150 @@
+# file: utils/api_client.py
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPTIONS_PATH = "/v1/audio/transcriptions"
+
+
+class TranscriptionApiError(Exception):
+    """The local transcription server rejected a request or returned an unusable body."""
+
+
+class AsyncTranscriptionClient:
+    """Concurrent client for the local faster-whisper API server.
+
+    Requests run on an asyncio loop in a background thread over one pooled
+    httpx.AsyncClient (HTTP/1.1 keep-alive), so several task threads can have
+    uploads in flight at once. At most ``max_in_flight`` requests are sent to
+    the server concurrently; further callers wait for a slot. File bodies are
+    streamed from disk in multipart chunks rather than read into memory.
+    """
+
+    def __init__(self, base_url: str, max_in_flight: int = 2, timeout: float = 1800,
+                 connect_timeout: float = 10, language: str = "en"):
+        self.url = base_url.rstrip("/") + TRANSCRIPTIONS_PATH
+        self.max_in_flight = max(1, max_in_flight)
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.language = language
+
+        self._stats = {
+            'requests': 0,
+            'failures': 0,
+            'in_flight': 0,
+            'peak_in_flight': 0,
+            'bytes_uploaded': 0,
+            'seconds': 0.0
+        }
+        self._stats_lock = threading.Lock()
+
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name="api-client", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_in_flight,
+                max_keepalive_connections=self.max_in_flight
+            )
+        )
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._ready.set()
+        self._loop.run_forever()
+
+    def submit(self, audio_path: str, verbose: bool = False) -> Future:
+        """Queue `audio_path` for transcription; the future resolves to the transcript text.
+
+        With `verbose` the server is asked for ``verbose_json`` with word
+        timestamps and the future resolves to the whole response dict.
+        """
+        return asyncio.run_coroutine_threadsafe(self._transcribe(audio_path, verbose), self._loop)
+
+    def transcribe(self, audio_path: str, verbose: bool = False):
+        """Transcribe `audio_path`, blocking the calling thread. Raises TranscriptionApiError."""
+        return self.submit(audio_path, verbose).result()
+
+    async def _transcribe(self, audio_path: str, verbose: bool = False):
+        filename = os.path.basename(audio_path)
+        size = os.path.getsize(audio_path)
+        data = {"language": self.language}
+        if verbose:
+            data["response_format"] = "verbose_json"
+            data["timestamp_granularities[]"] = ["segment", "word"]
+
+        async with self._slots:
+            self._track(in_flight=1)
+            start = time.monotonic()
+            try:
+                with open(audio_path, "rb") as f:
+                    response = await self._client.post(
+                        self.url,
+                        files={"file": (filename, f)},
+                        data=data
+                    )
+            except httpx.HTTPError as e:
+                self._track(in_flight=-1, failed=True, seconds=time.monotonic() - start)
+                raise TranscriptionApiError(f"Request for {filename} failed: {e}") from e
+
+            elapsed = time.monotonic() - start
+            self._track(in_flight=-1, failed=response.status_code != 200, seconds=elapsed,
+                        uploaded=size)
+
+        logger.info(
+            f"API transcription of {filename}: {response.status_code}, "
+            f"{len(response.content)} bytes in {elapsed:.2f}s"
+        )
+        if response.status_code != 200:
+            # Error bodies can be whole tracebacks; keep the log line bounded
+            raise TranscriptionApiError(
+                f"Server returned {response.status_code} for {filename}: {response.text[:200]}"
+            )
+
+        try:
+            result = response.json()
+        except ValueError as e:
+            raise TranscriptionApiError(f"Invalid JSON response for {filename}: {e}") from e
+        if not isinstance(result, dict) or 'text' not in result:
+            raise TranscriptionApiError(f"Response for {filename} has no 'text' field")
+        return result if verbose else result['text']
+
+    def _track(self, in_flight: int, failed: bool = False, seconds: float = 0.0,
+               uploaded: int = 0) -> None:
+        with self._stats_lock:
+            stats = self._stats
+            stats['in_flight'] += in_flight
+            stats['peak_in_flight'] = max(stats['peak_in_flight'], stats['in_flight'])
+            if in_flight < 0:
+                stats['requests'] += 1
+                stats['failures'] += int(failed)
+                stats['seconds'] = round(stats['seconds'] + seconds, 3)
+                stats['bytes_uploaded'] += uploaded
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def close(self, timeout: Optional[float] = 10) -> None:
+        """Close pooled connections and stop the loop thread."""
+        if not self._thread.is_alive():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Error closing API client: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
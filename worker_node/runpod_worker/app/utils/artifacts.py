@@ -0,0 +1,107 @@
+# file: utils/artifacts.py
+#
+# Structured transcript artifacts rendered from one inference pass.
+#
+# The JSON artifact is compact: timestamps are rounded to milliseconds and
+# words are stored as [start, end, word, probability] rows, described by
+# "word_fields":
+#
+#     {"version": 1, "language": "en", "duration": 12.48, "text": "...",
+#      "word_fields": ["start", "end", "word", "probability"],
+#      "segments": [{"start": 0.0, "end": 4.2, "text": "...",
+#                    "avg_logprob": -0.21, "no_speech_prob": 0.01,
+#                    "words": [[0.0, 0.4, " Hello", 0.98], ...]}]}
+#
+# SRT and WebVTT renditions are generated from the same segments. Every
+# artifact is gzip-compressed before upload.
+
+import gzip
+import json
+from typing import Any, Dict, List, Optional
+
+ARTIFACT_VERSION = 1
+WORD_FIELDS = ["start", "end", "word", "probability"]
+
+# format -> (file extension, Content-Type)
+FORMATS = {
+    'json': ('json', 'application/json'),
+    'srt': ('srt', 'application/x-subrip'),
+    'vtt': ('vtt', 'text/vtt'),
+}
+
+
+def build_artifact(segments: List[dict], text: str, duration: float,
+                   language: str = "en", model: Optional[str] = None) -> Dict[str, Any]:
+    """Compact artifact dict from segment dicts as produced by Transcriber."""
+    artifact = {
+        'version': ARTIFACT_VERSION,
+        'language': language,
+        'duration': round(duration, 3),
+        'text': text,
+        'word_fields': WORD_FIELDS,
+        'segments': [_compact_segment(segment) for segment in segments],
+    }
+    if model:
+        artifact['model'] = model
+    return artifact
+
+
+def _compact_segment(segment: dict) -> dict:
+    compact = {
+        'start': round(segment['start'], 3),
+        'end': round(segment['end'], 3),
+        'text': segment['text'],
+    }
+    for field in ('avg_logprob', 'no_speech_prob'):
+        if segment.get(field) is not None:
+            compact[field] = round(segment[field], 3)
+    if segment.get('words'):
+        compact['words'] = [
+            [round(word['start'], 3), round(word['end'], 3), word['word'],
+             round(word['probability'], 3) if word.get('probability') is not None else None]
+            for word in segment['words']
+        ]
+    return compact
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    millis = int(round(max(seconds, 0.0) * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def to_srt(segments: List[dict]) -> str:
+    cues = []
+    for index, segment in enumerate(segments, start=1):
+        cues.append(
+            f"{index}\n"
+            f"{_timestamp(segment['start'], ',')} --> {_timestamp(segment['end'], ',')}\n"
+            f"{segment['text'].strip()}\n"
+        )
+    return "\n".join(cues)
+
+
+def to_vtt(segments: List[dict]) -> str:
+    cues = ["WEBVTT\n"]
+    for segment in segments:
+        cues.append(
+            f"{_timestamp(segment['start'], '.')} --> {_timestamp(segment['end'], '.')}\n"
+            f"{segment['text'].strip()}\n"
+        )
+    return "\n".join(cues)
+
+
+def render(fmt: str, artifact: Dict[str, Any]) -> bytes:
+    """Gzip-compressed bytes of `artifact` in format `fmt` (json, srt or vtt)."""
+    if fmt == 'json':
+        body = json.dumps(artifact, separators=(',', ':'), ensure_ascii=False)
+    elif fmt == 'srt':
+        body = to_srt(artifact['segments'])
+    elif fmt == 'vtt':
+        body = to_vtt(artifact['segments'])
+    else:
+        raise ValueError(f"Unknown artifact format: {fmt}")
+    # mtime=0 keeps the output byte-identical for identical transcripts
+    return gzip.compress(body.encode('utf-8'), mtime=0)
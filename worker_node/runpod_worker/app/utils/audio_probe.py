@@ -0,0 +1,350 @@
+# file: utils/audio_probe.py
+#
+# Pure-Python duration probing for the containers the recorders upload
+# (WebM/Matroska, Ogg Opus/Vorbis, FLAC, WAV, MP3). Only the container
+# headers near the start and end of the file are read, so probing costs a
+# couple of small reads instead of an ffprobe fork per file.
+
+import logging
+import os
+import struct
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HEAD_BYTES = 64 * 1024
+TAIL_BYTES = 16 * 1024
+# WebM files written by MediaRecorder often have no Duration; the last
+# Cluster can be several hundred KB from the end for long audio-only clusters
+MAX_TAIL_BYTES = 1024 * 1024
+
+
+def probe_duration(path: str) -> Optional[float]:
+    """Return the duration of `path` in seconds, or None if the format is unknown or unparseable."""
+    try:
+        size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            head = f.read(HEAD_BYTES)
+            if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+                return _wav_duration(f, size)
+            if head[:4] == b'fLaC':
+                return _flac_duration(head)
+            if head[:4] == b'OggS':
+                return _ogg_duration(f, head, size)
+            if head[:4] == b'\x1a\x45\xdf\xa3':
+                return _matroska_duration(f, head, size)
+            if head[:3] == b'ID3' or _is_mp3_sync(head, 0):
+                return _mp3_duration(f, head, size)
+    except (OSError, struct.error, IndexError, ValueError) as e:
+        logger.debug(f"Header probe failed for {path}: {e}")
+    return None
+
+
+def _read_tail(f, size: int, length: int) -> Tuple[bytes, int]:
+    """Read the last `length` bytes; returns the data and its file offset."""
+    start = max(0, size - length)
+    f.seek(start)
+    return f.read(size - start), start
+
+
+# ---------------------------------------------------------------------------
+# WAV
+# ---------------------------------------------------------------------------
+
+def _wav_duration(f, size: int) -> Optional[float]:
+    byte_rate = None
+    pos = 12
+    while pos + 8 <= size:
+        f.seek(pos)
+        chunk_id, chunk_size = struct.unpack('<4sI', f.read(8))
+        if chunk_id == b'fmt ':
+            fmt = f.read(16)
+            byte_rate = struct.unpack_from('<I', fmt, 8)[0]
+        elif chunk_id == b'data':
+            if not byte_rate:
+                return None
+            # Streamed WAVs leave the size at 0 or 0xFFFFFFFF; trust the file size then
+            available = size - (pos + 8)
+            if chunk_size == 0 or chunk_size > available:
+                chunk_size = available
+            return chunk_size / byte_rate
+        pos += 8 + chunk_size + (chunk_size & 1)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# FLAC
+# ---------------------------------------------------------------------------
+
+def _flac_duration(head: bytes) -> Optional[float]:
+    # STREAMINFO is always the first metadata block
+    if head[4] & 0x7F != 0:
+        return None
+    packed = struct.unpack_from('>Q', head, 8 + 10)[0]
+    sample_rate = packed >> 44
+    total_samples = packed & ((1 << 36) - 1)
+    if not sample_rate or not total_samples:
+        return None
+    return total_samples / sample_rate
+
+
+# ---------------------------------------------------------------------------
+# Ogg (Opus / Vorbis)
+# ---------------------------------------------------------------------------
+
+def _ogg_duration(f, head: bytes, size: int) -> Optional[float]:
+    serial = struct.unpack_from('<I', head, 14)[0]
+    n_segments = head[26]
+    packet = head[27 + n_segments:]
+
+    if packet.startswith(b'OpusHead'):
+        pre_skip = struct.unpack_from('<H', packet, 10)[0]
+        rate = 48000  # Opus granule positions always count 48 kHz samples
+    elif packet.startswith(b'\x01vorbis'):
+        pre_skip = 0
+        rate = struct.unpack_from('<I', packet, 12)[0]
+    else:
+        return None
+
+    tail, _ = _read_tail(f, size, TAIL_BYTES)
+    pos = tail.rfind(b'OggS')
+    while pos != -1:
+        if pos + 27 <= len(tail):
+            granule, page_serial = struct.unpack_from('<qI', tail, pos + 6)
+            # -1 means no packet ends on this page
+            if page_serial == serial and granule >= 0:
+                return max(0, granule - pre_skip) / rate
+        pos = tail.rfind(b'OggS', 0, pos)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# WebM / Matroska (EBML)
+# ---------------------------------------------------------------------------
+
+EBML_SEGMENT = 0x18538067
+EBML_INFO = 0x1549A966
+EBML_TIMECODE_SCALE = 0x2AD7B1
+EBML_DURATION = 0x4489
+EBML_TRACKS = 0x1654AE6B
+EBML_TRACK_ENTRY = 0xAE
+EBML_DEFAULT_DURATION = 0x23E383
+EBML_CLUSTER = 0x1F43B675
+EBML_CLUSTER_TIMECODE = 0xE7
+EBML_SIMPLE_BLOCK = 0xA3
+EBML_BLOCK_GROUP = 0xA0
+EBML_BLOCK = 0xA1
+
+CLUSTER_ID_BYTES = b'\x1f\x43\xb6\x75'
+
+
+def _read_vint(buf: bytes, pos: int, keep_marker: bool = False) -> Tuple[int, int]:
+    """Decode an EBML variable-length integer; returns (value, length). Size -1 means unknown."""
+    first = buf[pos]
+    if first == 0:
+        raise ValueError("invalid EBML vint")
+    length = 1
+    mask = 0x80
+    while not first & mask:
+        mask >>= 1
+        length += 1
+    value = first if keep_marker else first & (mask - 1)
+    for i in range(1, length):
+        value = (value << 8) | buf[pos + i]
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        value = -1
+    return value, length
+
+
+def _read_element(buf: bytes, pos: int) -> Tuple[int, int, int]:
+    """Return (element id, data start, data size) for the element at `pos`."""
+    element_id, id_len = _read_vint(buf, pos, keep_marker=True)
+    data_size, size_len = _read_vint(buf, pos + id_len)
+    return element_id, pos + id_len + size_len, data_size
+
+
+def _read_uint(buf: bytes, start: int, size: int) -> int:
+    return int.from_bytes(buf[start:start + size], 'big')
+
+
+def _matroska_duration(f, head: bytes, size: int) -> Optional[float]:
+    timecode_scale = 1000000  # nanoseconds per timecode tick
+    duration = None
+    frame_ns = 0
+
+    # Skip the EBML header, then walk the top level children of Segment
+    _, data_start, data_size = _read_element(head, 0)
+    element_id, pos, _ = _read_element(head, data_start + data_size)
+    if element_id != EBML_SEGMENT:
+        return None
+
+    while pos < len(head):
+        try:
+            element_id, data_start, data_size = _read_element(head, pos)
+        except (IndexError, ValueError):
+            break  # header region runs past the bytes we read
+        if element_id == EBML_CLUSTER or data_size < 0:
+            break
+        data_end = data_start + data_size
+        if element_id == EBML_INFO:
+            child = data_start
+            while child < min(data_end, len(head)):
+                child_id, child_start, child_size = _read_element(head, child)
+                if child_id == EBML_TIMECODE_SCALE:
+                    timecode_scale = _read_uint(head, child_start, child_size)
+                elif child_id == EBML_DURATION:
+                    fmt = '>f' if child_size == 4 else '>d'
+                    duration = struct.unpack_from(fmt, head, child_start)[0]
+                child = child_start + child_size
+        elif element_id == EBML_TRACKS:
+            frame_ns = _first_default_duration(head, data_start, min(data_end, len(head)))
+        pos = data_end
+
+    if duration:
+        return duration * timecode_scale / 1e9
+
+    # No Duration (typical for MediaRecorder output): use the last block's timecode
+    last_timecode = _last_block_timecode(f, size)
+    if last_timecode is None:
+        return None
+    return (last_timecode * timecode_scale + frame_ns) / 1e9
+
+
+def _first_default_duration(buf: bytes, start: int, end: int) -> int:
+    pos = start
+    while pos < end:
+        element_id, data_start, data_size = _read_element(buf, pos)
+        if element_id == EBML_TRACK_ENTRY:
+            child = data_start
+            while child < min(data_start + data_size, end):
+                child_id, child_start, child_size = _read_element(buf, child)
+                if child_id == EBML_DEFAULT_DURATION:
+                    return _read_uint(buf, child_start, child_size)
+                child = child_start + child_size
+        pos = data_start + data_size
+    return 0
+
+
+def _last_block_timecode(f, size: int) -> Optional[int]:
+    """Find the last Cluster near the end of the file and return its last block timecode."""
+    length = TAIL_BYTES
+    while True:
+        tail, _ = _read_tail(f, size, length)
+        pos = tail.rfind(CLUSTER_ID_BYTES)
+        while pos != -1:
+            timecode = _cluster_last_timecode(tail, pos)
+            if timecode is not None:
+                return timecode
+            pos = tail.rfind(CLUSTER_ID_BYTES, 0, pos)
+        if length >= min(size, MAX_TAIL_BYTES):
+            return None
+        length *= 4
+
+
+def _cluster_last_timecode(buf: bytes, pos: int) -> Optional[int]:
+    try:
+        _, data_start, data_size = _read_element(buf, pos)
+        end = len(buf) if data_size < 0 else min(len(buf), data_start + data_size)
+
+        child_id, child_start, child_size = _read_element(buf, data_start)
+        if child_id != EBML_CLUSTER_TIMECODE:
+            return None
+        cluster_timecode = _read_uint(buf, child_start, child_size)
+
+        last = cluster_timecode
+        child = child_start + child_size
+        while child < end:
+            child_id, child_start, child_size = _read_element(buf, child)
+            if child_size < 0:
+                break
+            if child_id == EBML_BLOCK_GROUP:
+                block_id, block_start, _ = _read_element(buf, child_start)
+                if block_id == EBML_BLOCK and block_start + 10 <= len(buf):
+                    last = cluster_timecode + _block_relative_timecode(buf, block_start)
+            elif child_id == EBML_SIMPLE_BLOCK and child_start + 10 <= len(buf):
+                last = cluster_timecode + _block_relative_timecode(buf, child_start)
+            elif child_id == EBML_CLUSTER:
+                break
+            child = child_start + child_size
+        return last
+    except (IndexError, ValueError):
+        return None
+
+
+def _block_relative_timecode(buf: bytes, block_start: int) -> int:
+    _, track_len = _read_vint(buf, block_start)
+    return struct.unpack_from('>h', buf, block_start + track_len)[0]
+
+
+# ---------------------------------------------------------------------------
+# MP3 (MPEG audio layer III)
+# ---------------------------------------------------------------------------
+
+MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],   # MPEG-1
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],       # MPEG-2 / 2.5
+}
+MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG-1
+    2: [22050, 24000, 16000],  # MPEG-2
+    0: [11025, 12000, 8000],   # MPEG-2.5
+}
+
+
+def _is_mp3_sync(buf: bytes, pos: int) -> bool:
+    if pos + 4 > len(buf):
+        return False
+    b1, b2 = buf[pos + 1], buf[pos + 2]
+    return (buf[pos] == 0xFF and (b1 & 0xE0) == 0xE0
+            and (b1 >> 3) & 0x03 != 1           # reserved version
+            and (b1 >> 1) & 0x03 == 1           # layer III
+            and b2 >> 4 not in (0, 15)          # free / bad bitrate
+            and (b2 >> 2) & 0x03 != 3)          # reserved sample rate
+
+
+def _mp3_duration(f, head: bytes, size: int) -> Optional[float]:
+    audio_start = 0
+    if head[:3] == b'ID3':
+        tag_size = ((head[6] & 0x7F) << 21 | (head[7] & 0x7F) << 14
+                    | (head[8] & 0x7F) << 7 | (head[9] & 0x7F))
+        audio_start = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+        f.seek(audio_start)
+        head = f.read(HEAD_BYTES)
+    else:
+        head = head[:HEAD_BYTES]
+
+    # First valid frame header
+    pos = 0
+    while pos < len(head) - 4 and not _is_mp3_sync(head, pos):
+        pos += 1
+    if not _is_mp3_sync(head, pos):
+        return None
+    audio_start += pos
+
+    b1, b2, b3 = head[pos + 1], head[pos + 2], head[pos + 3]
+    version_bits = (b1 >> 3) & 0x03
+    mpeg1 = version_bits == 3
+    bitrate = MP3_BITRATES[1 if mpeg1 else 2][b2 >> 4] * 1000
+    sample_rate = MP3_SAMPLE_RATES[version_bits][(b2 >> 2) & 0x03]
+    samples_per_frame = 1152 if mpeg1 else 576
+    mono = (b3 >> 6) == 3
+
+    # VBR files carry a frame count in a Xing/Info or VBRI header in the first frame
+    side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    xing = pos + 4 + side_info
+    if head[xing:xing + 4] in (b'Xing', b'Info'):
+        flags = struct.unpack_from('>I', head, xing + 4)[0]
+        if flags & 0x01:
+            frames = struct.unpack_from('>I', head, xing + 8)[0]
+            return frames * samples_per_frame / sample_rate
+    vbri = pos + 4 + 32
+    if head[vbri:vbri + 4] == b'VBRI':
+        frames = struct.unpack_from('>I', head, vbri + 14)[0]
+        return frames * samples_per_frame / sample_rate
+
+    # Constant bitrate: estimate from the audio payload size
+    audio_bytes = size - audio_start
+    tail, _ = _read_tail(f, size, 128)
+    if tail[:3] == b'TAG':
+        audio_bytes -= 128
+    return audio_bytes * 8 / bitrate
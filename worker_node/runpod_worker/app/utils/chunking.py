@@ -0,0 +1,97 @@
+# file: utils/chunking.py
+
+import re
+from typing import List, NamedTuple
+
+import numpy as np
+
+from utils.vad import VoiceActivityDetector, SAMPLE_RATE
+
+
+class Chunk(NamedTuple):
+    """A slice of a long recording, in seconds.
+
+    ``start``/``end`` is the audio sent to the model (including overlap);
+    ``own_start``/``own_end`` is the region whose segments this chunk keeps.
+    """
+    start: float
+    end: float
+    own_start: float
+    own_end: float
+
+
+def plan_chunks(audio: np.ndarray, vad: VoiceActivityDetector,
+                min_seconds: float = 30.0, max_seconds: float = 60.0,
+                overlap_seconds: float = 1.0, sample_rate: int = SAMPLE_RATE) -> List[Chunk]:
+    """Split `audio` into chunks of min_seconds..max_seconds, cutting inside silences.
+
+    Each cut is placed in the middle of the longest non-speech run between
+    ``min_seconds`` and ``max_seconds`` after the previous cut; if there is
+    no silence in that window the chunk is cut hard at ``max_seconds``.
+    """
+    duration = len(audio) / sample_rate
+    frame_seconds = vad.frame_len / sample_rate
+    mask = vad.speech_mask(audio)
+
+    cuts = [0.0]
+    while duration - cuts[-1] > max_seconds:
+        window_start = int((cuts[-1] + min_seconds) / frame_seconds)
+        window_end = min(len(mask), int((cuts[-1] + max_seconds) / frame_seconds))
+        cut = _longest_silence_midpoint(mask, window_start, window_end)
+        cuts.append(cut * frame_seconds if cut is not None else cuts[-1] + max_seconds)
+    cuts.append(duration)
+
+    chunks = []
+    for own_start, own_end in zip(cuts, cuts[1:]):
+        chunks.append(Chunk(
+            start=max(0.0, own_start - overlap_seconds),
+            end=min(duration, own_end + overlap_seconds),
+            own_start=own_start,
+            own_end=own_end
+        ))
+    return chunks
+
+
+def _longest_silence_midpoint(mask: np.ndarray, start: int, end: int):
+    """Frame index at the centre of the longest run of non-speech frames in [start, end)."""
+    if end <= start:
+        return None
+    silent = ~mask[start:end]
+    if not silent.any():
+        return None
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+    longest = int(np.argmax(run_ends - run_starts))
+    return start + (int(run_starts[longest]) + int(run_ends[longest])) // 2
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r'[^\w\s]', '', text).lower().strip()
+
+
+def stitch_segments(chunk_segments: List[tuple]) -> List[dict]:
+    """Merge per-chunk segments into one timeline.
+
+    `chunk_segments` is a list of ``(chunk, segments)`` where each segment is
+    a dict with absolute ``start``/``end`` seconds and ``text``. A segment is
+    kept only by the chunk that owns its midpoint, and a segment repeating the
+    previous one's text while overlapping it in time is dropped.
+    """
+    kept = []
+    for chunk, segments in chunk_segments:
+        for segment in segments:
+            midpoint = (segment['start'] + segment['end']) / 2
+            if chunk.own_start <= midpoint < chunk.own_end:
+                kept.append(segment)
+    kept.sort(key=lambda segment: segment['start'])
+
+    stitched = []
+    for segment in kept:
+        if stitched:
+            previous = stitched[-1]
+            if (segment['start'] < previous['end']
+                    and _normalize(segment['text']) == _normalize(previous['text'])):
+                continue
+        stitched.append(segment)
+    return stitched
@@ -0,0 +1,55 @@
+# file: utils/device.py
+#
+# CUDA detection without importing torch. CTranslate2 (already a
+# faster-whisper dependency) reports the device count cheaply; nvidia-smi is
+# the fallback when CTranslate2 itself is not importable.
+
+import logging
+import shutil
+import subprocess
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def cuda_device_count() -> int:
+    """Number of CUDA devices visible to this process (0 if none or undetectable)."""
+    try:
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count()
+    except Exception as e:
+        logger.debug(f"ctranslate2 CUDA probe unavailable: {e}")
+
+    if not shutil.which('nvidia-smi'):
+        return 0
+    try:
+        result = subprocess.run(['nvidia-smi', '-L'], capture_output=True, text=True, timeout=10)
+        if result.returncode != 0:
+            return 0
+        return sum(1 for line in result.stdout.splitlines() if line.startswith('GPU '))
+    except Exception as e:
+        logger.debug(f"nvidia-smi probe failed: {e}")
+        return 0
+
+
+def cuda_available() -> bool:
+    return cuda_device_count() > 0
+
+
+@lru_cache(maxsize=1)
+def cuda_device_name(index: int = 0) -> Optional[str]:
+    """Marketing name of GPU `index` via nvidia-smi, or None."""
+    if not shutil.which('nvidia-smi'):
+        return None
+    try:
+        result = subprocess.run(
+            ['nvidia-smi', f'--id={index}', '--query-gpu=name', '--format=csv,noheader'],
+            capture_output=True, text=True, timeout=10
+        )
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip() or None
+    except Exception:
+        return None
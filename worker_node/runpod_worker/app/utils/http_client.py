@@ -0,0 +1,113 @@
+# file: utils/http_client.py
+
+import logging
+import threading
+import time
+from typing import Dict, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Methods that are safe to retry after a read error or retryable status.
+# Connection errors are retried for every method since nothing was sent.
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'])
+
+
+def _counting_pool(base, client: 'HttpClient'):
+    """Subclass of a urllib3 pool class that reports connection checkouts and opens to `client`."""
+
+    class CountingPool(base):
+        def _get_conn(self, timeout=None):
+            client._count('checkouts')
+            return super()._get_conn(timeout)
+
+        def _new_conn(self):
+            client._count('new_connections')
+            return super()._new_conn()
+
+    return CountingPool
+
+
+class HttpClient:
+    """Shared keep-alive HTTP client for the orchestrator, S3 and the local API.
+
+    Wraps a single ``requests.Session`` whose adapter keeps one connection pool
+    per host, so repeated calls to the same host reuse TCP/TLS connections
+    instead of opening a new one per request. Retries use exponential backoff.
+    """
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 8,
+                 max_retries: int = 3, backoff_factor: float = 0.5,
+                 status_forcelist=(502, 503, 504)):
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            allowed_methods=IDEMPOTENT_METHODS,
+            raise_on_status=False
+        )
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry
+        )
+
+        # Count connections as the pools hand them out: each attempt (retries
+        # included) checks one out, and only some of those open a new one
+        self._adapter.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool(HTTPConnectionPool, self),
+            'https': _counting_pool(HTTPSConnectionPool, self),
+        }
+
+        self.session = requests.Session()
+        self.session.mount('http://', self._adapter)
+        self.session.mount('https://', self._adapter)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._seconds = 0.0
+        self._connections = {'checkouts': 0, 'new_connections': 0}
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        start = time.monotonic()
+        try:
+            return self.session.request(method, url, **kwargs)
+        finally:
+            with self._lock:
+                self._requests += 1
+                self._seconds += time.monotonic() - start
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request('PUT', url, **kwargs)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._connections[counter] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Request count, time spent in HTTP and how many attempts opened or reused a connection."""
+        with self._lock:
+            new_connections = self._connections['new_connections']
+            return {
+                'requests': self._requests,
+                'attempts': self._connections['checkouts'],
+                'new_connections': new_connections,
+                'reused_connections': max(0, self._connections['checkouts'] - new_connections),
+                'seconds': round(self._seconds, 3),
+            }
+
+    def close(self) -> None:
+        self.session.close()
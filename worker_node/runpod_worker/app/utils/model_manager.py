@@ -0,0 +1,189 @@
+# file: utils/model_manager.py
+
+import gc
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Approximate parameter counts (millions) for the Whisper checkpoints we serve.
+# Only used to estimate memory footprint against the cache budget.
+MODEL_PARAMS_M = {
+    'tiny': 39, 'tiny.en': 39,
+    'base': 74, 'base.en': 74,
+    'small': 244, 'small.en': 244,
+    'medium': 769, 'medium.en': 769,
+    'large': 1550, 'large-v1': 1550, 'large-v2': 1550, 'large-v3': 1550,
+}
+
+# Bytes per parameter for each CTranslate2 compute type
+BYTES_PER_PARAM = {
+    'float32': 4,
+    'float16': 2,
+    'bfloat16': 2,
+    'int8_float16': 1,
+    'int8_float32': 1,
+    'int8': 1,
+}
+
+# Runtime overhead on top of the raw weights (buffers, allocator slack)
+FOOTPRINT_OVERHEAD = 1.2
+
+ModelKey = Tuple[str, str, str]  # (size, compute_type, device)
+
+
+def estimate_model_mb(size: str, compute_type: str) -> float:
+    """Rough memory footprint of a loaded model in MB."""
+    params_m = MODEL_PARAMS_M.get(size, MODEL_PARAMS_M['large'])
+    return params_m * BYTES_PER_PARAM.get(compute_type, 2) * FOOTPRINT_OVERHEAD
+
+
+class ModelManager:
+    """Thread-safe LRU cache of loaded WhisperModel instances.
+
+    Models are keyed by (size, compute_type, device). The cache holds at most
+    ``max_models`` entries and, when ``memory_budget_mb`` is set, evicts the
+    least recently used models until the estimated footprint fits the budget.
+    Pinned models (the configured default) are never evicted.
+    ``model_resolver`` maps a size to a local model directory (see
+    ModelStore); without it faster-whisper resolves sizes via the hub.
+    """
+
+    def __init__(self, max_models: int = 2, memory_budget_mb: float = 0,
+                 cpu_threads: int = 0, num_workers: int = 1,
+                 model_resolver: Optional[Callable[[str], str]] = None):
+        self.max_models = max(1, max_models)
+        self.model_resolver = model_resolver
+        self.memory_budget_mb = memory_budget_mb
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+
+        self._models: "OrderedDict[ModelKey, Any]" = OrderedDict()
+        self._pinned = set()
+        self._loading: Dict[ModelKey, threading.Event] = {}
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._load_times: Dict[str, float] = {}
+
+    def preload(self, size: str, compute_type: str, device: str, pin: bool = True):
+        """Load a model up front (e.g. the configured default) and optionally pin it."""
+        model = self.get(size, compute_type, device, count_stats=False)
+        if pin:
+            with self._lock:
+                self._pinned.add((size, compute_type, device))
+        return model
+
+    def get(self, size: str, compute_type: str, device: str, count_stats: bool = True):
+        """Return a loaded model, loading it (and evicting cold ones) on a miss.
+
+        The load itself runs outside the lock, so hits on other models are not
+        blocked behind it. Concurrent requests for a model that is already
+        loading wait for that load instead of starting another one.
+        """
+        key = (size, compute_type, device)
+        while True:
+            with self._lock:
+                model = self._models.get(key)
+                if model is not None:
+                    self._models.move_to_end(key)
+                    if count_stats:
+                        self._hits += 1
+                    return model
+
+                if count_stats:
+                    self._misses += 1
+                    count_stats = False
+
+                loading = self._loading.get(key)
+                if loading is None:
+                    # Make room before loading so peak memory stays within budget
+                    evicted = self._evict_for(key)
+                    loading = self._loading[key] = threading.Event()
+                    break
+            # Another thread is loading this model; if its load fails, try again ourselves
+            loading.wait()
+
+        try:
+            if evicted:
+                # Release evicted CTranslate2 weights before allocating new ones
+                gc.collect()
+            model, elapsed = self._load(key)
+            with self._lock:
+                self._models[key] = model
+                self._load_times["/".join(key)] = round(elapsed, 3)
+            return model
+        finally:
+            with self._lock:
+                self._loading.pop(key)
+            loading.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache hit rate and model load times for metrics reporting."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else None,
+                'evictions': self._evictions,
+                'loaded': ["/".join(key) for key in self._models],
+                'estimated_mb': round(self._footprint_mb(), 1),
+                'load_seconds': dict(self._load_times),
+            }
+
+    def _footprint_mb(self, keys=None) -> float:
+        keys = self._models.keys() if keys is None else keys
+        return sum(estimate_model_mb(size, compute_type) for size, compute_type, _ in keys)
+
+    def _evict_for(self, key: ModelKey) -> bool:
+        """Evict least recently used, unpinned models until `key` fits. Caller holds the lock.
+
+        Models still loading count against the budget. Returns whether anything was evicted.
+        """
+        needed_mb = estimate_model_mb(key[0], key[1])
+
+        def over_budget():
+            if len(self._models) + len(self._loading) + 1 > self.max_models:
+                return True
+            if self.memory_budget_mb and (
+                    self._footprint_mb() + self._footprint_mb(self._loading) + needed_mb > self.memory_budget_mb):
+                return True
+            return False
+
+        evicted = False
+        while over_budget():
+            victim = next((k for k in self._models if k not in self._pinned), None)
+            if victim is None:
+                logger.warning(
+                    f"Model cache over budget but only pinned or loading models remain; "
+                    f"loading {'/'.join(key)} anyway"
+                )
+                break
+            self._models.pop(victim)
+            self._evictions += 1
+            evicted = True
+            logger.info(f"Evicted model {'/'.join(victim)} from cache")
+        return evicted
+
+    def _load(self, key: ModelKey) -> Tuple[Any, float]:
+        """Instantiate a WhisperModel; returns it with the load time in seconds. Called without the lock."""
+        from faster_whisper import WhisperModel
+
+        size, compute_type, device = key
+        kwargs = {'device': device, 'compute_type': compute_type, 'num_workers': self.num_workers}
+        if self.cpu_threads:
+            kwargs['cpu_threads'] = self.cpu_threads
+
+        start = time.monotonic()
+        source = self.model_resolver(size) if self.model_resolver else size
+        model = WhisperModel(source, **kwargs)
+        elapsed = time.monotonic() - start
+
+        logger.info(f"Loaded Whisper model {'/'.join(key)} in {elapsed:.2f}s")
+        return model, elapsed
@@ -0,0 +1,200 @@
+# file: utils/model_store.py
+#
+# Local (or network-volume) store of CTranslate2 Whisper model directories,
+# so fresh pods load weights from disk instead of the Hugging Face hub.
+#
+# Layout: <root>/<size>/{model.bin, config.json, tokenizer.json, ...,
+# manifest.json}. The manifest records the SHA-256, size and mtime of every
+# file. Pods sharing a volume serialize on <root>/.<size>.lock (flock), so one
+# pod downloads while the others wait and then verify its result. Seed a
+# volume ahead of time with:
+#
+#     python -m utils.model_store /runpod-volume/models medium small
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+VERIFY_MODES = ("full", "stat", "none")
+
+
+def _sha256(path: str, block_size: int = 8 * 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelStore:
+    """Resolve a model size to a verified local directory, downloading it if allowed.
+
+    ``verify`` controls checksum verification on every resolve:
+
+    - ``full``: re-hash every file.
+    - ``stat``: re-hash only files whose size or mtime differ from the
+      manifest, so an unchanged volume costs a few stat calls.
+    - ``none``: trust any directory that has a manifest.
+
+    A directory that fails verification is deleted and re-downloaded (when
+    ``allow_download``), otherwise resolve raises RuntimeError. A directory
+    without a manifest (copied onto the volume by hand) has nothing to be
+    verified against: it is only adopted, and checksummed from then on, with
+    ``adopt_unmanaged``; otherwise it is replaced by a download, or left in
+    place with an error when downloads are disabled.
+    """
+
+    def __init__(self, root: str, verify: str = "stat", allow_download: bool = True,
+                 adopt_unmanaged: bool = False):
+        if verify not in VERIFY_MODES:
+            raise ValueError(f"verify must be one of {VERIFY_MODES}, got {verify!r}")
+        self.root = root
+        self.verify = verify
+        self.allow_download = allow_download
+        self.adopt_unmanaged = adopt_unmanaged
+        os.makedirs(root, exist_ok=True)
+
+    @contextmanager
+    def _locked(self, size: str):
+        """Exclusive per-size lock shared by every pod using this root."""
+        with open(os.path.join(self.root, f".{size}.lock"), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def resolve(self, size: str) -> str:
+        """Path of a verified model directory for `size`."""
+        path = os.path.join(self.root, size)
+        start = time.monotonic()
+
+        with self._locked(size):
+            if os.path.isdir(path):
+                if not os.path.exists(os.path.join(path, MANIFEST)):
+                    if self.adopt_unmanaged and os.path.exists(os.path.join(path, "model.bin")):
+                        logger.info(f"Adopting unmanaged model directory {path}")
+                        self._write_manifest(path, self._describe(path))
+                        return path
+                    if not self.allow_download:
+                        raise RuntimeError(
+                            f"Model directory {path} has no manifest; enable adopt_unmanaged to trust it"
+                        )
+                    logger.warning(f"Model {size} at {path} has no manifest, replacing it with a download")
+                    shutil.rmtree(path, ignore_errors=True)
+                elif self._is_valid(path):
+                    logger.info(f"Model {size} resolved from {path} in {time.monotonic() - start:.2f}s")
+                    return path
+                else:
+                    logger.warning(f"Model {size} at {path} failed verification, discarding it")
+                    shutil.rmtree(path, ignore_errors=True)
+
+            if not self.allow_download:
+                raise RuntimeError(f"Model {size} not found in {self.root} and downloads are disabled")
+
+            self._download(size, path)
+        logger.info(f"Model {size} downloaded to {path} in {time.monotonic() - start:.2f}s")
+        return path
+
+    def _is_valid(self, path: str) -> bool:
+        manifest_path = os.path.join(path, MANIFEST)
+        try:
+            with open(manifest_path) as f:
+                files: Dict[str, dict] = json.load(f)['files']
+        except (OSError, ValueError, KeyError):
+            return False
+        if not files or self.verify == "none":
+            return bool(files)
+
+        changed = False
+        for name, expected in files.items():
+            file_path = os.path.join(path, name)
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                return False
+            if stat.st_size != expected['size']:
+                return False
+
+            if self.verify == "stat" and stat.st_mtime_ns == expected.get('mtime_ns'):
+                continue
+            if _sha256(file_path) != expected['sha256']:
+                logger.error(f"Checksum mismatch for {file_path}")
+                return False
+            if stat.st_mtime_ns != expected.get('mtime_ns'):
+                expected['mtime_ns'] = stat.st_mtime_ns
+                changed = True
+
+        if changed:
+            # Files were touched but are intact; record the new mtimes so the next stat check is cheap
+            self._write_manifest(path, files)
+        return True
+
+    def _download(self, size: str, path: str) -> None:
+        from faster_whisper.utils import download_model
+
+        # Download next to the final location and rename, so a crash never leaves a half-written model
+        staging = tempfile.mkdtemp(prefix=f".{size}-", dir=self.root)
+        try:
+            download_model(size, output_dir=staging)
+            if not os.path.exists(os.path.join(staging, "model.bin")):
+                raise RuntimeError(f"Download of model {size} produced no model.bin")
+            self._write_manifest(staging, self._describe(staging))
+            try:
+                os.replace(staging, path)
+            except OSError:
+                # Someone outside the lock (e.g. an older worker) got there first; theirs is as good
+                if not self._is_valid(path):
+                    raise
+                logger.info(f"Model {size} appeared at {path} during download, using it")
+                shutil.rmtree(staging, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def _describe(path: str) -> Dict[str, dict]:
+        files = {}
+        for entry in os.scandir(path):
+            if entry.is_file() and entry.name != MANIFEST:
+                stat = entry.stat()
+                files[entry.name] = {
+                    'sha256': _sha256(entry.path),
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns
+                }
+        return files
+
+    @staticmethod
+    def _write_manifest(path: str, files: Dict[str, dict]) -> None:
+        tmp_path = os.path.join(path, MANIFEST + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({'files': files, 'created_at': time.time()}, f, indent=2)
+        os.replace(tmp_path, os.path.join(path, MANIFEST))
+
+
+def main(argv: Optional[list] = None) -> None:
+    """Seed a model store: python -m utils.model_store <root> <size> [<size> ...]"""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        print(main.__doc__)
+        sys.exit(2)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = ModelStore(argv[0], verify="full")
+    for size in argv[1:]:
+        print(store.resolve(size))
+
+
+if __name__ == "__main__":
+    main()
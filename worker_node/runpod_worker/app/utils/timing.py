@@ -0,0 +1,49 @@
+# file: utils/timing.py
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict
+
+
+class SpanRecorder:
+    """Per-task stage timings on the monotonic clock.
+
+    Each span records when it started (seconds since the recorder was
+    created) and how long it took; repeated spans with the same name add up.
+    Scalar facts such as audio duration or byte counts are kept alongside.
+    """
+
+    def __init__(self, origin: float = None):
+        # `origin` (a time.monotonic() value) lets a recorder start before it is created
+        self._origin = origin if origin is not None else time.monotonic()
+        self._spans: Dict[str, Dict[str, float]] = {}
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(name, time.monotonic() - start, start)
+
+    def add(self, name: str, seconds: float, started_at: float = None) -> None:
+        """Record a span measured elsewhere (`started_at` is a time.monotonic() value)."""
+        offset = (started_at if started_at is not None else time.monotonic() - seconds) - self._origin
+        with self._lock:
+            span = self._spans.setdefault(name, {'start': round(offset, 3), 'seconds': 0.0})
+            span['seconds'] = round(span['seconds'] + seconds, 3)
+
+    def record(self, **values) -> None:
+        with self._lock:
+            self._values.update(values)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'total_seconds': round(time.monotonic() - self._origin, 3),
+                'spans': {name: dict(span) for name, span in self._spans.items()},
+                **self._values
+            }
@@ -0,0 +1,254 @@
+# file: utils/transcriber.py
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, NamedTuple, Optional, Sequence, Union
+
+from utils.audio_probe import probe_duration
+from utils.chunking import plan_chunks, stitch_segments
+from utils.timing import SpanRecorder
+from utils.vad import VoiceActivityDetector, SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+# progress(audio_seconds_processed, segments_emitted)
+ProgressCallback = Callable[[float, int], None]
+# should_stop() -> True to interrupt inference at the next completed segment
+StopCallback = Callable[[], bool]
+
+
+class TranscriptionInterrupted(Exception):
+    """Inference stopped early; `segments` cover the audio up to `resume_from` seconds."""
+
+    def __init__(self, segments: List[dict], resume_from: float):
+        super().__init__(f"Transcription interrupted at {resume_from:.2f}s")
+        self.segments = segments
+        self.resume_from = resume_from
+
+
+class TranscriptionResult(NamedTuple):
+    text: str
+    # {'start', 'end', 'text', 'avg_logprob', 'no_speech_prob'[, 'words']} in seconds from the start of the file
+    segments: List[dict]
+    audio_seconds: float
+    skipped_seconds: float
+    silent: bool
+
+
+class Transcriber:
+    """Decode, VAD pre-filter and (optionally chunked) inference for one audio file.
+
+    Shared by AudioTranscriptionWorker and the benchmark so both exercise the
+    same code path. Models come from a ModelManager.
+    """
+
+    def __init__(self, model_manager, vad: Optional[VoiceActivityDetector] = None,
+                 language: str = "en", long_audio_enabled: bool = True,
+                 long_audio_min_seconds: float = 180, chunk_min_seconds: float = 30,
+                 chunk_max_seconds: float = 60, overlap_seconds: float = 1.0,
+                 workers: int = 2, word_timestamps: bool = False):
+        self.model_manager = model_manager
+        self.vad = vad
+        self.language = language
+        self.long_audio_enabled = long_audio_enabled
+        self.long_audio_min_seconds = long_audio_min_seconds
+        self.chunk_min_seconds = chunk_min_seconds
+        self.chunk_max_seconds = chunk_max_seconds
+        self.overlap_seconds = overlap_seconds
+        self.workers = workers
+        self.word_timestamps = word_timestamps
+
+        self.vad_stats = {
+            'clips': 0,
+            'silent_clips': 0,
+            'audio_seconds': 0.0,
+            'skipped_seconds': 0.0
+        }
+        self._stats_lock = threading.Lock()
+
+    def transcribe(self, audio_path: str, size: str, compute_type: str, device: str,
+                   beam_size: int = 1, temperature: Optional[Union[float, Sequence[float]]] = None,
+                   progress: Optional[ProgressCallback] = None,
+                   timings: Optional[SpanRecorder] = None, start_seconds: float = 0.0,
+                   should_stop: Optional[StopCallback] = None) -> TranscriptionResult:
+        """Transcribe `audio_path` with the given model. Raises on failure.
+
+        `temperature` is passed to faster-whisper as-is (a sequence enables
+        temperature fallback); None keeps the library default. When `timings`
+        is given, decode, vad, model_load and inference spans are recorded.
+
+        `start_seconds` skips the beginning of the file (resuming a
+        checkpoint); segment timestamps stay relative to the whole file. When
+        `should_stop` returns True inference stops after the current segment
+        (or chunk) and TranscriptionInterrupted carries what was completed.
+        """
+        timings = timings or SpanRecorder()
+        decode_options = {'language': self.language, 'beam_size': beam_size}
+        if self.word_timestamps:
+            decode_options['word_timestamps'] = True
+        if temperature is not None:
+            decode_options['temperature'] = temperature
+
+        # Drop silent clips and trim leading/trailing silence before inference
+        audio, offset, skipped = self.prefilter(audio_path, timings=timings, start_seconds=start_seconds)
+        if audio is not None and audio.size == 0:
+            return TranscriptionResult("", [], start_seconds + skipped, skipped, True)
+
+        with timings.span('model_load'):
+            model = self.model_manager.get(size, compute_type, device)
+
+        duration = len(audio) / SAMPLE_RATE if audio is not None else (probe_duration(audio_path) or 0.0)
+
+        # Long recordings are split at silences and transcribed in parallel
+        if self.long_audio_enabled and duration >= self.long_audio_min_seconds:
+            if audio is None:
+                from faster_whisper import decode_audio
+                with timings.span('decode'):
+                    audio = decode_audio(audio_path, sampling_rate=SAMPLE_RATE)
+            with timings.span('inference'):
+                segments = self._transcribe_chunked(model, audio, offset, decode_options, progress, should_stop)
+        else:
+            with timings.span('inference'):
+                # Segment timestamps are relative to the trimmed audio (offset seconds in)
+                raw_segments, _ = model.transcribe(audio if audio is not None else audio_path, **decode_options)
+
+                # Segments are decoded lazily; report progress as each one arrives
+                segments = []
+                for segment in raw_segments:
+                    segments.append(self._segment_dict(segment, offset))
+                    if progress:
+                        progress(offset + segment.end, len(segments))
+                    if should_stop and should_stop():
+                        raise TranscriptionInterrupted(segments, offset + segment.end)
+
+        text = "".join(segment['text'] for segment in segments)
+        return TranscriptionResult(text, segments, start_seconds + duration + skipped, skipped, False)
+
+    def prefilter(self, audio_path: str, trim: bool = True, timings: Optional[SpanRecorder] = None,
+                  start_seconds: float = 0.0):
+        """Decode the clip (from `start_seconds` on) and run the VAD pre-filter.
+
+        Returns ``(audio, offset, skipped_seconds)``: the (optionally trimmed)
+        samples and the position in seconds where they start, an empty array
+        for a fully silent clip, or None when VAD is disabled or decoding
+        failed, in which case the caller transcribes the file as-is.
+        """
+        if not self.vad and not start_seconds:
+            return None, 0.0, 0.0
+        timings = timings or SpanRecorder()
+
+        try:
+            from faster_whisper import decode_audio
+            with timings.span('decode'):
+                audio = decode_audio(audio_path, sampling_rate=SAMPLE_RATE)
+        except Exception as e:
+            if start_seconds:
+                raise
+            logger.warning(f"VAD decode failed, transcribing without pre-filter: {str(e)}")
+            return None, 0.0, 0.0
+
+        if start_seconds:
+            audio = audio[int(start_seconds * SAMPLE_RATE):]
+        if not self.vad:
+            return audio, start_seconds, 0.0
+
+        with timings.span('vad'):
+            result = self.vad.analyze(audio)
+        skipped = result.skipped_seconds if (trim or result.is_silent) else 0.0
+
+        with self._stats_lock:
+            self.vad_stats['clips'] += 1
+            self.vad_stats['silent_clips'] += int(result.is_silent)
+            self.vad_stats['audio_seconds'] = round(self.vad_stats['audio_seconds'] + result.duration, 3)
+            self.vad_stats['skipped_seconds'] = round(self.vad_stats['skipped_seconds'] + skipped, 3)
+
+        filename = os.path.basename(audio_path)
+        if result.is_silent:
+            logger.info(f"VAD: {filename} is silent, skipped {result.duration:.2f}s without inference")
+            return audio[:0], start_seconds, skipped
+
+        if not trim:
+            return audio, start_seconds, 0.0
+
+        logger.info(f"VAD: trimmed {skipped:.2f}s of {result.duration:.2f}s silence from {filename}")
+        return self.vad.trim(audio, result), start_seconds + result.speech_start, skipped
+
+    def _transcribe_chunked(self, model, audio, offset: float, decode_options: dict,
+                            progress: Optional[ProgressCallback],
+                            should_stop: Optional[StopCallback] = None) -> List[dict]:
+        """Transcribe a long recording as parallel chunks cut at silence, then stitch."""
+        chunks = plan_chunks(
+            audio,
+            self.vad or VoiceActivityDetector(),
+            min_seconds=self.chunk_min_seconds,
+            max_seconds=self.chunk_max_seconds,
+            overlap_seconds=self.overlap_seconds
+        )
+        logger.info(
+            f"Long audio ({len(audio) / SAMPLE_RATE:.1f}s): transcribing {len(chunks)} chunks "
+            f"with {self.workers} workers"
+        )
+
+        def transcribe_chunk(chunk):
+            samples = audio[int(chunk.start * SAMPLE_RATE):int(chunk.end * SAMPLE_RATE)]
+            segments, _ = model.transcribe(samples, **decode_options)
+            return [self._segment_dict(segment, offset + chunk.start) for segment in segments]
+
+        completed = {}
+        processed = 0.0
+        emitted = 0
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            futures = {executor.submit(transcribe_chunk, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                segments = future.result()
+                completed[chunk] = segments
+                processed += chunk.own_end - chunk.own_start
+                emitted += len(segments)
+                if progress:
+                    progress(processed, emitted)
+                if should_stop and should_stop() and len(completed) < len(chunks):
+                    # Only the leading run of finished chunks is usable for a resume
+                    prefix = []
+                    for planned in chunks:
+                        if planned not in completed:
+                            break
+                        prefix.append(planned)
+                    resume_from = offset + (prefix[-1].own_end if prefix else chunks[0].own_start)
+                    raise TranscriptionInterrupted(self._stitch(prefix, completed, offset), resume_from)
+        finally:
+            # Do not wait for chunks still decoding when interrupted
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return self._stitch(chunks, completed, offset)
+
+    @staticmethod
+    def _stitch(chunks, completed, offset: float) -> List[dict]:
+        return stitch_segments([
+            (chunk._replace(own_start=offset + chunk.own_start, own_end=offset + chunk.own_end), completed[chunk])
+            for chunk in chunks
+        ])
+
+    def _segment_dict(self, segment, shift: float) -> dict:
+        """Plain dict for a faster-whisper segment, with timestamps moved `shift` seconds later."""
+        entry = {
+            'start': shift + segment.start,
+            'end': shift + segment.end,
+            'text': segment.text,
+            'avg_logprob': segment.avg_logprob,
+            'no_speech_prob': segment.no_speech_prob
+        }
+        if self.word_timestamps and segment.words:
+            entry['words'] = [
+                {
+                    'start': shift + word.start,
+                    'end': shift + word.end,
+                    'word': word.word,
+                    'probability': word.probability
+                }
+                for word in segment.words
+            ]
+        return entry
@@ -0,0 +1,190 @@
+# file: utils/transcription_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def content_hash(file_path: str) -> str:
+    """BLAKE2b digest of the raw file bytes."""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CachedTranscript(NamedTuple):
+    text: str
+    segments: Optional[List[Dict[str, Any]]]  # None for entries stored without segments
+
+
+class TranscriptionCache:
+    """Content-addressed transcript cache with a local disk tier and an optional S3 tier.
+
+    Entries are keyed by the BLAKE2b hash of the audio bytes plus a variant
+    string describing the model settings, so identical audio transcribed
+    with the same model returns its stored transcript. The local tier is
+    bounded by ``max_bytes`` and evicts least recently used entries; hits
+    refresh an entry's mtime. Shared-tier hits are copied to the local tier.
+    Segments, when stored, live in the same entry as the text, so they are
+    looked up, counted and evicted together with it.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024,
+                 shared_bucket: Optional[str] = None, shared_prefix: str = "transcription-cache/",
+                 region: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.shared_bucket = shared_bucket
+        self.shared_prefix = shared_prefix
+        self._s3 = None
+        if shared_bucket:
+            import boto3
+            self._s3 = boto3.client('s3', region_name=region)
+
+        self._lock = threading.Lock()
+        self._stats = {
+            'local_hits': 0,
+            'shared_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+        }
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(entry.stat().st_size for entry in self._entries())
+
+    def key_for(self, file_path: str, variant: str) -> str:
+        """Cache key for a local audio file transcribed with the given model variant."""
+        variant_digest = hashlib.blake2b(variant.encode('utf-8'), digest_size=8).hexdigest()
+        return f"{content_hash(file_path)}-{variant_digest}"
+
+    def get(self, key: str) -> Optional[CachedTranscript]:
+        """Return the cached transcript (and segments, if stored) for `key`, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)  # mark as recently used
+            self._count('local_hits')
+            return CachedTranscript(entry['text'], entry.get('segments'))
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, OSError) as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            self._remove(path)
+
+        cached = self._get_shared(key)
+        if cached is not None:
+            self._count('shared_hits')
+            self._put_local(key, cached.text, cached.segments)
+            return cached
+
+        self._count('misses')
+        return None
+
+    def put(self, key: str, text: str, segments: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Store a transcript (and optionally its segments) in the local tier and, if configured, the shared tier."""
+        self._put_local(key, text, segments)
+        if self._s3:
+            try:
+                self._s3.put_object(
+                    Bucket=self.shared_bucket,
+                    Key=f"{self.shared_prefix}{key}.json",
+                    Body=json.dumps(self._entry(text, segments)).encode('utf-8'),
+                    ContentType='application/json'
+                )
+            except Exception as e:
+                logger.warning(f"Failed to write shared cache entry {key}: {e}")
+        self._count('stores')
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['local_bytes'] = self._total_bytes
+        lookups = stats['local_hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_rate'] = round((lookups - stats['misses']) / lookups, 4) if lookups else None
+        return stats
+
+    def _get_shared(self, key: str) -> Optional[CachedTranscript]:
+        if not self._s3:
+            return None
+        try:
+            response = self._s3.get_object(
+                Bucket=self.shared_bucket,
+                Key=f"{self.shared_prefix}{key}.json"
+            )
+            entry = json.loads(response['Body'].read())
+            return CachedTranscript(entry['text'], entry.get('segments'))
+        except self._s3.exceptions.NoSuchKey:
+            return None
+        except Exception as e:
+            logger.warning(f"Shared cache lookup failed for {key}: {e}")
+            return None
+
+    @staticmethod
+    def _entry(text: str, segments: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        entry = {'text': text}
+        if segments is not None:
+            entry['segments'] = segments
+        return entry
+
+    def _put_local(self, key: str, text: str, segments: Optional[List[Dict[str, Any]]] = None) -> None:
+        path = self._path(key)
+        data = json.dumps(dict(self._entry(text, segments), created_at=time.time())).encode('utf-8')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write then rename so concurrent readers never see a partial entry
+        tmp_path = f"{path}.tmp{threading.get_ident()}"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._total_bytes += len(data) - previous
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the local tier fits `max_bytes`."""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            with self._lock:
+                if self._total_bytes <= self.max_bytes:
+                    return
+            self._remove(entry.path)
+            self._count('evictions')
+
+    def _remove(self, path: str) -> None:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._total_bytes -= size
+
+    def _entries(self):
+        for shard in os.scandir(self.cache_dir):
+            if shard.is_dir():
+                for entry in os.scandir(shard.path):
+                    if entry.name.endswith('.json'):
+                        yield entry
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
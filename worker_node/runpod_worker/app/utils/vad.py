@@ -0,0 +1,150 @@
+# file: utils/vad.py
+
+import logging
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+
+def _runs(mask: np.ndarray):
+    """Start and end (exclusive) frame indices of each run of True in `mask`."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+class VadResult(NamedTuple):
+    """Speech region found in a clip, in seconds."""
+    duration: float
+    speech_start: float
+    speech_end: float
+
+    @property
+    def is_silent(self) -> bool:
+        return self.speech_end <= self.speech_start
+
+    @property
+    def skipped_seconds(self) -> float:
+        if self.is_silent:
+            return self.duration
+        return self.speech_start + (self.duration - self.speech_end)
+
+
+class VoiceActivityDetector:
+    """Fast pre-filter that finds the speech region of a 16 kHz mono clip.
+
+    The default ``energy`` backend frames the signal and computes per-frame RMS
+    in dBFS. Whether a clip has speech at all is decided by the absolute
+    ``threshold_db`` only: steady or noisy content never rises far above its
+    own noise floor, so a relative test would discard it. The noise floor is
+    only used to trim leading and trailing silence: where frames clear it by
+    ``margin_db``, the region is cut back to them, extended over adjacent
+    frames still ``margin_db / 2`` above the floor (so content hovering near
+    the margin is not cut). The ``silero`` backend uses the Silero model bundled with
+    faster-whisper and falls back to the energy backend if it is unavailable.
+    """
+
+    def __init__(self, backend: str = "energy", threshold_db: float = -45.0,
+                 margin_db: float = 10.0, frame_ms: int = 30,
+                 min_speech_ms: int = 250, max_gap_ms: int = 300, padding_ms: int = 300,
+                 sample_rate: int = SAMPLE_RATE):
+        self.backend = backend
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.frame_len = max(1, int(sample_rate * frame_ms / 1000))
+        self.min_speech_frames = max(1, int(min_speech_ms / frame_ms))
+        self.max_gap_frames = int(max_gap_ms / frame_ms)
+        self.padding = int(sample_rate * padding_ms / 1000)
+        self.sample_rate = sample_rate
+
+    def analyze(self, audio: np.ndarray) -> VadResult:
+        """Return the padded speech region of `audio` (float32 samples in [-1, 1])."""
+        duration = len(audio) / self.sample_rate
+        region = None
+
+        if self.backend == "silero":
+            region = self._silero_region(audio)
+        if region is None:
+            region = self._energy_region(audio)
+        if region is None or region[1] <= region[0]:
+            return VadResult(duration, 0.0, 0.0)
+
+        start = max(0, region[0] - self.padding)
+        end = min(len(audio), region[1] + self.padding)
+        return VadResult(duration, start / self.sample_rate, end / self.sample_rate)
+
+    def trim(self, audio: np.ndarray, result: VadResult) -> np.ndarray:
+        """Slice `audio` down to the speech region of `result`."""
+        start = int(result.speech_start * self.sample_rate)
+        end = int(result.speech_end * self.sample_rate)
+        return audio[start:end]
+
+    def speech_mask(self, audio: np.ndarray, relative: bool = True) -> np.ndarray:
+        """Boolean speech flag per frame of `frame_len` samples (energy backend).
+
+        With `relative`, frames must also clear the clip's noise floor by
+        ``margin_db``, which separates pauses from speech (used to place
+        chunk cuts); otherwise only the absolute threshold applies.
+        """
+        energy_db = self._energy_db(audio)
+        return self._smooth(energy_db > self._threshold(energy_db, relative))
+
+    def _energy_db(self, audio: np.ndarray) -> np.ndarray:
+        n_frames = len(audio) // self.frame_len
+        frames = audio[:n_frames * self.frame_len].reshape(n_frames, self.frame_len)
+        return 10.0 * np.log10(np.mean(np.square(frames, dtype=np.float32), axis=1) + 1e-10)
+
+    def _threshold(self, energy_db: np.ndarray, relative: bool, margin_db: Optional[float] = None) -> float:
+        if not relative or energy_db.size == 0:
+            return self.threshold_db
+        noise_floor = float(np.percentile(energy_db, 5))
+        return max(self.threshold_db, noise_floor + (self.margin_db if margin_db is None else margin_db))
+
+    def _smooth(self, mask: np.ndarray) -> np.ndarray:
+        if not mask.any():
+            return mask
+
+        # Bridge short dips between syllables, then drop short runs (clicks, pops)
+        starts, ends = _runs(mask)
+        for gap_start, gap_end in zip(ends[:-1], starts[1:]):
+            if gap_end - gap_start <= self.max_gap_frames:
+                mask[gap_start:gap_end] = True
+        for run_start, run_end in zip(*_runs(mask)):
+            if run_end - run_start < self.min_speech_frames:
+                mask[run_start:run_end] = False
+        return mask
+
+    def _energy_region(self, audio: np.ndarray) -> tuple:
+        energy_db = self._energy_db(audio)
+        speech = np.flatnonzero(self._smooth(energy_db > self.threshold_db))
+        if speech.size == 0:
+            return 0, 0
+
+        # The noise floor only tightens the edges; without enough contrast keep the whole span
+        contrasted = np.flatnonzero(self._smooth(energy_db > self._threshold(energy_db, relative=True)))
+        if contrasted.size == 0:
+            return int(speech[0]) * self.frame_len, (int(speech[-1]) + 1) * self.frame_len
+
+        sustained = self._smooth(energy_db > self._threshold(energy_db, relative=True, margin_db=self.margin_db / 2))
+        starts, ends = _runs(sustained)
+        first, last = int(contrasted[0]), int(contrasted[-1])
+        start = max([int(s) for s in starts if s <= first], default=first)
+        end = min([int(e) for e in ends if e > last], default=last + 1)
+        return start * self.frame_len, end * self.frame_len
+
+    def _silero_region(self, audio: np.ndarray) -> Optional[tuple]:
+        try:
+            from faster_whisper.vad import VadOptions, get_speech_timestamps
+        except ImportError:
+            logger.warning("Silero VAD not available, using energy VAD")
+            self.backend = "energy"
+            return None
+
+        timestamps = get_speech_timestamps(audio, VadOptions())
+        if not timestamps:
+            # Silero found nothing; report silence rather than second-guessing it
+            return 0, 0
+        return timestamps[0]['start'], timestamps[-1]['end']
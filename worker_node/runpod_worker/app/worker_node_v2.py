@@ -1,4 +1,9 @@
+import time
+# Taken before the remaining imports so the startup timeline includes them
+PROCESS_START = time.monotonic()
+
 import boto3
+import importlib.util
 import json
 import logging
 import os
@@ -7,16 +12,26 @@ import sys
 import signal
 import subprocess
 import threading
-import time
 import traceback
-import torch
-import time
 import uuid
 import yaml
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeout
+from functools import partial
 from typing import Dict, Any, Optional
 from urllib.parse import unquote
-from functools import lru_cache
+
+from utils.adaptive_decoding import AdaptiveDecodingController, DecodingDecision
+from utils.artifacts import FORMATS as ARTIFACT_FORMATS, build_artifact, render as render_artifact
+from utils.audio_probe import probe_duration
+from utils.device import cuda_available, cuda_device_name
+from utils.http_client import HttpClient
+from utils.model_manager import ModelManager
+from utils.model_store import ModelStore
+from utils.timing import SpanRecorder
+from utils.transcriber import Transcriber, TranscriptionInterrupted, TranscriptionResult
+from utils.transcription_cache import TranscriptionCache
+from utils.vad import VoiceActivityDetector
 
 # Enhanced logging configuration
 logging.basicConfig(
@@ -29,6 +44,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Spans of deliveries that finish after the task is reported Completed
+BACKGROUND_SPANS = ('result_send', 'artifacts')
+
 def get_node_identifier():
     """Get a unique identifier for this worker node."""
     try:
@@ -54,31 +72,108 @@ class AudioTranscriptionWorker:
     def __init__(self):
         """Initialize the Audio Transcription Worker"""
         self.logger = logging.getLogger(__name__)
-        self.model = None  # Initialize model variable
+        self.device = "cpu"
+
+        # Startup timeline, measured from interpreter start, to track time-to-first-task
+        self.startup = SpanRecorder(origin=PROCESS_START)
+        self.startup.add('imports', time.monotonic() - PROCESS_START, PROCESS_START)
+        self._first_task_seen = False
 
         # Initialize configuration
         try:
-            self.config = GlobalConfig.get_instance()
+            with self.startup.span('config'):
+                self.config = GlobalConfig.get_instance()
             self.logger.info("Worker initialized with configuration")
 
+            # Keep-alive connection pools shared by every outbound call
+            self.http = HttpClient(
+                pool_connections=self.config.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=self.config.HTTP_POOL_MAXSIZE,
+                max_retries=self.config.HTTP_MAX_RETRIES,
+                backoff_factor=self.config.HTTP_BACKOFF_FACTOR
+            )
+
             self.status_manager = WorkerStatusManager(
                 self.config.WORKER_ID,
                 self.config.ORCHESTRATOR_URL,
                 self.config.API_TOKEN,
-                self.config
+                self.config,
+                http_client=self.http
             )
 
-            if not self.status_manager.register():
+            with self.startup.span('register'):
+                registered = self.status_manager.register()
+            if not registered:
                 raise SystemExit("Failed to register worker")
+            self.status_manager.start_heartbeat_thread()
 
             # Initialize audio duration handler
             self.duration_handler = AudioDurationHandler(self.logger)
 
+            # Verified local/volume copies of model weights, so fresh pods skip the hub
+            self.model_store = None
+            if self.config.MODEL_STORE_ENABLED:
+                self.model_store = ModelStore(
+                    self.config.MODEL_STORE_DIR,
+                    verify=self.config.MODEL_STORE_VERIFY,
+                    allow_download=self.config.MODEL_STORE_ALLOW_DOWNLOAD,
+                    adopt_unmanaged=self.config.MODEL_STORE_ADOPT_UNMANAGED
+                )
+
+            # LRU cache of loaded Whisper models; num_workers lets
+            # long-audio chunks run concurrently on one model
+            self.model_manager = ModelManager(
+                max_models=self.config.MODEL_CACHE_MAX_MODELS,
+                memory_budget_mb=self.config.MODEL_CACHE_MEMORY_MB,
+                num_workers=self.config.LONG_AUDIO_WORKERS if self.config.LONG_AUDIO_ENABLED else 1,
+                model_resolver=self.model_store.resolve if self.model_store else None
+            )
+
+            # Decode -> VAD -> (chunked) inference pipeline
+            self.transcriber = build_transcriber(self.config, self.model_manager)
+            self.status_manager.metrics['vad'] = self.transcriber.vad_stats
+
+            # Beam size / temperature / model tier chosen per task from backlog and age
+            self.decoding_controller = AdaptiveDecodingController(
+                tiers=self.config.ADAPTIVE_TIERS,
+                backlog_low=self.config.ADAPTIVE_BACKLOG_LOW,
+                backlog_high=self.config.ADAPTIVE_BACKLOG_HIGH,
+                age_low_seconds=self.config.ADAPTIVE_AGE_LOW_SECONDS,
+                age_high_seconds=self.config.ADAPTIVE_AGE_HIGH_SECONDS
+            )
+
+            # Content-addressed cache so identical audio is transcribed once
+            self.transcription_cache = None
+            if self.config.CACHE_ENABLED:
+                self.transcription_cache = TranscriptionCache(
+                    self.config.CACHE_DIR,
+                    max_bytes=self.config.CACHE_MAX_BYTES,
+                    shared_bucket=self.config.CACHE_SHARED_BUCKET,
+                    shared_prefix=self.config.CACHE_SHARED_PREFIX,
+                    region=self.config.AWS_REGION
+                )
+
+            # Async client for the local faster-whisper server; several tasks share it
+            self.api_client = None
+            if self.config.USE_API_FOR_TRANSCRIPTION:
+                from utils.api_client import AsyncTranscriptionClient
+                self.api_client = AsyncTranscriptionClient(
+                    self.config.LOCAL_API_URL,
+                    max_in_flight=self.config.API_MAX_IN_FLIGHT,
+                    timeout=self.config.TRANSCRIPTION_TIMEOUT
+                )
+
+            # Result delivery (orchestrator post, S3 transcript, artifacts) runs on
+            # this pool so the calls overlap instead of queueing behind each other
+            task_slots = self.config.API_MAX_IN_FLIGHT if self.api_client else 1
+            self.fanout = ThreadPoolExecutor(max_workers=3 * task_slots, thread_name_prefix="fanout")
+
         except Exception as e:
             self.logger.error(f"Failed to initialize configuration: {e}")
             raise
 
         self.keep_running = True
+        self._drain_deadline = None  # monotonic time by which in-flight work must stop
 
         # Check dependencies before proceeding
         if not self.check_dependencies():
@@ -89,40 +184,116 @@ class AudioTranscriptionWorker:
         # Pre-load the model during worker initialization if not using API
         if not self.config.USE_API_FOR_TRANSCRIPTION:
             self._initialize_model()
-            self._warmup_model()
+
+        self._log_startup_timeline()
+
+    def _log_startup_timeline(self) -> None:
+        """Log how long each startup stage took and report it with heartbeats."""
+        timeline = self.startup.as_dict()
+        self.status_manager.metrics['startup'] = timeline
+        stages = ", ".join(f"{name}={span['seconds']:.2f}s" for name, span in timeline['spans'].items())
+        self.logger.info(f"Startup timeline: ready in {timeline['total_seconds']:.2f}s ({stages})")
 
     def _initialize_model(self):
-        """Initialize the Whisper model with proper error handling."""
+        """Pre-load the configured default model into the model cache."""
         try:
-            from faster_whisper import WhisperModel
-            import torch
-
             # First try CUDA if preferred
-            if self.config.PREFER_CUDA and torch.cuda.is_available():
+            if self.config.PREFER_CUDA and cuda_available():
                 try:
-                    self.model = WhisperModel(
-                        self.config.MODEL_SIZE,
-                        device="cuda",
-                        compute_type="float16"
-                    )
+                    self.device = "cuda"
+                    with self.startup.span('model_load'):
+                        model = self.model_manager.preload(
+                            self.config.MODEL_SIZE, self._default_compute_type(), self.device
+                        )
                     self.logger.info(f"Successfully pre-loaded Whisper model on CUDA")
+                    with self.startup.span('warmup'):
+                        self._warmup_model(model)
                     return
                 except RuntimeError as e:
                     self.logger.error(f"CUDA initialization failed: {e}. Falling back to CPU.")
 
             # Fall back to CPU if CUDA fails or isn't preferred
-            self.model = WhisperModel(
-                self.config.MODEL_SIZE,
-                device="cpu",
-                compute_type="int8"
-            )
+            self.device = "cpu"
+            with self.startup.span('model_load'):
+                model = self.model_manager.preload(
+                    self.config.MODEL_SIZE, self._default_compute_type(), self.device
+                )
             self.logger.info("Successfully pre-loaded Whisper model on CPU")
+            with self.startup.span('warmup'):
+                self._warmup_model(model)
 
         except Exception as e:
             self.logger.error(f"Failed to initialize Whisper model: {str(e)}")
             raise SystemExit("Cannot start worker without functioning model")
 
-    def _warmup_model(self):
+    def _default_compute_type(self, device: Optional[str] = None) -> str:
+        """Configured compute type, downgraded to int8 on CPU where float16 is unsupported."""
+        return self._compute_type_for_device(self.config.COMPUTE_TYPE, device)
+
+    def _compute_type_for_device(self, compute_type: str, device: Optional[str] = None) -> str:
+        """`compute_type`, downgraded to int8 on CPU where float16 is unsupported."""
+        device = device or self.device
+        if device == "cpu" and compute_type in ("float16", "int8_float16"):
+            return "int8"
+        return compute_type
+
+    def _resolve_model_spec(self, task: Optional[Dict[str, Any]] = None,
+                            decision: Optional[DecodingDecision] = None):
+        """Resolve the (size, compute_type) a task asked for via `model_size` / `compute_type`, or the default.
+
+        Without an explicit `model_size`, the decoding tier's model (if any) replaces the default.
+        """
+        size = self.config.MODEL_SIZE
+        compute_type = self._default_compute_type()
+
+        if decision and decision.model_size:
+            if decision.model_size in self.config.MODEL_ALLOWED_SIZES:
+                size = decision.model_size
+            else:
+                self.logger.warning(
+                    f"Decoding tier '{decision.tier}' model '{decision.model_size}' "
+                    f"is not in allowed_sizes, using {size}"
+                )
+
+        if task:
+            requested_size = task.get('model_size')
+            if requested_size:
+                if requested_size in self.config.MODEL_ALLOWED_SIZES:
+                    size = requested_size
+                else:
+                    self.logger.warning(
+                        f"Task {task.get('task_id')} requested unsupported model "
+                        f"'{requested_size}', using {size}"
+                    )
+            requested_compute = task.get('compute_type')
+            if requested_compute:
+                if requested_compute in self.config.MODEL_ALLOWED_COMPUTE_TYPES:
+                    compute_type = self._compute_type_for_device(requested_compute)
+                else:
+                    self.logger.warning(
+                        f"Task {task.get('task_id')} requested unsupported compute type "
+                        f"'{requested_compute}', using {compute_type}"
+                    )
+
+        return size, compute_type
+
+    def _cache_variant(self, task: Dict[str, Any], decision: Optional[DecodingDecision] = None) -> str:
+        """Describe the settings a transcript depends on, so cache entries never cross models."""
+        if self.config.USE_API_FOR_TRANSCRIPTION:
+            return f"api:{self.config.LOCAL_API_URL}:en"
+        size, compute_type = self._resolve_model_spec(task, decision)
+        if not decision or decision.temperature is None:
+            return f"{size}:{compute_type}:en:beam{decision.beam_size if decision else 1}"
+        temperature = ",".join(str(t) for t in decision.temperature)
+        return f"{size}:{compute_type}:en:beam{decision.beam_size}:t{temperature}"
+
+    def _decide_decoding(self, task: Dict[str, Any]) -> DecodingDecision:
+        """Pick decoding settings from the backlog and task age reported by get-task."""
+        if not self.config.ADAPTIVE_DECODING_ENABLED:
+            return self.decoding_controller.baseline()
+        return self.decoding_controller.decide(task.get('queue_depth'), task.get('task_age_seconds'))
+
+    def _warmup_model(self, model):
         """Perform model warm-up with a small test transcription."""
         try:
             # Create a small test audio file or use a pre-existing one
@@ -140,7 +311,7 @@ class AudioTranscriptionWorker:
 
             # Perform warm-up transcription
             self.logger.info("Performing model warm-up...")
-            _, _ = self.model.transcribe(test_audio)
+            _, _ = model.transcribe(test_audio)
             self.logger.info("Model warm-up completed successfully")
 
             # Clean up test file
@@ -156,24 +327,19 @@ class AudioTranscriptionWorker:
         try:
             self.logger.info("Checking dependencies...")
 
-            # Check for faster-whisper
-            try:
-                import faster_whisper
+            # Check for faster-whisper without importing it (the import alone takes seconds)
+            if importlib.util.find_spec("faster_whisper") is not None:
                 self.logger.info("✓ faster-whisper found")
-            except ImportError:
+            else:
                 self.logger.error("✗ faster-whisper not found")
                 return False
 
-            # Check for torch
-            try:
-                import torch
-                if self.config.PREFER_CUDA and torch.cuda.is_available():
-                    self.logger.info(f"✓ CUDA available: {torch.cuda.get_device_name(0)}")
-                elif self.config.PREFER_CUDA:
+            # Check for CUDA (via CTranslate2 / nvidia-smi, no torch import)
+            if self.config.PREFER_CUDA and not self.config.USE_API_FOR_TRANSCRIPTION:
+                if cuda_available():
+                    self.logger.info(f"✓ CUDA available: {cuda_device_name() or 'unknown GPU'}")
+                else:
                     self.logger.warning("! CUDA not available - will use CPU")
-            except ImportError:
-                self.logger.error("✗ torch not found")
-                return False
 
             # Check for ffprobe
             result = subprocess.run(['which', 'ffprobe'], 
@@ -202,7 +368,7 @@ class AudioTranscriptionWorker:
                 'X-Worker-ID': self.config.WORKER_ID
             }
             
-            response = requests.get(
+            response = self.http.get(
                 f"{self.config.ORCHESTRATOR_URL}/get-task",
                 headers=headers,
                 timeout=self.config.API_TIMEOUT
@@ -224,7 +390,8 @@ class AudioTranscriptionWorker:
         self,
         task_id: str,
         status: str,
-        failure_reason: Optional[str] = None
+        failure_reason: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None
     ):
         """Update task status via orchestrator API."""
         try:
@@ -234,13 +401,15 @@ class AudioTranscriptionWorker:
             }
             if failure_reason:
                 data['failure_reason'] = failure_reason
+            if details:
+                data.update(details)
 
             headers = {
                 'Authorization': f"Bearer {self.config.API_TOKEN}",
                 'Content-Type': 'application/json'
             }
 
-            response = requests.post(
+            response = self.http.post(
                 f"{self.config.ORCHESTRATOR_URL}/update-task-status",
                 headers=headers,
                 json=data,
@@ -253,133 +422,349 @@ class AudioTranscriptionWorker:
         except Exception as e:
             self.logger.error(f"Error updating status: {str(e)}")
 
-    def process_task(self, task: Dict[str, Any]) -> bool:
+    def process_task(self, task: Dict[str, Any], timings: Optional[SpanRecorder] = None) -> bool:
         task_id = task['task_id']
+        timings = timings or SpanRecorder()
         encoded_key = task['object_key']
         presigned_get_url = task['presigned_get_url']
         presigned_put_url = task['presigned_put_url']
     
+        # Prefix with the task id so concurrent tasks never share a download path
         filename = os.path.basename(encoded_key)
-        local_audio_path = os.path.join(self.config.DOWNLOAD_FOLDER, filename)
+        local_audio_path = os.path.join(self.config.DOWNLOAD_FOLDER, f"{task_id}_{filename}")
+        http_before = self.http.stats()
     
         try:
+            # Leased tasks that have not started yet go straight back to the queue while draining
+            if not self.keep_running:
+                self.release_task(task_id, timings)
+                return False
+
             # Step 1: Download the audio file
-            if not self.download_file(presigned_get_url, local_audio_path):
-                self.update_task_status(task_id, "Failed", "Failed to download audio file")
+            with timings.span('download'):
+                downloaded = self.download_file(presigned_get_url, local_audio_path)
+            if not downloaded:
+                self._report_status(task_id, "Failed", timings, "Failed to download audio file")
                 return False
-    
-            # Step 2: Transcribe the audio file
-            if self.config.USE_API_FOR_TRANSCRIPTION:
-                transcription = self.transcribe_audio_via_api(local_audio_path)
-            else:
-                transcription = self.transcribe_audio(local_audio_path)
-                
-            if not transcription:
-                self.update_task_status(task_id, "Failed", "Failed to transcribe audio")
+
+            if not self.keep_running:
+                self.release_task(task_id, timings)
                 return False
-   
-            # Step 2.5: Send transcription result to orchestrator for real-time update**
-            if not self.send_transcription_result(task_id, transcription):
-                self.logger.warning(f"Transcription sent to orchestrator failed for task {task_id}")
 
-            # Step 3: Save transcription result to S3
+            # Heartbeat thread reports progress for this task from here on
+            audio_duration = self.get_audio_duration(local_audio_path)
+            timings.record(audio_duration=round(audio_duration, 3),
+                           download_bytes=os.path.getsize(local_audio_path))
+            self.status_manager.start_task(task_id, audio_duration)
+
+            # Step 1.5: Choose decoding settings for the current load
+            decision = None
+            if not self.config.USE_API_FOR_TRANSCRIPTION:
+                decision = self._decide_decoding(task)
+                self.status_manager.set_task_details(task_id, decoding=decision.as_dict())
+                self.logger.info(
+                    f"Task {task_id}: decoding tier '{decision.tier}' (beam={decision.beam_size}, "
+                    f"temperature={decision.as_dict()['temperature'] or 'default'}, model={decision.model_size or 'default'}) "
+                    f"for backlog={decision.backlog} age={decision.task_age}s"
+                )
+    
+            # Step 2: Return a cached transcript for audio we have seen before
+            cache_key = None
+            transcription = None
+            segments = None
+            if self.transcription_cache:
+                with timings.span('cache_lookup'):
+                    cache_key = self.transcription_cache.key_for(local_audio_path, self._cache_variant(task, decision))
+                    cached = self.transcription_cache.get(cache_key)
+                    if cached is not None:
+                        transcription, segments = cached
+                timings.record(cache_hit=transcription is not None)
+                if transcription is not None:
+                    self.logger.info(f"Transcription cache hit for task {task_id}")
+
+            # Step 2.1: Transcribe the audio file
+            if transcription is None:
+                if self.config.USE_API_FOR_TRANSCRIPTION:
+                    result = self.transcribe_audio_via_api(local_audio_path, timings)
+                else:
+                    result = self.transcribe_audio(local_audio_path, task, decision, timings)
+
+                if result is None:
+                    if self._drain_expired():
+                        # API mode cannot checkpoint; hand the task back whole
+                        self.release_task(task_id, timings)
+                    else:
+                        self._report_status(task_id, "Failed", timings, "Failed to transcribe audio")
+                    return False
+                transcription, segments = result.text, result.segments
+
+                if cache_key:
+                    self.transcription_cache.put(
+                        cache_key, transcription, segments if self.config.OUTPUT_ARTIFACTS else None
+                    )
+   
+            # Step 3: Deliver results concurrently. Only the durable S3 transcript write gates
+            # completion; the real-time orchestrator post and the artifact uploads finish in
+            # the background and are logged, not included in the status update
             self.logger.info(f"Uploading transcription for {task_id}")
-            if not self.upload_transcription_to_s3(presigned_put_url, transcription):
-                self.update_task_status(task_id, "Failed", "Failed to upload transcription to S3")
+            timings.record(upload_bytes=len(transcription.encode('utf-8')))
+            send_future = self.fanout.submit(
+                self._timed, timings, 'result_send', self.send_transcription_result, task_id, transcription
+            )
+            upload_future = self.fanout.submit(
+                self._timed, timings, 'upload', self.upload_transcription_to_s3, presigned_put_url, transcription
+            )
+            # Step 3.5: Segments / word timestamps JSON plus SRT and VTT, gzip-compressed
+            artifacts_future = None
+            if self.config.OUTPUT_ARTIFACTS and segments is not None:
+                artifacts_future = self.fanout.submit(
+                    self._timed, timings, 'artifacts', self.upload_artifacts,
+                    task, transcription, segments, audio_duration, timings
+                )
+
+            send_future.add_done_callback(partial(
+                self._log_background_delivery, task_id, timings, 'result_send',
+                "Transcription sent to orchestrator failed"
+            ))
+            if artifacts_future is not None:
+                artifacts_future.add_done_callback(partial(
+                    self._log_background_delivery, task_id, timings, 'artifacts',
+                    "Some transcript artifacts failed to upload"
+                ))
+
+            if not upload_future.result():
+                self._report_status(task_id, "Failed", timings, "Failed to upload transcription to S3")
                 return False
-    
-            # Step 4: Mark task as completed
-            self.update_task_status(task_id, "Completed")
+
+            # Step 4: Mark task as completed, recording the decoding settings used
+            details = {'decoding': decision.as_dict()} if decision else {}
+            self._report_status(task_id, "Completed", timings, **details)
             return True
         
+        except TranscriptionInterrupted as e:
+            # Drain deadline hit mid-inference: report what is done so another worker can resume
+            checkpoint = {'resume_from': round(e.resume_from, 3), 'segments': e.segments} if e.resume_from > 0 else None
+            self.release_task(task_id, timings, checkpoint)
+            return False
+
         except Exception as e:
             error_msg = str(e)
             self.logger.error(f"Error processing task {task_id}: {error_msg}")
-            self.update_task_status(task_id, "Failed", error_msg)
+            self._report_status(task_id, "Failed", timings, error_msg)
             return False
         finally:
+            self.status_manager.end_task(task_id)
+
             # Clean up the local audio file
             try:
                 if os.path.exists(local_audio_path):
                     os.remove(local_audio_path)
             except Exception as e:
                 self.logger.warning(f"Failed to clean up file {local_audio_path}: {str(e)}")
+            if not self.config.USE_API_FOR_TRANSCRIPTION:
+                self.status_manager.metrics['model_cache'] = self.model_manager.stats()
+                self.status_manager.metrics['adaptive_decoding'] = self.decoding_controller.stats()
+            if self.transcription_cache:
+                self.status_manager.metrics['transcription_cache'] = self.transcription_cache.stats()
+            if self.api_client:
+                self.status_manager.metrics['api_client'] = self.api_client.stats()
+            self._record_http_stats(task_id, http_before)
+
+    def _report_status(self, task_id: str, status: str, timings: SpanRecorder,
+                       failure_reason: Optional[str] = None, **details) -> None:
+        """Send the final status update with the task's per-stage timing breakdown attached."""
+        breakdown = timings.as_dict()
+        # Background deliveries may or may not have finished by now; keep the payload consistent
+        for span in BACKGROUND_SPANS:
+            breakdown['spans'].pop(span, None)
+        start = time.monotonic()
+        self.update_task_status(task_id, status, failure_reason, details=dict(details, timings=breakdown))
+        status_seconds = time.monotonic() - start
+
+        stages = ", ".join(f"{name}={span['seconds']:.2f}s" for name, span in breakdown['spans'].items())
+        self.logger.info(
+            f"Task {task_id} {status} in {breakdown['total_seconds']:.2f}s ({stages}, "
+            f"status_update={status_seconds:.2f}s)"
+        )
+
+    def _record_http_stats(self, task_id: str, before: Dict[str, Any]) -> None:
+        """Log per-task HTTP time and connection reuse from the shared client."""
+        after = self.http.stats()
+        self.status_manager.metrics['http'] = after
+        requests_made = after['requests'] - before['requests']
+        attempts = after['attempts'] - before['attempts']
+        reused = after['reused_connections'] - before['reused_connections']
+        self.logger.info(
+            f"Task {task_id}: {requests_made} HTTP requests ({attempts} attempts), {reused} on reused connections, "
+            f"{after['seconds'] - before['seconds']:.3f}s in HTTP"
+        )
 
-    def transcribe_audio(self, local_audio_path: str) -> Optional[str]:
-        """Transcribe the audio file using pre-loaded model."""
+    def transcribe_audio(self, local_audio_path: str, task: Optional[Dict[str, Any]] = None,
+                         decision: Optional[DecodingDecision] = None,
+                         timings: Optional[SpanRecorder] = None) -> Optional[TranscriptionResult]:
+        """Transcribe the audio file using the model and decoding settings selected for the task."""
         try:
             self.logger.info(f"Starting transcription of file: {os.path.basename(local_audio_path)}")
             
             if not os.path.exists(local_audio_path):
                 raise FileNotFoundError(f"Audio file not found: {local_audio_path}")
-        
-            # Use the pre-loaded model
-            segments, info = self.model.transcribe(
+
+            # Resume after the segments a drained worker already completed
+            checkpoint = (task or {}).get('checkpoint') or {}
+            prior_segments = checkpoint.get('segments') or []
+            start_seconds = checkpoint.get('resume_from') or 0.0
+            if start_seconds:
+                self.logger.info(f"Resuming task {task.get('task_id')} from {start_seconds:.2f}s "
+                                 f"({len(prior_segments)} segments already done)")
+
+            size, compute_type = self._resolve_model_spec(task, decision)
+            result = self.transcriber.transcribe(
                 local_audio_path,
-                language="en",
-                beam_size=1
+                size,
+                compute_type,
+                self.device,
+                beam_size=decision.beam_size if decision else 1,
+                temperature=decision.temperature if decision else None,
+                progress=partial(self.status_manager.update_progress, task_id=task.get('task_id') if task else None),
+                timings=timings,
+                start_seconds=start_seconds,
+                should_stop=self._drain_expired
             )
-            
-            transcription = "".join([segment.text for segment in segments])
-        
-            if not transcription:
+            if prior_segments:
+                result = result._replace(
+                    text="".join(segment['text'] for segment in prior_segments) + result.text,
+                    segments=prior_segments + result.segments,
+                    silent=False
+                )
+            if result.silent:
+                return result
+
+            if not result.text:
                 self.logger.warning("Transcription resulted in empty text")
                 return None
                     
             self.logger.info(f"Transcription completed for {os.path.basename(local_audio_path)}")
-            return transcription
+            return result
+
+        except TranscriptionInterrupted as e:
+            raise TranscriptionInterrupted(prior_segments + e.segments, e.resume_from)
                     
         except Exception as e:
             self.logger.error(f"Error transcribing file: {str(e)}")
             traceback.print_exc()
             return None
 
-    def transcribe_audio_via_api(self, local_audio_path: str) -> Optional[str]:
+    def transcribe_audio_via_api(self, local_audio_path: str,
+                                 timings: Optional[SpanRecorder] = None) -> Optional[TranscriptionResult]:
         """Transcribe using local Faster-Whisper API server."""
+        timings = timings or SpanRecorder()
         try:
-            api_url = f"{self.config.LOCAL_API_URL}/v1/audio/transcriptions"
-            self.logger.info(f"Sending file {os.path.basename(local_audio_path)} to API at {api_url}")
-            
-            with open(local_audio_path, "rb") as f:
-                files = {"file": f}
-                data = {"language": "en"}
-                
-                response = requests.post(
-                    api_url, 
-                    files=files, 
-                    data=data, 
-                    timeout=self.config.TRANSCRIPTION_TIMEOUT
-                )
-            
-            self.logger.info(f"Response status: {response.status_code}")
-            self.logger.info(f"Response text: {response.text}")
-    
-            if response.status_code == 200:
-                if not response.text.strip():
-                    self.logger.error("API returned empty response.")
-                    return None
-                
-                try:
-                    result = response.json()
-                except Exception as e:
-                    self.logger.error(f"Failed to decode JSON: {e}")
-                    return None
-                
-                transcription = result.get("text", "")
-                self.logger.info("API transcription succeeded")
-                return transcription
-            else:
-                self.logger.error(f"API transcription failed: {response.status_code} {response.text}")
-                return None
+            # Silent clips never reach the API server
+            audio, _, skipped = self.transcriber.prefilter(local_audio_path, trim=False, timings=timings)
+            if audio is not None and audio.size == 0:
+                return TranscriptionResult("", [], skipped, skipped, True)
+
+            self.logger.info(f"Sending file {os.path.basename(local_audio_path)} to API at {self.api_client.url}")
+            with timings.span('inference'):
+                future = self.api_client.submit(local_audio_path, verbose=self.config.OUTPUT_ARTIFACTS)
+                while True:
+                    try:
+                        response = future.result(timeout=1)
+                        break
+                    except FutureTimeout:
+                        if self._drain_expired():
+                            future.cancel()
+                            self.logger.warning("Drain deadline reached during API transcription")
+                            return None
+            self.logger.info("API transcription succeeded")
+            if not self.config.OUTPUT_ARTIFACTS:
+                return TranscriptionResult(response, [], 0.0, 0.0, False)
+            return self._result_from_verbose_json(response)
         except Exception as e:
             self.logger.error(f"Exception during API transcription: {e}")
-            traceback.print_exc()
             return None
 
+    @staticmethod
+    def _result_from_verbose_json(response: Dict[str, Any]) -> TranscriptionResult:
+        """TranscriptionResult from an OpenAI-style verbose_json response.
+
+        Words come either per segment or as one top-level list; the latter are
+        assigned to the segment containing their midpoint.
+        """
+        segments = [
+            {
+                'start': segment['start'],
+                'end': segment['end'],
+                'text': segment['text'],
+                'avg_logprob': segment.get('avg_logprob'),
+                'no_speech_prob': segment.get('no_speech_prob'),
+                'words': segment.get('words') or []
+            }
+            for segment in response.get('segments') or []
+        ]
+        for word in response.get('words') or []:
+            midpoint = (word['start'] + word['end']) / 2
+            for segment in segments:
+                if segment['start'] <= midpoint <= segment['end']:
+                    segment['words'].append(word)
+                    break
+        duration = response.get('duration') or (segments[-1]['end'] if segments else 0.0)
+        return TranscriptionResult(response['text'], segments, duration, 0.0, False)
+
+    def _log_background_delivery(self, task_id: str, timings: SpanRecorder, span: str,
+                                 failure: str, future) -> None:
+        """Done-callback for deliveries that do not gate completion: log the outcome and its span."""
+        try:
+            ok = future.result()
+        except Exception as e:
+            self.logger.error(f"{failure} for task {task_id}: {e}")
+            return
+        if not ok:
+            self.logger.warning(f"{failure} for task {task_id}")
+            return
+        seconds = timings.as_dict()['spans'].get(span, {}).get('seconds')
+        self.logger.info(f"Task {task_id}: {span} finished in {seconds}s")
+
+    @staticmethod
+    def _timed(timings: SpanRecorder, name: str, fn, *args):
+        """Run `fn(*args)` inside a `timings` span; used for calls submitted to the fan-out pool."""
+        with timings.span(name):
+            return fn(*args)
+
+    def upload_artifacts(self, task: Dict[str, Any], transcription: str, segments: list,
+                         duration: float, timings: Optional[SpanRecorder] = None) -> bool:
+        """Upload the structured artifacts to the presigned URLs get-task provided for them."""
+        urls = task.get('presigned_artifact_urls') or {}
+        artifact = build_artifact(segments, transcription, duration)
+
+        uploaded = True
+        for fmt in self.config.OUTPUT_FORMATS:
+            if fmt not in urls:
+                self.logger.warning(f"No upload URL for {fmt} artifact of task {task['task_id']}")
+                uploaded = False
+                continue
+            body = render_artifact(fmt, artifact)
+            if timings:
+                timings.record(**{f"{fmt}_artifact_bytes": len(body)})
+            try:
+                response = self.http.put(
+                    urls[fmt],
+                    data=body,
+                    headers={'Content-Type': ARTIFACT_FORMATS[fmt][1], 'Content-Encoding': 'gzip'},
+                    timeout=self.config.UPLOAD_TIMEOUT
+                )
+                if response.status_code != 200:
+                    self.logger.error(f"Failed to upload {fmt} artifact: {response.status_code}")
+                    uploaded = False
+            except Exception as e:
+                self.logger.error(f"Error uploading {fmt} artifact: {str(e)}")
+                uploaded = False
+        return uploaded
+
     def download_file(self, presigned_url: str, local_path: str) -> bool:
         """Download file using pre-signed URL."""
         try:
-            response = requests.get(
+            response = self.http.get(
                 presigned_url,
                 stream=True,
                 timeout=self.config.DOWNLOAD_TIMEOUT
@@ -402,7 +787,7 @@ class AudioTranscriptionWorker:
     def upload_transcription_to_s3(self, presigned_url: str, transcription: str) -> bool:
         """Upload transcription text to S3."""
         try:
-            response = requests.put(
+            response = self.http.put(
                 presigned_url,
                 data=transcription.encode('utf-8'),
                 headers={'Content-Type': 'text/plain'},
@@ -434,7 +819,7 @@ class AudioTranscriptionWorker:
                 "task_id": task_id,
                 "transcription": transcription
             }
-            response = requests.post(url, headers=headers, json=payload, timeout=self.config.API_TIMEOUT)
+            response = self.http.post(url, headers=headers, json=payload, timeout=self.config.API_TIMEOUT)
             if response.status_code == 200:
                 self.logger.info(f"Successfully sent transcription for task {task_id}")
                 return True
@@ -448,18 +833,49 @@ class AudioTranscriptionWorker:
 
 
     def run(self):
-        """Main processing loop."""
+        """Main processing loop.
+
+        In API mode up to `transcription.max_in_flight` tasks are processed
+        concurrently so the local server always has work queued; otherwise
+        tasks run one at a time on the loaded model.
+        """
+        slots = self.config.API_MAX_IN_FLIGHT if self.api_client else 1
+        in_flight = set()
+        executor = ThreadPoolExecutor(max_workers=slots, thread_name_prefix="task")
         try:
             while self.keep_running:
                 try:
+                    if len(in_flight) >= slots:
+                        _, in_flight = wait(in_flight, timeout=1, return_when=FIRST_COMPLETED)
+                        continue
+
+                    lease_start = time.monotonic()
                     task = self.get_task()
                     if not task:
-                        # Still need to send heartbeat when idle
-                        self.status_manager.check_heartbeat()
+                        # Heartbeats are sent by the status manager's own thread
                         time.sleep(self.config.POLL_INTERVAL)
                         continue
 
-                    self.process_task(task)
+                    if not self._first_task_seen:
+                        self._first_task_seen = True
+                        time_to_first_task = round(time.monotonic() - PROCESS_START, 3)
+                        self.startup.record(time_to_first_task=time_to_first_task)
+                        self.status_manager.metrics['startup'] = self.startup.as_dict()
+                        self.logger.info(f"First task leased {time_to_first_task:.2f}s after process start")
+
+                    # Timings start at the lease so get-task latency is part of the breakdown
+                    timings = SpanRecorder(origin=lease_start)
+                    timings.add('lease', time.monotonic() - lease_start, lease_start)
+
+                    if not self.keep_running:
+                        # Shutdown arrived while leasing; nothing has started, hand it back
+                        self.release_task(task['task_id'], timings)
+                        break
+
+                    if slots == 1:
+                        self.process_task(task, timings)
+                    else:
+                        in_flight.add(executor.submit(self.process_task, task, timings))
 
                 except Exception as e:
                     self.logger.error(f"Error in processing loop: {str(e)}")
@@ -467,7 +883,13 @@ class AudioTranscriptionWorker:
 
         finally:
             self.logger.info("Cleaning up before shutdown...")
+            executor.shutdown(wait=True)
+            self.fanout.shutdown(wait=True)
+            self.status_manager.stop_heartbeat_thread()
             self.status_manager.disconnect()
+            if self.api_client:
+                self.api_client.close()
+            self.http.close()
 
     def setup_signal_handlers(self):
         """Setup graceful shutdown handlers."""
@@ -475,9 +897,31 @@ class AudioTranscriptionWorker:
         signal.signal(signal.SIGTERM, self.signal_handler)
 
     def signal_handler(self, signum, frame):
-        """Handle shutdown signals."""
-        self.logger.info(f"Received shutdown signal {signum}")
+        """Handle shutdown signals by draining: stop leasing, finish or checkpoint in-flight work."""
+        self.logger.info(
+            f"Received shutdown signal {signum}; draining with a {self.config.DRAIN_DEADLINE_SECONDS}s deadline"
+        )
         self.keep_running = False
+        if self._drain_deadline is None:
+            self._drain_deadline = time.monotonic() + self.config.DRAIN_DEADLINE_SECONDS
+        # Heartbeats continue until the in-flight task (if any) finishes
+        self.status_manager.request_stop()
+
+    def _drain_expired(self) -> bool:
+        """True once a shutdown drain has run past its deadline."""
+        return self._drain_deadline is not None and time.monotonic() >= self._drain_deadline
+
+    def release_task(self, task_id: str, timings: SpanRecorder, checkpoint: Optional[Dict[str, Any]] = None) -> None:
+        """Hand a task back to the orchestrator queue, with completed segments to resume from if any."""
+        details = {'checkpoint': checkpoint} if checkpoint else {}
+        self._report_status(task_id, "Queued", timings, **details)
+        if checkpoint:
+            self.logger.info(
+                f"Released task {task_id} with {len(checkpoint['segments'])} segments, "
+                f"resumable from {checkpoint['resume_from']:.2f}s"
+            )
+        else:
+            self.logger.info(f"Released task {task_id} before it started")
 
     def cleanup_files(self, file_paths: list):
         """Clean up local files."""
@@ -494,14 +938,12 @@ from typing import Optional
 import subprocess
 import json
 import threading
-from functools import lru_cache
 
 class AudioDurationHandler:
     """Thread-safe handler for getting audio durations."""
     
     def __init__(self, logger):
         self.logger = logger
-        self._lock = threading.Lock()
         self._ffprobe_path = None
         self._init_ffprobe()
 
@@ -520,9 +962,8 @@ class AudioDurationHandler:
         except Exception as e:
             self.logger.error(f"Error initializing ffprobe: {str(e)}")
 
-    @lru_cache(maxsize=128)
     def _get_duration_ffprobe(self, audio_path: str) -> Optional[float]:
-        """Get audio duration using ffprobe with caching."""
+        """Get audio duration using an ffprobe subprocess (last resort)."""
         if not self._ffprobe_path:
             return None
             
@@ -551,60 +992,61 @@ class AudioDurationHandler:
         return None
 
     def get_duration(self, audio_path: str, default_duration: float = 30.0) -> float:
-        """Thread-safe method to get audio duration with fallbacks."""
-        with self._lock:
-            # Try ffprobe first
-            duration = self._get_duration_ffprobe(audio_path)
-            if duration is not None:
+        """Get audio duration, preferring the in-process header parser over subprocesses."""
+        # Container headers (WebM, Ogg, FLAC, WAV, MP3) read in-process
+        duration = probe_duration(audio_path)
+        if duration is not None:
+            self.logger.info(f"Got duration via header probe: {duration:.2f}s")
+            return duration
+
+        # Fallback to soundfile
+        try:
+            import soundfile as sf
+            with sf.SoundFile(audio_path) as audio_file:
+                duration = float(len(audio_file)) / float(audio_file.samplerate)
+                self.logger.info(f"Got duration via soundfile: {duration:.2f}s")
                 return duration
+        except ImportError:
+            self.logger.debug("soundfile not available")
+        except Exception as e:
+            self.logger.warning(f"soundfile error: {str(e)}")
 
-            # Fallback to soundfile
-            try:
-                import soundfile as sf
-                with sf.SoundFile(audio_path) as audio_file:
-                    duration = float(len(audio_file)) / float(audio_file.samplerate)
-                    self.logger.info(f"Got duration via soundfile: {duration:.2f}s")
-                    return duration
-            except ImportError:
-                self.logger.debug("soundfile not available")
-            except Exception as e:
-                self.logger.warning(f"soundfile error: {str(e)}")
+        # Last resort: fork ffprobe
+        duration = self._get_duration_ffprobe(audio_path)
+        if duration is not None:
+            return duration
 
-            # Final fallback to wave
-            try:
-                import wave
-                with wave.open(audio_path, 'rb') as audio_file:
-                    frames = audio_file.getnframes()
-                    rate = audio_file.getframerate()
-                    duration = float(frames) / float(rate)
-                    self.logger.info(f"Got duration via wave: {duration:.2f}s")
-                    return duration
-            except ImportError:
-                self.logger.debug("wave module not available")
-            except Exception as e:
-                self.logger.warning(f"wave error: {str(e)}")
-
-            self.logger.warning(
-                f"Could not determine duration for {audio_path}, "
-                f"using default: {default_duration}s"
-            )
-            return default_duration
+        self.logger.warning(
+            f"Could not determine duration for {audio_path}, "
+            f"using default: {default_duration}s"
+        )
+        return default_duration
 
 
 
 
 class WorkerStatusManager:
-    def __init__(self, worker_id: str, orchestrator_url: str, api_token: str, config):
+    def __init__(self, worker_id: str, orchestrator_url: str, api_token: str, config,
+                 http_client: Optional[HttpClient] = None):
         self.worker_id = worker_id
+        self.http = http_client or HttpClient()
         self.orchestrator_url = orchestrator_url
         self.headers = {
             'Authorization': f'Bearer {api_token}',
             'Content-Type': 'application/json'
         }
-        self.current_task = None
-        self.heartbeat_interval = 30  # Default interval
+        self.tasks = {}  # task_id -> status of every task in flight, in start order
+        self.idle_interval = getattr(config, 'HEARTBEAT_INTERVAL', 30)
+        self.heartbeat_interval = self.idle_interval
         self._last_heartbeat = 0
         self.config = config  # Store the configuration for later use
+        self.metrics = {}  # Worker metrics reported with every heartbeat
+
+        # Background heartbeat thread, independent of the task loop
+        self._task_lock = threading.Lock()
+        self._stop_event = threading.Event()  # drain: exit once no task is in flight
+        self._halt_event = threading.Event()  # exit now; also paces the loop, so only stop_heartbeat_thread sets it
+        self._heartbeat_thread = None
 
     def register(self) -> bool:
         """Register worker with orchestrator."""
@@ -612,10 +1054,10 @@ class WorkerStatusManager:
             capabilities = {
                 'compute_type': self.config.COMPUTE_TYPE,
                 'model_size': self.config.MODEL_SIZE,
-                'device': 'cuda' if torch.cuda.is_available() else 'cpu'
+                'device': 'cuda' if cuda_available() else 'cpu'
             }
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.orchestrator_url}/worker/register",
                 headers=self.headers,
                 json={
@@ -631,20 +1073,97 @@ class WorkerStatusManager:
             logger.error(f"Registration failed: {e}")
             return False
 
+    def start_heartbeat_thread(self) -> None:
+        """Start sending heartbeats from a daemon thread on their own schedule."""
+        if self._heartbeat_thread and self._heartbeat_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._halt_event.clear()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop,
+            name="heartbeat",
+            daemon=True
+        )
+        self._heartbeat_thread.start()
+
+    def request_stop(self) -> None:
+        """Ask the heartbeat thread to exit once no task is in flight. Safe from signal handlers."""
+        self._stop_event.set()
+
+    def stop_heartbeat_thread(self, timeout: float = 15) -> None:
+        """Stop the heartbeat thread and wait for it to exit."""
+        self._stop_event.set()
+        self._halt_event.set()
+        with self._task_lock:
+            self.tasks.clear()
+        if self._heartbeat_thread:
+            self._heartbeat_thread.join(timeout)
+            self._heartbeat_thread = None
+
+    def _heartbeat_loop(self) -> None:
+        """Tick once a second; keep beating while a task is in flight even if stop was requested."""
+        while True:
+            # Always a full tick: a requested stop must not turn the wait into a busy loop while a task runs
+            if self._halt_event.wait(1.0):
+                break
+            if self._stop_event.is_set() and not self.tasks:
+                break
+            try:
+                self.check_heartbeat()
+            except Exception as e:
+                logger.error(f"Heartbeat thread error: {e}")
+        logger.info("Heartbeat thread stopped")
+
+    @property
+    def current_task(self) -> Optional[Dict[str, Any]]:
+        """Most recently started task still in flight."""
+        with self._task_lock:
+            return next(reversed(self.tasks.values()), None)
+
     def start_task(self, task_id: str, file_duration: float) -> None:
         """Update status when starting a task."""
-        self.current_task = {
-            'task_id': task_id,
-            'started_at': time.time()
-        }
+        with self._task_lock:
+            self.tasks[task_id] = {
+                'task_id': task_id,
+                'started_at': time.time(),
+                'audio_duration': round(file_duration, 3),
+                'audio_seconds_processed': 0.0,
+                'segments_emitted': 0,
+                'rtf': None
+            }
         # Set heartbeat interval based on file duration
-        self.heartbeat_interval = 5 if file_duration < 10 else 30
+        if file_duration < 10:
+            self.heartbeat_interval = 5
         self._send_heartbeat()
-        
-    def end_task(self) -> None:
-        """Clear current task and reset heartbeat interval."""
-        self.current_task = None
-        self.heartbeat_interval = 30
+
+    def set_task_details(self, task_id: str, **details) -> None:
+        """Attach extra fields (e.g. the decoding decision) to a task's heartbeat status."""
+        with self._task_lock:
+            if task_id in self.tasks:
+                self.tasks[task_id].update(details)
+
+    def update_progress(self, audio_seconds_processed: float, segments_emitted: int,
+                        task_id: Optional[str] = None) -> None:
+        """Record transcription progress for the next heartbeat (latest task if `task_id` is None)."""
+        with self._task_lock:
+            task = self.tasks.get(task_id) if task_id else next(reversed(self.tasks.values()), None)
+            if not task:
+                return
+            elapsed = time.time() - task['started_at']
+            task['audio_seconds_processed'] = round(audio_seconds_processed, 3)
+            task['segments_emitted'] = segments_emitted
+            if audio_seconds_processed > 0:
+                task['rtf'] = round(elapsed / audio_seconds_processed, 4)
+
+    def end_task(self, task_id: Optional[str] = None) -> None:
+        """Clear a finished task (all tasks if `task_id` is None) and reset heartbeat interval."""
+        with self._task_lock:
+            if task_id is None:
+                self.tasks.clear()
+            else:
+                self.tasks.pop(task_id, None)
+            short_task = any(task['audio_duration'] < 10 for task in self.tasks.values())
+        self.heartbeat_interval = 5 if short_task else self.idle_interval
         self._send_heartbeat()
         
     def check_heartbeat(self) -> None:
@@ -655,7 +1174,7 @@ class WorkerStatusManager:
     def disconnect(self) -> None:
         """Gracefully disconnect worker."""
         try:
-            requests.post(
+            self.http.post(
                 f"{self.orchestrator_url}/worker/disconnect",
                 headers=self.headers,
                 json={'worker_id': self.worker_id},
@@ -667,12 +1186,17 @@ class WorkerStatusManager:
     def _send_heartbeat(self) -> None:
         """Send heartbeat to orchestrator."""
         try:
+            with self._task_lock:
+                active_tasks = [dict(task) for task in self.tasks.values()]
             status_data = {
                 'worker_id': self.worker_id,
-                'task_status': self.current_task
+                'task_status': active_tasks[-1] if active_tasks else None,
+                'active_tasks': active_tasks
             }
+            if self.metrics:
+                status_data['metrics'] = dict(self.metrics)
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.orchestrator_url}/worker/heartbeat",
                 headers=self.headers,
                 json=status_data,
@@ -709,9 +1233,7 @@ class GlobalConfig:
                 secret = json.loads(secret_value['SecretString'])
 
                 # Load YAML configuration
-                yaml_path = os.path.join(os.path.dirname(__file__), 'worker.config.yaml')
-                with open(yaml_path, 'r') as file:
-                    yaml_config = yaml.safe_load(file)
+                yaml_config = self._read_yaml()
 
                 # Store all config values as attributes
                 self.API_TOKEN = secret['api_token']
@@ -721,38 +1243,7 @@ class GlobalConfig:
                 base_name = yaml_config.get('worker', {}).get('name', 'worker')
                 self.WORKER_ID = f"{base_name}{get_node_identifier()}"
 
-                # Get performance settings
-                performance = yaml_config.get('performance', {})
-                self.POLL_INTERVAL = performance.get('poll_interval', 5)
-
-                # Model configuration
-                self.MODEL_SIZE = yaml_config.get('model', {}).get('size', "medium")
-                self.COMPUTE_TYPE = yaml_config.get('model', {}).get('compute_type', "float16")
-                self.PREFER_CUDA = yaml_config.get('model', {}).get('prefer_cuda', True)
-                self.FALLBACK_DEVICE = yaml_config.get('model', {}).get('fallback_device', "cpu")
-               
-                # Set timeout settings from existing config
-                timeouts = yaml_config.get('timeouts', {})
-                self.API_TIMEOUT = timeouts.get('api', 10)
-                self.DOWNLOAD_TIMEOUT = timeouts.get('download', 300)
-                self.UPLOAD_TIMEOUT = timeouts.get('upload', 300)
-                self.TRANSCRIPTION_TIMEOUT = timeouts.get('transcription', 1800) 
-             
-                # Set storage settings
-                storage = yaml_config.get('storage', {})
-                self.DOWNLOAD_FOLDER = storage.get('download_folder', './downloads')
-                self.CHUNK_SIZE = storage.get('chunk_size', 4194304)  # Default to 4MB if not specified
-
-
-                #use_api: A boolean  whether to use the local API transcription method (true) or the direct faster-whisper call (false).
-                #local_api_url: The base URL where the Faster-Whisper-Server API is accessible. In this case, it's set to http://localhost:8000.
-                # The following is in the worker.config.yaml file
-                # transcription:
-                #   use_api: true
-                #   local_api_url: "http://localhost:8000"
-                self.LOCAL_API_URL = yaml_config.get('transcription', {}).get('local_api_url', "http://localhost:8000")
-                self.USE_API_FOR_TRANSCRIPTION = yaml_config.get('transcription', {}).get('use_api', False)
-
+                self._load_settings(yaml_config)
                 self._initialized = True
                 logger.info(f"Configuration loaded successfully. Worker ID: {self.WORKER_ID}")
             except Exception as e:
@@ -760,6 +1251,123 @@ class GlobalConfig:
                 raise SystemExit("Cannot start application without configuration")
 
     
+    @classmethod
+    def from_yaml(cls, yaml_path: Optional[str] = None) -> 'GlobalConfig':
+        """Settings from worker.config.yaml only (no secrets or worker ID), for offline tools like the benchmark."""
+        config = object.__new__(cls)
+        config._load_settings(cls._read_yaml(yaml_path))
+        return config
+
+    @staticmethod
+    def _read_yaml(yaml_path: Optional[str] = None) -> Dict[str, Any]:
+        yaml_path = yaml_path or os.path.join(os.path.dirname(__file__), 'worker.config.yaml')
+        with open(yaml_path, 'r') as file:
+            return yaml.safe_load(file)
+
+    def _load_settings(self, yaml_config: Dict[str, Any]) -> None:
+        """Everything configured in worker.config.yaml."""
+
+        # Get performance settings
+        performance = yaml_config.get('performance', {})
+        self.POLL_INTERVAL = performance.get('poll_interval', 5)
+        self.HEARTBEAT_INTERVAL = performance.get('heartbeat_interval', 30)
+        self.DRAIN_DEADLINE_SECONDS = performance.get('drain_deadline', 25)
+
+        # Model configuration
+        self.MODEL_SIZE = yaml_config.get('model', {}).get('size', "medium")
+        self.COMPUTE_TYPE = yaml_config.get('model', {}).get('compute_type', "float16")
+        self.PREFER_CUDA = yaml_config.get('model', {}).get('prefer_cuda', True)
+        self.FALLBACK_DEVICE = yaml_config.get('model', {}).get('fallback_device', "cpu")
+        self.MODEL_ALLOWED_SIZES = yaml_config.get('model', {}).get(
+            'allowed_sizes', [self.MODEL_SIZE]
+        )
+        self.MODEL_ALLOWED_COMPUTE_TYPES = yaml_config.get('model', {}).get(
+            'allowed_compute_types', [self.COMPUTE_TYPE]
+        )
+        # Verified local/volume store of model weights
+        model_store = yaml_config.get('model', {}).get('store', {})
+        self.MODEL_STORE_ENABLED = model_store.get('enabled', True)
+        self.MODEL_STORE_DIR = model_store.get('dir', './models')
+        self.MODEL_STORE_VERIFY = model_store.get('verify', 'stat')
+        self.MODEL_STORE_ALLOW_DOWNLOAD = model_store.get('allow_download', True)
+        self.MODEL_STORE_ADOPT_UNMANAGED = model_store.get('adopt_unmanaged', False)
+
+        model_cache = yaml_config.get('model', {}).get('cache', {})
+        self.MODEL_CACHE_MAX_MODELS = model_cache.get('max_models', 2)
+        self.MODEL_CACHE_MEMORY_MB = model_cache.get('memory_budget_mb', 0)
+
+        self.AWS_REGION = yaml_config.get('aws', {}).get('region', 'us-east-2')
+
+        # Content-addressed transcription cache
+        cache = yaml_config.get('cache', {})
+        self.CACHE_ENABLED = cache.get('enabled', True)
+        self.CACHE_DIR = cache.get('dir', './transcription_cache')
+        self.CACHE_MAX_BYTES = cache.get('max_bytes', 536870912)
+        self.CACHE_SHARED_BUCKET = cache.get('shared', {}).get('bucket') or None
+        self.CACHE_SHARED_PREFIX = cache.get('shared', {}).get('prefix', 'transcription-cache/')
+
+        # Long-audio mode: parallel chunked transcription
+        long_audio = yaml_config.get('long_audio', {})
+        self.LONG_AUDIO_ENABLED = long_audio.get('enabled', True)
+        self.LONG_AUDIO_MIN_SECONDS = long_audio.get('min_duration', 180)
+        self.LONG_AUDIO_CHUNK_MIN_SECONDS = long_audio.get('chunk_min_seconds', 30)
+        self.LONG_AUDIO_CHUNK_MAX_SECONDS = long_audio.get('chunk_max_seconds', 60)
+        self.LONG_AUDIO_OVERLAP_SECONDS = long_audio.get('overlap_seconds', 1.0)
+        self.LONG_AUDIO_WORKERS = long_audio.get('workers', 2)
+
+        # Adaptive decoding tiers driven by backlog and task age
+        adaptive = yaml_config.get('adaptive_decoding', {})
+        self.ADAPTIVE_DECODING_ENABLED = adaptive.get('enabled', True)
+        self.ADAPTIVE_BACKLOG_LOW = adaptive.get('backlog_low', 2)
+        self.ADAPTIVE_BACKLOG_HIGH = adaptive.get('backlog_high', 20)
+        self.ADAPTIVE_AGE_LOW_SECONDS = adaptive.get('age_low_seconds', 60)
+        self.ADAPTIVE_AGE_HIGH_SECONDS = adaptive.get('age_high_seconds', 600)
+        self.ADAPTIVE_TIERS = adaptive.get('tiers', {})
+
+        # Voice-activity pre-filter
+        vad = yaml_config.get('vad', {})
+        self.VAD_ENABLED = vad.get('enabled', True)
+        self.VAD_BACKEND = vad.get('backend', "energy")
+        self.VAD_THRESHOLD_DB = vad.get('threshold_db', -45.0)
+        self.VAD_MIN_SPEECH_MS = vad.get('min_speech_ms', 250)
+        self.VAD_PADDING_MS = vad.get('padding_ms', 300)
+       
+        # Set timeout settings from existing config
+        timeouts = yaml_config.get('timeouts', {})
+        self.API_TIMEOUT = timeouts.get('api', 10)
+        self.DOWNLOAD_TIMEOUT = timeouts.get('download', 300)
+        self.UPLOAD_TIMEOUT = timeouts.get('upload', 300)
+        self.TRANSCRIPTION_TIMEOUT = timeouts.get('transcription', 1800) 
+
+        # Shared HTTP connection pool and retry policy
+        http = yaml_config.get('http', {})
+        self.HTTP_POOL_CONNECTIONS = http.get('pool_connections', 4)
+        self.HTTP_POOL_MAXSIZE = http.get('pool_maxsize', 8)
+        self.HTTP_MAX_RETRIES = http.get('max_retries', 3)
+        self.HTTP_BACKOFF_FACTOR = http.get('backoff_factor', 0.5)
+     
+        # Set storage settings
+        storage = yaml_config.get('storage', {})
+        self.DOWNLOAD_FOLDER = storage.get('download_folder', './downloads')
+        self.CHUNK_SIZE = storage.get('chunk_size', 4194304)  # Default to 4MB if not specified
+
+
+        #use_api: A boolean  whether to use the local API transcription method (true) or the direct faster-whisper call (false).
+        #local_api_url: The base URL where the Faster-Whisper-Server API is accessible. In this case, it's set to http://localhost:8000.
+        # The following is in the worker.config.yaml file
+        # transcription:
+        #   use_api: true
+        #   local_api_url: "http://localhost:8000"
+        self.LOCAL_API_URL = yaml_config.get('transcription', {}).get('local_api_url', "http://localhost:8000")
+        self.USE_API_FOR_TRANSCRIPTION = yaml_config.get('transcription', {}).get('use_api', False)
+        self.API_MAX_IN_FLIGHT = yaml_config.get('transcription', {}).get('max_in_flight', 2)
+
+        # Structured transcript artifacts (JSON segments, SRT, VTT)
+        output = yaml_config.get('output', {})
+        self.OUTPUT_ARTIFACTS = output.get('artifacts', True)
+        self.OUTPUT_FORMATS = output.get('formats', ['json', 'srt', 'vtt'])
+        self.OUTPUT_WORD_TIMESTAMPS = output.get('word_timestamps', True)
+
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
@@ -773,6 +1381,34 @@ class GlobalConfig:
 ####### ####### ####### ####### ####### ####### ####### #######
 
 
+def build_transcriber(config, model_manager, workers=None):
+    """The worker's decode -> VAD -> (chunked) inference pipeline, as configured.
+
+    `workers` overrides the long-audio chunk parallelism (the benchmark sweeps it).
+    """
+    # Voice-activity pre-filter that skips silent clips before inference
+    vad = None
+    if config.VAD_ENABLED:
+        vad = VoiceActivityDetector(
+            backend=config.VAD_BACKEND,
+            threshold_db=config.VAD_THRESHOLD_DB,
+            min_speech_ms=config.VAD_MIN_SPEECH_MS,
+            padding_ms=config.VAD_PADDING_MS
+        )
+
+    return Transcriber(
+        model_manager,
+        vad=vad,
+        long_audio_enabled=config.LONG_AUDIO_ENABLED,
+        long_audio_min_seconds=config.LONG_AUDIO_MIN_SECONDS,
+        chunk_min_seconds=config.LONG_AUDIO_CHUNK_MIN_SECONDS,
+        chunk_max_seconds=config.LONG_AUDIO_CHUNK_MAX_SECONDS,
+        overlap_seconds=config.LONG_AUDIO_OVERLAP_SECONDS,
+        workers=workers if workers is not None else config.LONG_AUDIO_WORKERS,
+        word_timestamps=config.OUTPUT_ARTIFACTS and config.OUTPUT_WORD_TIMESTAMPS
+    )
+
+
 def ensure_directories(config):
     """Ensure required directories exist."""
     try:
@@ -827,7 +1463,7 @@ def main():
             logger.error("""
 Please ensure all dependencies are installed:
 1. Activate virtual environment: source ~/faster-whisper-env/bin/activate
-2. Install packages: pip install faster-whisper torch
+2. Install packages: pip install faster-whisper
 """)
             sys.exit(1)
         except Exception as e: